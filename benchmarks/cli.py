@@ -0,0 +1,282 @@
+"""
+Benchmarks for godoco's own CLI hot paths.
+
+Every case runs against a throwaway home, config, cache and data
+directory, with ``benchmarks/fake_godot.py`` standing in for Godot, so no
+engine is needed and results only reflect godoco's overhead:
+
+    cold_start      godoco --version, fresh interpreter
+    help            godoco --help (Godot options from the cache)
+    create          godoco create <name> -r mobile -s
+    run_prelaunch   ensure_main_scene + ensure_script_attachment, in process
+    run             godoco run -p <project> (fake Godot exits at once)
+    info            godoco info -p <project>
+    projects_N      godoco projects with N registered projects
+
+Results are printed as JSON (or written with --save). Given --baseline,
+medians are compared against a saved run, and the script exits non-zero
+when a case is slower than the baseline by more than --threshold.
+
+Usage:
+    python benchmarks/cli.py [--repeat N] [--only a,b] [--save out.json]
+                             [--baseline base.json] [--threshold 0.2]
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+FAKE_GODOT = Path(__file__).resolve().parent / "fake_godot.py"
+SCHEMA = 1
+PROJECT_COUNTS = (10, 1_000, 10_000)
+# Differences below this are noise, whatever the relative change
+NOISE_FLOOR_MS = 5.0
+
+
+class Sandbox:
+    """Isolated environment with a fake Godot and one sample project."""
+
+    def __init__(self, base: Path):
+        self.base = base
+        self.home = base / "home"
+        self.work = base / "work"
+        self.bin = base / "bin"
+        for d in (self.home, self.work, self.bin):
+            d.mkdir()
+        self.godot = self._install_godot()
+        self.env = {
+            **os.environ,
+            "PYTHONPATH": str(ROOT),
+            "HOME": str(self.home),
+            "USERPROFILE": str(self.home),
+            "APPDATA": str(self.home),
+            "GODOCO_CACHE_DIR": str(base / "cache"),
+            "GODOCO_DATA_DIR": str(base / "data"),
+            "GODOT_BIN": str(self.godot),
+            "NO_COLOR": "1",
+            "COLUMNS": "120",
+        }
+        self.created = 0
+
+    def _install_godot(self) -> Path:
+        if os.name == "nt":
+            exe = self.bin / "godot.bat"
+            exe.write_text(f'@"{sys.executable}" "{FAKE_GODOT}" %*\n')
+        else:
+            exe = self.bin / "godot"
+            exe.write_text(
+                f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_GODOT}" "$@"\n'
+            )
+            exe.chmod(0o755)
+        return exe
+
+    def godoco(self, *args: str) -> float:
+        """Run godoco in a fresh interpreter; return wall time in ms."""
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-m", "godoco", *args],
+            cwd=self.work,
+            env=self.env,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"godoco {' '.join(args)} failed ({result.returncode}):\n"
+                f"{result.stdout}{result.stderr}"
+            )
+        return elapsed
+
+    def create(self) -> float:
+        self.created += 1
+        return self.godoco(
+            "create", f"Bench{self.created}", "-r", "mobile", "-s"
+        )
+
+    def register_projects(self, count: int) -> None:
+        """Replace the registry with ``count`` projects whose folders exist."""
+        code = (
+            "import sys\n"
+            "from pathlib import Path\n"
+            "from godoco.config.registry import ProjectRegistry\n"
+            "base = Path(sys.argv[2])\n"
+            "reg = ProjectRegistry()\n"
+            "reg.remove(list(reg.paths()))\n"
+            "projects = {}\n"
+            "for i in range(int(sys.argv[1])):\n"
+            "    p = base / f'p{i}'\n"
+            "    p.mkdir(parents=True, exist_ok=True)\n"
+            "    projects[f'proj{i:05d}'] = str(p)\n"
+            "reg.import_projects(projects)\n"
+        )
+        subprocess.run(
+            [sys.executable, "-c", code, str(count), str(self.base / "many")],
+            env=self.env,
+            check=True,
+        )
+
+
+def prelaunch_code(project: Path) -> str:
+    """In-process timing of the work ``run`` does before starting Godot."""
+    return f"""
+import re, time
+from pathlib import Path
+from godoco.cli.commands import ensure_main_scene, ensure_script_attachment
+from godoco.ui.console import console
+console.quiet = True
+proj = Path({str(project)!r})
+pf = proj / "project.godot"
+original = pf.read_text()
+unset = re.sub(r'run/main_scene=".*"', 'run/main_scene=""', original)
+times = []
+for _ in range(int(__import__("sys").argv[1])):
+    pf.write_text(unset)
+    start = time.perf_counter()
+    ensure_main_scene(proj)
+    ensure_script_attachment(proj)
+    times.append((time.perf_counter() - start) * 1000)
+pf.write_text(original)
+print(",".join(map(str, times)))
+"""
+
+
+def summarize(runs: list[float]) -> dict:
+    return {
+        "unit": "ms",
+        "runs": [round(r, 3) for r in runs],
+        "min": round(min(runs), 3),
+        "median": round(statistics.median(runs), 3),
+        "mean": round(statistics.fmean(runs), 3),
+    }
+
+
+def repeat(fn: Callable[[], float], n: int, warmup: int = 1) -> list[float]:
+    for _ in range(warmup):
+        fn()
+    return [fn() for _ in range(n)]
+
+
+def run_suite(sandbox: Sandbox, n: int, only: set[str]) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+
+    def want(name: str) -> bool:
+        return not only or name in only
+
+    def record(name: str, runs: list[float]) -> None:
+        results[name] = summarize(runs)
+        print(
+            f"{name:16} median {results[name]['median']:9.1f} ms",
+            file=sys.stderr,
+        )
+
+    # Sample project used by run/info/prelaunch
+    sandbox.godoco("create", "Sample", "-r", "mobile", "-s")
+    sample = sandbox.work / "Sample"
+
+    if want("cold_start"):
+        record("cold_start", repeat(lambda: sandbox.godoco("--version"), n))
+    if want("help"):
+        record("help", repeat(lambda: sandbox.godoco("--help"), n))
+    if want("create"):
+        record("create", repeat(sandbox.create, n, warmup=0))
+    if want("run_prelaunch"):
+        out = subprocess.run(
+            [sys.executable, "-c", prelaunch_code(sample), str(n + 1)],
+            env=sandbox.env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        record("run_prelaunch", [float(t) for t in out.strip().split(",")][1:])
+    if want("run"):
+        record("run", repeat(lambda: sandbox.godoco("run", "-p", "Sample"), n))
+    if want("info"):
+        record(
+            "info", repeat(lambda: sandbox.godoco("info", "-p", "Sample"), n)
+        )
+
+    for count in PROJECT_COUNTS:
+        name = f"projects_{count}"
+        if want(name):
+            sandbox.register_projects(count)
+            record(name, repeat(lambda: sandbox.godoco("projects"), n))
+
+    return results
+
+
+def compare(
+    current: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    """Names of cases slower than the baseline beyond the threshold."""
+    regressions = []
+    for name, res in current.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]["median"], res["median"]
+        change = (new - old) / old if old else 0.0
+        flag = change > threshold and new - old > NOISE_FLOOR_MS
+        print(
+            f"{name:16} {old:9.1f} -> {new:9.1f} ms  {change:+7.1%}"
+            f"{'  REGRESSION' if flag else ''}",
+            file=sys.stderr,
+        )
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", default="", help="Comma-separated cases")
+    parser.add_argument("--save", type=Path, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="Results to compare to")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed relative slowdown of the median (default 0.2)",
+    )
+    args = parser.parse_args()
+
+    only = {s for s in args.only.split(",") if s}
+    with tempfile.TemporaryDirectory(prefix="godoco-bench-") as tmp:
+        results = run_suite(Sandbox(Path(tmp)), args.repeat, only)
+
+    report = {
+        "schema": SCHEMA,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.save:
+        args.save.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("schema") != SCHEMA:
+            print("Baseline schema mismatch", file=sys.stderr)
+            return 2
+        if compare(results, baseline["results"], args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
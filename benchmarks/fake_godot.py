@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the Godot executable used by the benchmarks.
+
+Answers ``--version`` and ``--help`` like Godot 4.3 and exits immediately
+for everything else, so measurements only cover godoco's own work.
+"""
+
+import sys
+
+VERSION = "4.3.stable.official.77dcf97d8"
+
+HELP = f"""Godot Engine v{VERSION} - https://godotengine.org
+Free and open source software under the terms of the MIT license.
+
+Usage:
+  godot [options] [path to scene or 'project.godot' file]
+
+General options:
+  -h, --help                        Display this help message.
+  --version                         Display the version string.
+  -v, --verbose                     Use verbose stdout mode.
+
+Run options:
+  -e, --editor                      Start the editor instead of running the scene.
+  -p, --project-manager             Start the project manager.
+  --path <directory>                Path to a project.
+  --headless                        Enable headless mode.
+  --export-release <preset> <path>  Export the project in release mode.
+  --export-debug <preset> <path>    Export the project in debug mode.
+  --script <script>                 Run a script.
+"""
+
+
+def main(argv: list[str]) -> int:
+    if "--version" in argv:
+        print(VERSION)
+    elif "--help" in argv or "-h" in argv:
+        print(HELP, end="")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
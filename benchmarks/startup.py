@@ -0,0 +1,155 @@
+"""
+Startup import-time benchmark for godoco.
+
+Runs ``python -X importtime`` for each entry route and checks the total
+import cost against a budget:
+
+    passthrough   godoco --path x --headless   (fast path, stdlib only)
+    pinned        the same, in a project pinned to a registered install
+    cli           godoco <command> / --help    (typer + rich app)
+
+Budgets are in milliseconds of cumulative import time of the top-level
+``godoco`` modules (so interpreter startup such as ``site`` and
+``encodings`` is left out), best of N runs.
+The passthrough routes must also never import rich, questionary,
+pydantic, typer or click. The fast path's list of godoco commands is
+checked against the commands the typer app registers, since a command
+missing from it would be forwarded to Godot. Exits non-zero if any check
+fails.
+
+Usage:
+    python benchmarks/startup.py [--repeat N] [--scale FACTOR]
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Route -> (code to import, budget in ms); {project} is a pinned project
+ROUTES = {
+    "passthrough": (
+        "import godoco.__main__, godoco.cli.fastpath,"
+        " godoco.godot_wrapper.detector",
+        50.0,
+    ),
+    "pinned": (
+        "import godoco.__main__, godoco.cli.fastpath,"
+        " godoco.godot_wrapper.detector, pathlib, sys;"
+        " from godoco.godot_wrapper.pins import pinned_install;"
+        " pinned_install(pathlib.Path({project!r}),"
+        " {{'4.3.stable': pathlib.Path(sys.executable)}})",
+        50.0,
+    ),
+    "cli": ("import godoco.__main__, godoco.cli.app", 200.0),
+}
+
+FORBIDDEN = {
+    "passthrough": ("rich", "questionary", "pydantic", "typer", "click"),
+    "pinned": ("rich", "questionary", "pydantic", "typer", "click"),
+    "cli": ("questionary", "pydantic"),
+}
+
+
+def measure(code: str) -> tuple[float, set[str]]:
+    """
+    Run code under -X importtime.
+
+    Returns the cumulative ms of top-level ``godoco`` imports, which
+    includes the stdlib modules they pull in, and every module imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+        check=True,
+    )
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line[len("import time:") :].split("|")
+        if not cumulative_us.strip().isdigit():
+            continue  # header line
+        # Nesting is shown by indentation after the single separator space
+        if name[1:2] != " " and name.strip().split(".")[0] == "godoco":
+            total_us += int(cumulative_us)
+        modules.add(name.strip())
+    return total_us / 1000, modules
+
+
+def check_commands() -> int:
+    """Return 1 if fastpath.COMMAND_NAMES differs from the typer app."""
+    sys.path.insert(0, str(ROOT))
+    import typer
+
+    from godoco.cli.app import app
+    from godoco.cli.fastpath import COMMAND_NAMES
+
+    registered = set(typer.main.get_command(app).commands)
+    missing = sorted(registered - COMMAND_NAMES)
+    stale = sorted(COMMAND_NAMES - registered)
+    if missing:
+        print(f"COMMAND_NAMES is missing: {', '.join(missing)}  FAIL")
+    if stale:
+        print(f"COMMAND_NAMES has unknown: {', '.join(stale)}  FAIL")
+    if missing or stale:
+        return 1
+    print(f"{'commands':12} {len(registered):5} names in sync  ok")
+    return 0
+
+
+def check_routes(project: str, repeat: int, scale: float) -> int:
+    """Measure every route; return 1 if any is over budget or leaks."""
+    failed = False
+    for route, (code, budget) in ROUTES.items():
+        code = code.format(project=project)
+        runs = [measure(code) for _ in range(repeat)]
+        best = min(ms for ms, _ in runs)
+        modules = runs[0][1]
+        limit = budget * scale
+
+        leaked = sorted(
+            m
+            for m in modules
+            if m.split(".")[0] in FORBIDDEN[route] and "." not in m
+        )
+        ok = best <= limit and not leaked
+        failed |= not ok
+        status = "ok" if ok else "FAIL"
+        print(f"{route:12} {best:8.1f} ms  budget {limit:6.1f} ms  {status}")
+        if leaked:
+            print(f"{'':12} imported: {', '.join(leaked)}")
+
+    return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiply budgets (for slow CI machines)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="godoco-bench-") as project:
+        Path(project, "project.godot").write_text(
+            '[application]\n\nconfig/features=PackedStringArray("4.3")\n'
+        )
+        failed = check_routes(project, args.repeat, args.scale)
+    return check_commands() | failed
+
+
+if __name__ == "__main__":
+    sys.exit(main())
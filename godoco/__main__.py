@@ -1,10 +1,30 @@
 """Main entry point."""
 
-from godoco.cli.app import app
+import sys
 
 
 def main():
-    app()
+    from godoco.utils import trace
+
+    trace.configure(sys.argv[1:])
+
+    # Passthrough to Godot never needs the full CLI
+    from godoco.cli.fastpath import try_passthrough
+
+    if (code := try_passthrough(sys.argv[1:])) is not None:
+        sys.exit(code)
+
+    from godoco.cli.app import app
+    from godoco.utils.errors import GodocoError
+
+    try:
+        with trace.span("godoco", argv=sys.argv[1:]):
+            app()
+    except GodocoError as e:
+        from godoco.ui.console import print_error
+
+        print_error(str(e))
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -1,15 +1,15 @@
 import typer
-from .commands import app as commands_app
+from .commands import app as commands_app, cfg_mgr
 from ..ui.banners import print_welcome_banner
 from .. import __version__
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
-import subprocess
-import re
+from typing import Optional
 from ..godot_wrapper.detector import find_godot_executable
-from typer import rich_utils
+from ..godot_wrapper.help import GodotHelp, load_godot_help
+from ..godot_wrapper.version import cached_godot_version
 from rich import box, print
 import click
 from typer.core import TyperGroup
@@ -41,75 +41,44 @@ class PassthroughGroup(TyperGroup):
 
         return ctx.args
 
+    def resolve_command(self, ctx: click.Context, args: list[str]):
+        # Subcommand help is rendered by Typer through rich_utils
+        if "--help" in args or "-h" in args:
+            install_help_formatter()
+        return super().resolve_command(ctx, args)
 
-def get_godot_help_options() -> list[tuple[str, str]]:
-    """Extract options from Godot help output."""
+    def format_help(self, ctx: click.Context, formatter) -> None:
+        install_help_formatter()
+        super().format_help(ctx, formatter)
+
+
+def get_godot_help(refresh: bool = False) -> Optional[GodotHelp]:
+    """Load Godot help, served from the on-disk cache when valid."""
     exe = find_godot_executable()
     if not exe:
-        return []
+        return None
 
+    # Known version (from the version cache, never spawns) invalidates
+    # help cached for a different build at the same path
+    version = cached_godot_version(exe)
     try:
-        # Run Godot --help and capture output
-        # Ensure we don't get colored output from Godot if possible,
-        # though --help usually ignores it.
-        result = subprocess.run(
-            [str(exe), "--help"],
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
+        return load_godot_help(
+            exe, refresh=refresh, version=str(version) if version else None
         )
-        output = result.stdout
-
-        # Strip ANSI codes
-        ansi_escape = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
-        output = ansi_escape.sub("", output)
-
-        # Godot help format usually:
-        # "  --option <arg>    Description..."
-        # But sometimes description is close or wrapped.
-
-        options = []
-        for line in output.splitlines():
-            line = line.strip()
-            if not line.startswith("-"):
-                continue
-
-            # Skip header lines if they accidentally start with -
-            if line.startswith("---"):
-                continue
-
-            # Attempt 1: Split by 2+ spaces or tab
-            parts = re.split(r"(\s{2,}|\t)", line, maxsplit=1)
-
-            opt = ""
-            desc = ""
-
-            if len(parts) >= 3:
-                opt = parts[0].strip()
-                desc = parts[2].strip()
-            else:
-                # Attempt 2: Regex for -flag [args] <space> Description
-                # Match: ^ (-short|--long) (optional args) (space) (Description)
-                match = re.search(r"^(--?[\w-]+(?: [^ ]+)?)\s+(.*)$", line)
-                if match:
-                    opt = match.group(1).strip()
-                    desc = match.group(2).strip()
-                else:
-                    # Fallback: Treat whole line as option if no split found
-                    opt = line
-
-            if opt:
-                options.append((opt, desc))
+    except Exception:
+        return None
 
-        return options
 
-    except Exception:
-        return []
+def get_godot_help_options(refresh: bool = False) -> list[tuple[str, str]]:
+    """Extract options from Godot help output."""
+    godot_help = get_godot_help(refresh=refresh)
+    return godot_help.options if godot_help else []
 
 
 def print_combined_help(ctx: typer.Context):
     """Print Godoco + Godot help."""
+    from typer import rich_utils
+
     console = Console()
 
     # 1. Print Banner
@@ -281,7 +250,8 @@ def custom_rich_format_help(obj, ctx, markup_mode):
 
     # 7. Print Godot Options (Separate Panel)
     if ctx.parent is None:
-        godot_opts = get_godot_help_options()
+        godot_help = get_godot_help(refresh=bool(ctx.params.get("refresh")))
+        godot_opts = godot_help.options if godot_help else []
         if godot_opts:
             godot_table = Table(highlight=True, box=None, show_header=True)
             godot_table.add_column(
@@ -323,6 +293,11 @@ def custom_rich_format_help(obj, ctx, markup_mode):
                 Panel(
                     godot_table,
                     title="Godot Options",
+                    subtitle=(
+                        f"[dim]{'cached, ' if godot_help.cached else ''}"
+                        f"probe took {godot_help.probe_seconds:.2f}s[/dim]"
+                    ),
+                    subtitle_align="right",
                     border_style="dim",
                     title_align="left",
                     box=box.ROUNDED,
@@ -330,8 +305,16 @@ def custom_rich_format_help(obj, ctx, markup_mode):
             )
 
 
-# Monkeypatch Typer's help formatter
-rich_utils.rich_format_help = custom_rich_format_help
+def install_help_formatter() -> None:
+    """
+    Monkeypatch Typer's help formatter.
+
+    Done only when help is shown: ``typer.rich_utils`` pulls in
+    ``rich.markdown`` and costs more to import than the rest of the CLI.
+    """
+    from typer import rich_utils
+
+    rich_utils.rich_format_help = custom_rich_format_help
 
 
 def version_callback(value: bool):
@@ -373,6 +356,17 @@ def main(
     help: bool = typer.Option(
         False, "--help", "-h", help="Show this message and exit."
     ),
+    refresh: bool = typer.Option(
+        False,
+        "--refresh",
+        help="Re-read Godot's --help output instead of using the cache.",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Print a timing breakdown on exit (GODOCO_TRACE=file.json "
+        "writes a Chrome trace).",
+    ),
 ):
     """
     Godoco - Godot Code-Only Development Tool.
@@ -381,32 +375,29 @@ def main(
         print_welcome_banner(__version__)
         raise typer.Exit()
 
-    # Check for passthrough arguments (ctx.args contains unparsed/extra args)
+    # Coalesce config writes made while the subcommand runs into one flush
+    ctx.with_resource(cfg_mgr.batch())
+
+    # Arguments left over after the root options go to Godot, with the
+    # same version resolution as the fast path
     if ctx.args:
-        # Run Godot with these arguments
-        from ..godot_wrapper.detector import find_godot_executable
-        import subprocess
-        import sys
-
-        exe = find_godot_executable()
-        if exe:
-            # We must pass the args exactly as received.
-            try:
-                # Use sys.exit to return Godot's exit code
-                sys.exit(subprocess.run([str(exe)] + ctx.args).returncode)
-            except Exception as e:
-                typer.echo(f"Error running Godot: {e}", err=True)
-                raise typer.Exit(1)
-        else:
+        from .fastpath import run_godot
+
+        # Run as a child so the config batch and the profile still close
+        code = run_godot(ctx.args, replace=False)
+        if code is None:
             typer.echo(
-                "Godot executable not configured. Run 'godoco setup'.", err=True
+                "Could not run Godot. Run 'godoco setup' to configure it.",
+                err=True,
             )
             raise typer.Exit(1)
+        raise typer.Exit(code)
 
     if help or ctx.invoked_subcommand is None:
         # If no subcommand, just show help (which will use our custom formatter)
         # Note: --help is handled by Typer before this, but if user runs `godoco` (no args),
         # we want to show help.
         # We can trigger help manually.
-        rich_utils.rich_format_help(ctx.command, ctx, "rich")
+        install_help_formatter()
+        custom_rich_format_help(ctx.command, ctx, "rich")
         raise typer.Exit()
@@ -2,29 +2,33 @@
 
 import typer
 import click
+import json
+import os
+import time
 from pathlib import Path
-from typing import Optional, Literal
-import subprocess
-import re
+from typing import TYPE_CHECKING, Optional, Literal
 
 from ..config.manager import ConfigManager
-from ..config.models import AppConfig
 from ..godot_wrapper.detector import find_godot_executable, detect_godot_version
-from ..godot_wrapper.wrapper import GodotWrapper
-from ..godot_wrapper.project import ProjectGodotFile
 from ..ui.console import (
     print_success,
     print_error,
     print_info,
+    print_warning,
     print_panel,
     console,
 )
-from ..ui.tables import create_projects_table, create_info_table
-from ..ui.prompts import (
-    create_project_wizard,
-)
 from ..utils.paths import resolve_project_path
-from ..utils.errors import GodocoError
+from ..utils.errors import ExportError, GodocoError, GodotVersionError
+from ..utils.fs import atomic_write_text
+from ..utils.trace import traced
+
+# Heavy modules (pydantic models, questionary prompts, the Godot process
+# wrapper, project.godot parsing, rich tables) are imported where they are
+# used so that simple commands and help rendering stay fast.
+if TYPE_CHECKING:
+    from ..config.models import AppConfig
+    from ..godot_wrapper.wrapper import GodotWrapper
 
 
 app = typer.Typer()
@@ -35,14 +39,25 @@ ICON_SVG = """<svg xmlns="http://www.w3.org/2000/svg" width="128" height="128"><
 ICON_IMPORT = '[remap]\nimporter="texture"\ntype="CompressedTexture2D"\npath="res://.godot/imported/icon.svg"\n[params]\ncompress/mode=0\n'
 
 
-def get_godot_wrapper() -> GodotWrapper:
-    """Get configured Godot wrapper."""
+def get_godot_wrapper(proj: Optional[Path] = None) -> "GodotWrapper":
+    """Get configured Godot wrapper, honouring the project's version pin."""
+    from ..godot_wrapper.wrapper import GodotWrapper
+
     cfg: AppConfig = cfg_mgr.load()
-    if cfg.godot.executable_path and cfg.godot.executable_path.exists():
-        return GodotWrapper(cfg.godot.executable_path)
+    if proj is not None and cfg.godot.installs:
+        from ..godot_wrapper.versions import pinned_executable
+
+        pin, exe = pinned_executable(proj, cfg.godot.installs)
+        if exe:
+            return GodotWrapper(exe)
+        if pin and pin != cfg.godot.version:
+            print_warning(
+                f"Project wants Godot {pin}, which is not registered "
+                "(see 'godoco versions'); using the default Godot."
+            )
 
-    # Try auto-detect
-    if godot := find_godot_executable():
+    # Configured path first, then auto-detect
+    if godot := find_godot_executable(cfg.godot.executable_path):
         return GodotWrapper(godot)
 
     print_error("Godot not found. Run 'godoco setup' first.")
@@ -51,25 +66,32 @@ def get_godot_wrapper() -> GodotWrapper:
 
 def get_proj_path(name: Optional[str] = None) -> Path:
     """Helper to resolve project path."""
-    cfg: AppConfig = cfg_mgr.load()
-    return resolve_project_path(name, cfg.current_project, cfg.projects)
+    cfg_mgr.load()
+    # Indexed lookup of just the requested project
+    projects = {}
+    if name and (proj := cfg_mgr.registry.get(name)):
+        projects[name] = str(proj.path)
+
+    current = cfg_mgr.get_current_project()
+    return resolve_project_path(
+        name, str(current) if current else None, projects
+    )
 
 
+@traced("ensure_main_scene")
 def ensure_main_scene(proj: Path) -> None:
     """Auto-detect and set main scene if missing."""
+    from ..godot_wrapper.project import ProjectGodotFile
+    from ..godot_wrapper.scenes import discover_main_scene
+
     pf = ProjectGodotFile(proj)
     if not pf.exists():
         return
 
-    content = pf.read()
-    if 'run/main_scene=""' in content:
-        if scenes := list(proj.rglob("*.tscn")):
-            try:
-                rel = scenes[0].relative_to(proj).as_posix()
-                pf.update_main_scene(f"res://{rel}")
-                print_info(f"Auto-set main scene: {rel}")
-            except ValueError:
-                pass
+    if not pf.get("application", "run/main_scene"):
+        if rel := discover_main_scene(proj):
+            pf.update_main_scene(f"res://{rel}")
+            print_info(f"Auto-set main scene: {rel}")
 
 
 @app.command()
@@ -90,65 +112,167 @@ def setup(
         )
         raise typer.Exit(1)
 
-    version = detect_godot_version(exe)
+    try:
+        version = detect_godot_version(exe)
+    except GodotVersionError as e:
+        print_warning(f"Could not detect Godot version: {e}")
+        version = None
+
+    with cfg_mgr.transaction() as cfg:
+        cfg.godot.executable_path = exe
+        cfg.godot.version = version.short if version else None
+        if version:
+            from ..godot_wrapper.versions import install_label
 
-    cfg: AppConfig = cfg_mgr.load()
-    cfg.godot.executable_path = exe
-    cfg.godot.version = version
-    cfg_mgr.save(cfg)
+            cfg.godot.installs[install_label(version)] = exe.resolve()
 
     print_panel(
-        f"Executable: {exe}\nVersion: {version}", "Godot Setup Complete"
+        f"Executable: {exe}\nVersion: {version or 'unknown'}",
+        "Godot Setup Complete",
     )
 
 
+@traced("ensure_script_attachment")
 def ensure_script_attachment(proj: Path) -> None:
     """Ensure src/main.gd is attached to main.tscn if it exists."""
-    main_scene = proj / "main.tscn"
-    script = proj / "src" / "main.gd"
+    from ..godot_wrapper.scenefile import (
+        SceneDocument,
+        SceneIndex,
+        attach_script,
+        summarize_scene,
+    )
 
-    if not main_scene.exists() or not script.exists():
+    main_scene = proj / "main.tscn"
+    if not (proj / "src" / "main.gd").exists():
         return
 
-    content = main_scene.read_text()
-
-    # Check if script is already attached (simple string check)
-    if 'path="res://src/main.gd"' in content:
+    # Cached per file signature, so unchanged scenes are not re-read
+    index = SceneIndex()
+    summary = index.get(main_scene)
+    if summary is None or summary.root is None or summary.root_script:
         return
 
-    # Check if we can safely inject
-    # Look for [gd_scene ...] header
-    if "[gd_scene" not in content:
+    print_info("Attaching src/main.gd to main.tscn...")
+    doc = SceneDocument.parse(main_scene.read_text(encoding="utf-8"))
+    if not attach_script(doc, "res://src/main.gd"):
         return
+    content = doc.to_text()
+    atomic_write_text(main_scene, content)
+    index.put(main_scene, summarize_scene(content))
+    print_success("Script attached successfully.")
 
-    print_info("Attaching src/main.gd to main.tscn...")
 
-    # update load_steps if possible, or just add resource
-    # For simplicity in this tool, we will try to inject the resource definition
-    # before the first node or resource.
+def default_project_godot(
+    name: str, version: str, feat_name: str, renderer: str
+) -> str:
+    """Content of a new project's project.godot."""
+    return f'''config_version=5
 
-    # 1. Add ExtResource definition
-    # We assign id="1_script" to avoid conflict with standard "1_script" if possible
-    # but "1_script" is standard for single script.
-    resource_def = '\n[ext_resource type="Script" path="res://src/main.gd" id="1_script"]\n'
+[application]
+config/name="{name}"
+run/main_scene=""
+config/features=PackedStringArray("{version}", "{feat_name}")
+config/icon="res://icon.svg"
+
+[display]
+window/size/viewport_width=1280
+window/size/viewport_height=720
+window/size/resizable=true
+window/stretch/mode="canvas_items"
+
+[rendering]
+renderer/rendering_method="{renderer}"
+'''
 
-    # Insert after format line
-    content = re.sub(
-        r"(\[gd_scene.*?\])", r"\1" + resource_def, content, count=1
-    )
 
-    # 2. Attach to root node
-    # Find [node name="Main" ...] and append script = ExtResource("1_script")
-    # We use regex to match the node header
-    content = re.sub(
-        r'(\[node name=".*?" type=".*?"]\n)',
-        r'\1script = ExtResource("1_script")\n',
-        content,
-        count=1,
+def create_from_template(
+    proj_path: Path,
+    spec: str,
+    variables: dict[str, str],
+    assignments: list[str],
+    link: bool,
+) -> None:
+    """Materialize a template into a new project directory."""
+    from ..godot_wrapper.templates import load_template, materialize
+
+    for item in assignments:
+        key, sep, value = item.partition("=")
+        if not sep or not key:
+            print_error(f"Invalid --var {item!r}: expected KEY=VALUE")
+            raise typer.Exit(1)
+        variables[key] = value
+
+    tpl = load_template(spec)
+    proj_path.mkdir(parents=True)
+    try:
+        stats = materialize(tpl, proj_path, variables, link=link)
+    except BaseException:
+        import shutil
+
+        # Don't leave a half-written project behind
+        shutil.rmtree(proj_path, ignore_errors=True)
+        raise
+    (proj_path / ".godot").mkdir(exist_ok=True)
+
+    methods = ", ".join(f"{n} {m}" for m, n in sorted(stats.methods.items()))
+    print_info(
+        f"Template {tpl.source.name}: {stats.files} files "
+        f"({stats.rendered} rendered{', ' + methods if methods else ''})"
     )
 
-    main_scene.write_text(content)
-    print_success("Script attached successfully.")
+
+def prewarm_imports(
+    wrapper: "GodotWrapper", path: Path, timeout: Optional[float] = None
+) -> bool:
+    """Run the headless asset import with a progress bar; report the result."""
+    from collections import deque
+    from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
+    from ..godot_wrapper.imports import import_assets
+
+    output: deque[str] = deque(maxlen=20)
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("{task.description}"),
+        BarColumn(),
+        TextColumn("{task.percentage:>3.0f}%"),
+        console=console,
+        transient=True,
+    ) as progress:
+        bar = progress.add_task("Importing assets", total=100)
+
+        def on_progress(task: str, percent: int, message: str) -> None:
+            progress.update(
+                bar, completed=percent, description=f"{task}: {message}"[:60]
+            )
+
+        stats = import_assets(
+            wrapper,
+            path,
+            on_progress=on_progress,
+            on_output=output.append,
+            timeout=timeout,
+        )
+
+    result = stats.result
+    if result.error:
+        print_error(f"Could not start Godot: {result.error}")
+        return False
+    if not result.ok:
+        for line in output:
+            console.print(line, markup=False, highlight=False)
+        reason = (
+            f"timed out after {timeout:g}s"
+            if result.timed_out
+            else f"exit code {result.returncode}"
+        )
+        print_error(f"Import failed ({reason}).")
+        return False
+
+    print_success(
+        f"Imported {stats.assets} assets in {result.wall_seconds:.1f}s"
+        f" ({stats.restored} from cache, {stats.stored} newly cached)."
+    )
+    return True
 
 
 @app.command()
@@ -164,12 +288,35 @@ def create(
     scripts: Optional[bool] = typer.Option(
         None, "--scripts", "-s", help="Generate sample scripts"
     ),
+    template: Optional[str] = typer.Option(
+        None,
+        "--template",
+        "-t",
+        help="Template directory, archive or name to start from",
+    ),
+    var: list[str] = typer.Option(
+        [], "--var", help="Template variable as KEY=VALUE (repeatable)"
+    ),
+    link: bool = typer.Option(
+        False,
+        "--link",
+        help="Hard link template files instead of copying (edits then "
+        "change the template too)",
+    ),
+    prewarm: bool = typer.Option(
+        False,
+        "--prewarm",
+        help="Import assets right away so the first launch is fast",
+    ),
     # Interactive flag removed
 ) -> None:
     """Create a new Godot project."""
+    from ..godot_wrapper.project import ProjectGodotFile
 
     # Interactive Wizard Trigger
     if name is None:
+        from ..ui.prompts import create_project_wizard
+
         data = create_project_wizard()
         if not data:
             raise typer.Exit()
@@ -190,7 +337,7 @@ def create(
                 ),
             )
 
-        if scripts is None:
+        if scripts is None and not template:
             scripts = typer.confirm("Generate sample scripts?", default=False)
 
     # Ensure valid renderer choice even if passed via flag
@@ -203,21 +350,6 @@ def create(
         print_error(f"Directory {proj_path} already exists.")
         raise typer.Exit(1)
 
-    proj_path.mkdir(parents=True)
-    for d in ["src", "assets", "addons", ".godot"]:
-        (proj_path / d).mkdir()
-
-    (proj_path / ".gitignore").write_text(
-        ".godot/\n.import/\nexport_presets.cfg\n"
-    )
-    (proj_path / ".gitattributes").write_text(
-        "*.wav filter=lfs diff=lfs merge=lfs -text\n"
-    )
-    (proj_path / ".gdignore").write_text("")
-    (proj_path / "addons/.gdignore").write_text("")
-    (proj_path / "icon.svg").write_text(ICON_SVG)
-    (proj_path / "icon.svg.import").write_text(ICON_IMPORT)
-
     cfg: AppConfig = cfg_mgr.load()
     version = cfg.godot.version or "4.3"
 
@@ -229,40 +361,64 @@ def create(
     }
     feat_name = feat_map.get(renderer, "Forward Plus")
 
-    pf = ProjectGodotFile(proj_path)
-    pf.write(f'''config_version=5
-
-[application]
-config/name="{name}"
-run/main_scene=""
-config/features=PackedStringArray("{version}", "{feat_name}")
-config/icon="res://icon.svg"
-
-[display]
-window/size/viewport_width=1280
-window/size/viewport_height=720
-window/size/resizable=true
-window/stretch/mode="canvas_items"
-
-[rendering]
-renderer/rendering_method="{renderer}"
-''')
-
-    if scripts:
-        (proj_path / "main.tscn").write_text(
-            '[gd_scene load_steps=2 format=3 uid="uid://b4y5z1x2w3v4"]\n\n[ext_resource type="Script" path="res://src/main.gd" id="1_script"]\n\n[node name="Main" type="Node"]\nscript = ExtResource("1_script")\n'
-        )
-        (proj_path / "src/main.gd").write_text(
-            'extends Node\n\nfunc _ready() -> void:\n\tprint("Ready")\n'
+    if template:
+        create_from_template(
+            proj_path,
+            template,
+            {
+                "name": name,
+                "renderer": renderer,
+                "renderer_name": feat_name,
+                "godot_version": version,
+            },
+            var,
+            link,
         )
+        project_godot = ProjectGodotFile(proj_path)
+        if not project_godot.exists():
+            project_godot.write(
+                default_project_godot(name, version, feat_name, renderer)
+            )
     else:
-        (proj_path / "main.tscn").write_text(
-            '[gd_scene format=3 uid="uid://b4y5z1x2w3v4"]\n\n[node name="Main" type="Node"]\n'
+        proj_path.mkdir(parents=True)
+        for d in ["src", "assets", "addons", ".godot"]:
+            (proj_path / d).mkdir()
+
+        (proj_path / ".gitignore").write_text(
+            ".godot/\n.import/\nexport_presets.cfg\n"
         )
+        (proj_path / ".gitattributes").write_text(
+            "*.wav filter=lfs diff=lfs merge=lfs -text\n"
+        )
+        (proj_path / ".gdignore").write_text("")
+        (proj_path / "addons/.gdignore").write_text("")
+        (proj_path / "icon.svg").write_text(ICON_SVG)
+        (proj_path / "icon.svg.import").write_text(ICON_IMPORT)
+
+        pf = ProjectGodotFile(proj_path)
+        pf.write(default_project_godot(name, version, feat_name, renderer))
+
+        if scripts:
+            (proj_path / "main.tscn").write_text(
+                '[gd_scene load_steps=2 format=3 uid="uid://b4y5z1x2w3v4"]\n\n[ext_resource type="Script" path="res://src/main.gd" id="1_script"]\n\n[node name="Main" type="Node"]\nscript = ExtResource("1_script")\n'
+            )
+            (proj_path / "src/main.gd").write_text(
+                'extends Node\n\nfunc _ready() -> void:\n\tprint("Ready")\n'
+            )
+        else:
+            (proj_path / "main.tscn").write_text(
+                '[gd_scene format=3 uid="uid://b4y5z1x2w3v4"]\n\n[node name="Main" type="Node"]\n'
+            )
 
-    cfg_mgr.track_project(name, proj_path)
+    # Absolute, so validation does not depend on the working directory
+    cfg_mgr.track_project(name, proj_path.resolve())
     print_success(f"Project '{name}' created at {proj_path}")
 
+    if prewarm:
+        prewarm_imports(
+            get_godot_wrapper(proj_path.resolve()), proj_path.resolve()
+        )
+
 
 @app.command()
 def run(
@@ -272,50 +428,599 @@ def run(
     debug: bool = False,
     fullscreen: bool = False,
     maximized: bool = False,
+    watch: bool = typer.Option(
+        False, "--watch", "-w", help="Restart when scripts or scenes change"
+    ),
+    timeout: Optional[float] = typer.Option(
+        None, "--timeout", help="Stop Godot after this many seconds"
+    ),
 ) -> None:
     """Run project."""
+    if watch and editor:
+        print_error("--watch cannot be combined with --editor.")
+        raise typer.Exit(1)
+    if watch and timeout is not None:
+        print_error("--watch cannot be combined with --timeout.")
+        raise typer.Exit(1)
+
     path: Path = get_proj_path(proj)
-    wrapper: GodotWrapper = get_godot_wrapper()
+    wrapper: GodotWrapper = get_godot_wrapper(path)
+    if tracked := cfg_mgr.registry.find_by_path(path):
+        cfg_mgr.registry.touch(tracked.name)
+
+    if watch:
+        run_watched(
+            wrapper,
+            path,
+            scene=scene,
+            debug=debug,
+            fullscreen=fullscreen,
+            maximized=maximized,
+        )
+        return
 
     # Auto-update main scene before running
     ensure_main_scene(path)
     ensure_script_attachment(path)
 
     print_info(f"Running {path.name}...")
-    wrapper.run_editor(
+    result = wrapper.run_editor(
         path,
         scene=scene,
         editor=editor,
         debug=debug,
         fullscreen=fullscreen,
         maximized=maximized,
+        timeout=timeout,
+    )
+    if result.error:
+        print_error(f"Could not start Godot: {result.error}")
+        raise typer.Exit(1)
+    if result.timed_out:
+        print_warning(f"Stopped Godot after {timeout:g}s timeout.")
+        raise typer.Exit(1)
+    if result.returncode:
+        print_error(
+            f"Godot exited with code {result.returncode} after"
+            f" {result.wall_seconds:.1f}s."
+        )
+        raise typer.Exit(result.returncode)
+
+
+def run_watched(wrapper: "GodotWrapper", path: Path, **kwargs) -> None:
+    """Run the game and restart it when sources change, until Ctrl+C."""
+    import subprocess
+
+    from ..godot_wrapper.watch import watch_and_restart
+
+    def on_restart(changed: set[str]) -> None:
+        shown = ", ".join(sorted(changed)[:3])
+        if len(changed) > 3:
+            shown += f" (+{len(changed) - 3} more)"
+        print_info(f"Changed: {shown}. Restarting {path.name}...")
+
+    def on_exit(code: int) -> None:
+        print_info(f"Godot exited ({code}). Waiting for changes...")
+
+    def spawn() -> Optional[subprocess.Popen]:
+        # Every start, so a main scene added while watching is picked up
+        ensure_main_scene(path)
+        ensure_script_attachment(path)
+        try:
+            return wrapper.spawn_editor(path, **kwargs)
+        except OSError as e:
+            print_error(f"Could not start Godot: {e}")
+            print_info("Waiting for changes...")
+            return None
+
+    print_info(f"Running {path.name} in watch mode (Ctrl+C to stop)...")
+    try:
+        watch_and_restart(
+            path,
+            spawn,
+            on_restart=on_restart,
+            on_exit=on_exit,
+        )
+    except KeyboardInterrupt:
+        print_info("Stopped watching.")
+
+
+@app.command()
+def script(
+    scripts: list[Path] = typer.Argument(..., help="GDScript files to run"),
+    proj: Optional[str] = typer.Option(None, "--project", "-p"),
+    args: Optional[list[str]] = typer.Option(
+        None, "--arg", "-a", help="Argument passed to every script"
+    ),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-j", help="Warm Godot workers (default: CPUs)"
+    ),
+    one_shot: bool = typer.Option(
+        False, "--one-shot", help="Start a fresh Godot for every script"
+    ),
+    timeout: Optional[float] = typer.Option(
+        None, "--timeout", help="Stop a script after this many seconds"
+    ),
+) -> None:
+    """Run GDScript jobs headless, reusing warm Godot workers."""
+    from ..godot_wrapper.workers import JobResult, run_scripts
+
+    path: Path = get_proj_path(proj)
+    if missing := [s for s in scripts if not s.is_file()]:
+        print_error(f"Script not found: {missing[0]}")
+        raise typer.Exit(1)
+    wrapper: GodotWrapper = get_godot_wrapper(path)
+
+    def on_done(result: JobResult) -> None:
+        status = print_success if result.ok else print_error
+        if result.timed_out:
+            msg = f"timed out after {result.seconds:.1f}s"
+        else:
+            msg = f"exit {result.returncode} in {result.seconds:.2f}s"
+        status(f"{result.script}: {msg}")
+        for line in result.output:
+            console.print(f"  {line}", markup=False, highlight=False)
+
+    def on_fallback(reason: str) -> None:
+        print_warning(f"{reason}. Falling back to one-shot mode.")
+
+    results = run_scripts(
+        wrapper,
+        path,
+        scripts,
+        args or [],
+        workers=workers,
+        one_shot=one_shot,
+        timeout=timeout,
+        on_done=on_done,
+        on_fallback=on_fallback,
+    )
+    if failed := [r for r in results if not r.ok]:
+        print_error(f"{len(failed)} of {len(results)} script(s) failed.")
+        raise typer.Exit(1)
+
+
+@app.command()
+def test(
+    paths: Optional[list[Path]] = typer.Argument(
+        None, help="Test files or folders (default: the whole project)"
+    ),
+    proj: Optional[str] = typer.Option(None, "--project", "-p"),
+    jobs: Optional[int] = typer.Option(
+        None, "--jobs", "-j", help="Concurrent Godot processes"
+    ),
+    junit: Optional[Path] = typer.Option(
+        None, "--junit", help="JUnit XML report path"
+    ),
+    timeout: Optional[float] = typer.Option(
+        None, "--timeout", help="Stop a Godot process after this many seconds"
+    ),
+) -> None:
+    """Run GDScript tests in parallel."""
+    from ..godot_wrapper.testing import (
+        TestFile,
+        discover_tests,
+        run_tests,
+        write_junit,
+    )
+
+    path: Path = get_proj_path(proj)
+    scripts = discover_tests(path, paths)
+    if not scripts:
+        print_warning("No test scripts found (test_*.gd or *_test.gd).")
+        return
+
+    shards = max(1, min(jobs or os.cpu_count() or 1, len(scripts)))
+    wrapper: GodotWrapper = get_godot_wrapper(path)
+
+    def on_file(f: TestFile) -> None:
+        passed = sum(c.ok for c in f.cases)
+        summary = f"{f.file}: {passed}/{len(f.cases)} passed ({f.seconds:.2f}s)"
+        if f.ok:
+            print_success(summary)
+            return
+        print_error(summary)
+        for c in f.cases:
+            if not c.ok:
+                console.print(
+                    f"  {c.name}: {c.status} {c.message}".rstrip(),
+                    markup=False,
+                    highlight=False,
+                )
+                for line in c.output:
+                    console.print(f"    {line}", markup=False, highlight=False)
+
+    print_info(
+        f"Running {len(scripts)} test file(s) on {shards} process(es)..."
+    )
+    start = time.perf_counter()
+    results = run_tests(
+        wrapper, path, scripts, shards, timeout=timeout, on_file=on_file
     )
+    wall = time.perf_counter() - start
+
+    report = junit or path / "build" / "test-results.xml"
+    write_junit(results, report, path.name)
+
+    cases = [c for f in results for c in f.cases]
+    failed = [c for c in cases if not c.ok]
+    total = sum(f.seconds for f in results)
+    msg = (
+        f"{len(cases) - len(failed)} passed, {len(failed)} failed in"
+        f" {wall:.2f}s (test time {total:.2f}s). Report: {report}"
+    )
+    if failed:
+        print_error(msg)
+        raise typer.Exit(1)
+    print_success(msg)
 
 
 @app.command()
-def projects() -> None:
+def projects(
+    prune: bool = typer.Option(
+        False, "--prune", help="Remove projects whose folder is gone"
+    ),
+    tag: Optional[str] = typer.Option(
+        None, "--tag", "-t", help="Only projects with this tag"
+    ),
+    recent: Optional[int] = typer.Option(
+        None, "--recent", help="Only the N most recently used projects"
+    ),
+) -> None:
     """List projects."""
+    from ..ui.tables import create_projects_table
+
     cfg: AppConfig = cfg_mgr.load()
-    table = create_projects_table(cfg.projects, cfg.current_project)
+    if prune:
+        removed = cfg_mgr.validate_projects(force=True)
+        for name in removed:
+            print_info(f"Removed missing project: {name}")
+        if not removed:
+            print_info("All tracked projects exist.")
+
+    registry = cfg_mgr.registry
+    if tag or recent:
+        rows = registry.by_tag(tag) if tag else registry.recent(recent)
+        if tag and recent:
+            rows = sorted(rows, key=lambda p: p.last_accessed, reverse=True)
+            rows = rows[:recent]
+        listed = {p.name: str(p.path) for p in rows}
+    else:
+        listed = registry.paths()
+
+    table = create_projects_table(listed, cfg.current_project)
     console.print(table)
 
 
 @app.command()
 def switch(name: str) -> None:
     """Switch current project."""
-    cfg: AppConfig = cfg_mgr.load()
-    if name not in cfg.projects:
+    if not cfg_mgr.registry.get(name):
         print_error(f"Project '{name}' not found.")
         raise typer.Exit(1)
 
-    cfg.current_project = name
-    cfg_mgr.save(cfg)
+    with cfg_mgr.transaction() as cfg:
+        cfg.current_project = name
+    cfg_mgr.registry.touch(name)
     print_success(f"Switched to {name}")
 
 
+@app.command()
+def tag(
+    name: str,
+    tags: list[str] = typer.Argument(..., help="Tags to add"),
+    remove: bool = typer.Option(
+        False, "--remove", "-r", help="Remove the tags instead"
+    ),
+) -> None:
+    """Tag a project."""
+    if not cfg_mgr.registry.get(name):
+        print_error(f"Project '{name}' not found.")
+        raise typer.Exit(1)
+
+    if remove:
+        cfg_mgr.registry.set_tags(name, remove=tags)
+    else:
+        cfg_mgr.registry.set_tags(name, add=tags)
+    print_success(
+        f"Tags of {name}: {', '.join(cfg_mgr.registry.get(name).tags)}"
+    )
+
+
+@app.command("import")
+def import_(
+    proj: Optional[str] = typer.Option(None, "--project", "-p"),
+    timeout: Optional[float] = typer.Option(
+        None, "--timeout", help="Stop Godot after this many seconds"
+    ),
+) -> None:
+    """Import assets headless so the first launch starts at full speed."""
+    path: Path = get_proj_path(proj)
+    if not prewarm_imports(get_godot_wrapper(path), path, timeout):
+        raise typer.Exit(1)
+
+
+@app.command()
+def graph(
+    proj: Optional[str] = typer.Option(None, "--project", "-p"),
+    deps: Optional[str] = typer.Option(
+        None, "--deps", "-d", help="List what FILE references"
+    ),
+    dependents: Optional[str] = typer.Option(
+        None, "--dependents", "-D", help="List what references FILE"
+    ),
+    recursive: bool = typer.Option(
+        False, "--recursive", "-r", help="Follow references transitively"
+    ),
+    unreferenced: bool = typer.Option(
+        False, "--unreferenced", "-u", help="List assets nothing references"
+    ),
+    missing: bool = typer.Option(
+        False, "--missing", "-m", help="List references to missing files"
+    ),
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Re-parse every file, ignoring the index"
+    ),
+    jobs: Optional[int] = typer.Option(
+        None, "--jobs", "-j", help="Parser processes (default: CPU count)"
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print JSON"),
+) -> None:
+    """Query the resource dependency graph of a project."""
+    from ..godot_wrapper.graph import build_graph
+
+    path: Path = get_proj_path(proj)
+    if not (path / "project.godot").exists():
+        print_error("No project.godot found.")
+        raise typer.Exit(1)
+
+    start = time.perf_counter()
+    g, stats = build_graph(path, refresh=refresh, workers=jobs)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    result: dict[str, list] = {}
+    for option, query in ((deps, g.dependencies), (dependents, g.dependents)):
+        if option:
+            rel = g.to_rel(option)
+            if rel not in g.files:
+                print_error(f"Not a project file: {option}")
+                raise typer.Exit(1)
+            result[f"res://{rel}"] = [
+                f"res://{r}" for r in query(rel, recursive)
+            ]
+    if unreferenced:
+        result["unreferenced"] = [f"res://{r}" for r in g.unreferenced()]
+    if missing:
+        result["missing"] = [
+            f"res://{rel}:{ref.line}: {ref.path or ref.uid}"
+            for rel in sorted(g.missing)
+            for ref in g.missing[rel]
+        ]
+
+    if not result:
+        summary = {
+            "files": len(g.files),
+            "references": sum(len(t) for t in g.edges.values()),
+            "missing": sum(len(r) for r in g.missing.values()),
+            "parsed": stats.parsed,
+        }
+        if as_json:
+            console.print_json(json.dumps(summary))
+        else:
+            print_info(
+                f"{summary['files']} files, {summary['references']} "
+                f"references, {summary['missing']} missing (parsed "
+                f"{stats.parsed} in {elapsed:.0f} ms)"
+            )
+        return
+
+    if as_json:
+        console.print_json(json.dumps(result))
+        return
+    for key, rows in result.items():
+        if len(result) > 1:
+            console.print(f"{key}:", style="bold", markup=False)
+        for row in rows:
+            console.print(row, markup=False, highlight=False)
+
+
+@app.command()
+def check(
+    proj: Optional[str] = typer.Option(None, "--project", "-p"),
+    strict: bool = typer.Option(
+        False, "--strict", help="Fail on warnings as well as errors"
+    ),
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Re-parse every file, ignoring the index"
+    ),
+    jobs: Optional[int] = typer.Option(
+        None, "--jobs", "-j", help="Parser processes (default: CPU count)"
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print JSON"),
+) -> None:
+    """Find broken res:// paths and UIDs without launching Godot."""
+    from dataclasses import asdict
+
+    from rich.text import Text
+
+    from ..godot_wrapper.check import ERROR, check_project
+
+    path: Path = get_proj_path(proj)
+    if not (path / "project.godot").exists():
+        print_error("No project.godot found.")
+        raise typer.Exit(1)
+
+    start = time.perf_counter()
+    issues, g, _ = check_project(path, refresh=refresh, workers=jobs)
+    elapsed = (time.perf_counter() - start) * 1000
+    errors = sum(i.severity == ERROR for i in issues)
+    warnings = len(issues) - errors
+    failed = errors > 0 or (strict and warnings > 0)
+
+    if as_json:
+        console.print_json(json.dumps([asdict(i) for i in issues]))
+    else:
+        for issue in issues:
+            console.print(
+                Text.assemble(
+                    (issue.location, "bold"),
+                    ": ",
+                    (issue.severity, issue.severity),
+                    f": {issue.message}",
+                ),
+                highlight=False,
+                soft_wrap=True,
+            )
+        if issues:
+            summary = f"{errors} errors, {warnings} warnings"
+            (print_error if failed else print_warning)(summary)
+        else:
+            print_success(
+                f"No broken references in {len(g.files)} files "
+                f"({elapsed:.0f} ms)"
+            )
+    if failed:
+        raise typer.Exit(1)
+
+
+@app.command()
+def versions(
+    proj: Optional[str] = typer.Option(None, "--project", "-p"),
+    add: Optional[Path] = typer.Option(
+        None, "--add", help="Register a Godot executable"
+    ),
+    remove: Optional[str] = typer.Option(
+        None, "--remove", help="Unregister an install by label"
+    ),
+    default: Optional[str] = typer.Option(
+        None, "--default", help="Use an install (label or 4.x) by default"
+    ),
+    gc: bool = typer.Option(
+        False, "--gc", help="Free store files no install uses any more"
+    ),
+) -> None:
+    """List and manage registered Godot versions."""
+    from ..godot_wrapper.versions import (
+        InstallIndex,
+        InstallStore,
+        install_label,
+        pinned_executable,
+    )
+    from ..ui.tables import create_versions_table
+
+    if add:
+        exe = add.expanduser().resolve()
+        try:
+            version = detect_godot_version(exe)
+        except GodotVersionError as e:
+            print_error(f"Cannot register {add}: {e}")
+            raise typer.Exit(1)
+        label = install_label(version)
+        with cfg_mgr.transaction() as cfg:
+            cfg.godot.installs[label] = exe
+        print_success(f"Registered Godot {label}: {exe}")
+
+    if remove:
+        with cfg_mgr.transaction() as cfg:
+            if (exe := cfg.godot.installs.pop(remove, None)) is None:
+                print_error(f"No install named '{remove}'.")
+                raise typer.Exit(1)
+            if cfg.godot.executable_path == exe:
+                cfg.godot.executable_path = None
+        store = InstallStore()
+        if store.uninstall("editor", remove):
+            freed = store.gc()
+            print_success(
+                f"Uninstalled Godot {remove} "
+                f"({freed / (1024 * 1024):.1f} MiB freed)"
+            )
+        else:
+            print_success(f"Unregistered Godot {remove}")
+
+    if default:
+        with cfg_mgr.transaction() as cfg:
+            index = InstallIndex(cfg.godot.installs)
+            if not (label := index.label_for(default)):
+                print_error(f"No install matches '{default}'.")
+                raise typer.Exit(1)
+            cfg.godot.executable_path = index.installs[label]
+            cfg.godot.version = ".".join(label.split(".")[:2])
+        print_success(f"Default Godot is now {label}")
+
+    if gc:
+        freed = InstallStore().gc()
+        print_info(f"Freed {freed / (1024 * 1024):.1f} MiB")
+
+    cfg: AppConfig = cfg_mgr.load()
+    installs = cfg.godot.installs
+    pin, pinned = None, None
+    path = get_proj_path(proj)
+    if (path / "project.godot").exists():
+        pin, pinned = pinned_executable(path, installs)
+
+    rows = []
+    for label in sorted(installs):
+        exe = installs[label]
+        marks = []
+        if exe == cfg.godot.executable_path:
+            marks.append("default")
+        if pinned and exe == pinned:
+            marks.append(f"project ({pin})")
+        if not exe.exists():
+            marks.append("missing")
+        rows.append((label, str(exe), ", ".join(marks)))
+    console.print(create_versions_table(rows))
+    if pin and not pinned:
+        print_warning(f"Project wants Godot {pin}, which is not registered.")
+
+
+@app.command()
+def install(
+    archives: list[Path] = typer.Argument(
+        ..., help="Godot .zip downloads and .tpz export templates"
+    ),
+    jobs: Optional[int] = typer.Option(
+        None, "--jobs", "-j", help="Unpacking threads"
+    ),
+) -> None:
+    """Install local Godot and export template archives side by side."""
+    from ..godot_wrapper.versions import InstallStore, link_templates
+
+    results = InstallStore().install(archives, workers=jobs)
+    failed = False
+    for res in results:
+        if res.error:
+            print_error(f"{res.archive.name}: {res.error}")
+            failed = True
+            continue
+        if res.kind == "editor":
+            with cfg_mgr.transaction() as cfg:
+                cfg.godot.installs[res.label] = res.path
+                if not cfg.godot.executable_path:
+                    cfg.godot.executable_path = res.path
+                    cfg.godot.version = ".".join(res.label.split(".")[:2])
+        elif linked := link_templates(res.path, res.label):
+            print_info(f"Export templates {res.label} linked into {linked}")
+
+        if res.cached:
+            detail = "already installed"
+        else:
+            mib = 1024 * 1024
+            detail = (
+                f"{res.files} files, {res.bytes / mib:.1f} MiB, "
+                f"{res.new_bytes / mib:.1f} MiB new"
+            )
+        print_success(f"{res.kind.capitalize()} {res.label} ({detail})")
+    if failed:
+        raise typer.Exit(1)
+
+
 @app.command()
 def info(proj: Optional[str] = typer.Option(None, "--project", "-p")) -> None:
     """Show project info."""
+    from ..godot_wrapper.project import ProjectGodotFile
+    from ..ui.tables import create_info_table
+
     path: Path = get_proj_path(proj)
     pf = ProjectGodotFile(path)
     if not pf.exists():
@@ -331,34 +1036,170 @@ def info(proj: Optional[str] = typer.Option(None, "--project", "-p")) -> None:
     console.print(create_info_table(data))
 
 
+def format_rss(peak_rss: Optional[int]) -> str:
+    """Peak memory suffix for status lines, empty if unknown."""
+    if not peak_rss:
+        return ""
+    return f", peak {peak_rss / (1024 * 1024):.0f} MiB"
+
+
 @app.command()
 def export(
-    preset: str,
-    output: Optional[str] = None,
+    presets: Optional[list[str]] = typer.Argument(
+        None, help="Presets to export"
+    ),
+    all_presets: bool = typer.Option(
+        False, "--all", "-a", help="Export every preset in export_presets.cfg"
+    ),
+    output: Optional[str] = typer.Option(
+        None, "--output", "-o", help="Output file (single preset only)"
+    ),
     proj: Optional[str] = None,
     debug: bool = False,
+    jobs: Optional[int] = typer.Option(
+        None, "--jobs", "-j", help="Concurrent exports (default: by CPU/RAM)"
+    ),
+    force: bool = typer.Option(
+        False, "--force", "-f", help="Export even if nothing changed"
+    ),
+    timeout: Optional[float] = typer.Option(
+        None, "--timeout", help="Stop an export after this many seconds"
+    ),
+    no_preflight: bool = typer.Option(
+        False,
+        "--no-preflight",
+        help="Skip the preset and export template checks",
+    ),
 ) -> None:
     """Export project."""
+    from ..godot_wrapper.export import (
+        ExportJob,
+        ExportResult,
+        check_outputs,
+        default_output,
+        default_worker_count,
+        godot_build_id,
+        plan_incremental,
+        preset_slug,
+        read_export_presets,
+        run_exports,
+    )
+    from ..godot_wrapper.preflight import (
+        preflight_export,
+        templates_archive_name,
+    )
+    from ..godot_wrapper.version import probe_godot_version
+    from ..ui.tables import create_export_table
+
     path: Path = get_proj_path(proj)
-    if not output:
-        # Infer output path/name
-        # Simple default to ./build/
-        out_dir = path / "build"
-        out_dir.mkdir(exist_ok=True)
-        ext = (
-            ".exe"
-            if "Windows" in preset
-            else ".x86_64"
-            if "Linux" in preset
-            else ".zip"
-        )
-        output = str(out_dir / f"{path.name}{ext}")
+    defined = {p.name: p for p in read_export_presets(path)}
+    names = list(defined) if all_presets else list(presets or [])
+    if not names:
+        if all_presets:
+            print_error("No presets found in export_presets.cfg.")
+        else:
+            print_error("Specify one or more presets, or --all.")
+        raise typer.Exit(1)
+    if output and len(names) > 1:
+        print_error("--output can only be used with a single preset.")
+        raise typer.Exit(1)
 
-    wrapper: GodotWrapper = get_godot_wrapper()
-    print_info(f"Exporting to {output}...")
+    def preset_output(name: str) -> Path:
+        p = defined.get(name)
+        if p and p.export_path:
+            # Godot resolves relative export paths against the project
+            return path / p.export_path
+        return default_output(path, name, p.platform if p else "")
+
+    export_jobs = []
+    for name in names:
+        out = Path(output) if output else preset_output(name)
+        log = path / "build" / "logs" / f"{preset_slug(name)}.log"
+        export_jobs.append(ExportJob(name, out, log, debug))
     try:
-        wrapper.export_project(path, preset, Path(output), debug=debug)
-        print_success("Export successful.")
-    except subprocess.CalledProcessError:
-        print_error("Export failed.")
+        check_outputs(export_jobs)
+    except ExportError as e:
+        print_error(str(e))
+        print_info("Give the presets distinct export paths.")
+        raise typer.Exit(1)
+
+    wrapper: GodotWrapper = get_godot_wrapper(path)
+    if not no_preflight:
+        try:
+            version = probe_godot_version(wrapper.godot_path)
+        except GodotVersionError as e:
+            print_warning(f"Could not detect Godot version: {e}")
+            version = None
+        preflight = preflight_export(
+            path, names, defined, version, debug, wrapper.godot_path
+        )
+        for problem in preflight.problems:
+            print_error(f"{problem.preset}: {problem.message}")
+        if any(p.missing_templates for p in preflight.problems):
+            print_info(
+                f"Install the {preflight.label} export templates with"
+                f" 'godoco install {templates_archive_name(version)}'"
+                " or from the editor (Editor > Manage Export Templates)."
+                f" Godot looks for them in {preflight.folder}."
+            )
+        if not preflight.ok:
+            raise typer.Exit(1)
+        for job in export_jobs:
+            job.templates = preflight.templates.get(job.preset, "")
+
+    order = {id(job): i for i, job in enumerate(export_jobs)}
+    results: list[ExportResult] = []
+    if not force:
+        export_jobs, results = plan_incremental(
+            path,
+            export_jobs,
+            godot_build_id(wrapper.godot_path),
+            [preset_output(n) for n in defined if n not in names],
+        )
+        for r in results:
+            print_success(f"{r.job.preset} is up to date.")
+    workers = jobs or default_worker_count(len(export_jobs))
+
+    def on_start(job: ExportJob) -> None:
+        print_info(f"Exporting {job.preset} to {job.output}...")
+
+    def on_done(result: ExportResult) -> None:
+        job = result.job
+        if result.ok:
+            print_success(
+                f"{job.preset} exported in {result.seconds:.1f}s"
+                f"{format_rss(result.peak_rss)}."
+            )
+        else:
+            print_error(
+                f"{job.preset} failed (exit {result.returncode}) after"
+                f" {result.seconds:.1f}s. Log: {job.log}"
+            )
+
+    if len(export_jobs) > 1:
+        print_info(
+            f"Exporting {len(export_jobs)} presets,"
+            f" {min(workers, len(export_jobs))} at a time."
+        )
+    results += run_exports(
+        wrapper,
+        path,
+        export_jobs,
+        workers=workers,
+        on_start=on_start,
+        on_done=on_done,
+        timeout=timeout,
+    )
+    results.sort(key=lambda r: order[id(r.job)])
+
+    if len(results) > 1:
+        console.print(create_export_table(results))
+
+    if failed := [r for r in results if not r.ok]:
+        if len(results) == 1:
+            # Show the tail of the log so single exports stay debuggable
+            lines = failed[0].job.log.read_text(errors="replace").splitlines()
+            for line in lines[-20:]:
+                console.print(line, markup=False, highlight=False)
+        print_error(f"{len(failed)} of {len(results)} export(s) failed.")
         raise typer.Exit(1)
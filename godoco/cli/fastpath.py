@@ -0,0 +1,151 @@
+"""
+Startup fast path.
+
+Passthrough invocations (``godoco --path x --headless``) only need to find
+Godot and hand over the arguments. This module decides that from argv and
+execs Godot using the standard library only, so typer, rich, questionary
+and pydantic are never imported for them.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+import os
+import sys
+from typing import Optional
+
+# The commands registered in commands.py; benchmarks/startup.py fails
+# if the two drift apart
+COMMAND_NAMES = frozenset({
+    "setup",
+    "create",
+    "run",
+    "script",
+    "test",
+    "projects",
+    "switch",
+    "tag",
+    "info",
+    "export",
+    "import",
+    "graph",
+    "check",
+    "versions",
+    "install",
+})
+
+# Root options handled by the typer app itself
+ROOT_OPTIONS = frozenset({
+    "-h",
+    "--help",
+    "-V",
+    "--version",
+    "--refresh",
+    "--profile",
+})
+
+
+def is_passthrough(argv: list[str]) -> bool:
+    """
+    Check whether argv would be forwarded to Godot unchanged.
+
+    Parameters
+    ----------
+    argv : list[str]
+        Arguments after the program name.
+
+    Returns
+    -------
+    bool
+        True if the first argument is not a godoco command and no godoco
+        root option is present.
+    """
+    if not argv or argv[0] in COMMAND_NAMES:
+        return False
+    return not any(arg in ROOT_OPTIONS for arg in argv)
+
+
+def _project_dir(argv: list[str]) -> Optional[Path]:
+    """Project Godot would open: ``--path`` or the working directory."""
+    for i, arg in enumerate(argv):
+        if arg == "--path" and i + 1 < len(argv):
+            return Path(argv[i + 1])
+        if arg.startswith("--path="):
+            return Path(arg.split("=", 1)[1])
+    return Path.cwd() if os.path.exists("project.godot") else None
+
+
+def run_godot(argv: list[str], replace: bool = True) -> Optional[int]:
+    """
+    Run Godot with the given arguments.
+
+    A project pinned to a registered Godot version (see ``godoco
+    versions``) runs with that version, otherwise the configured Godot.
+
+    Parameters
+    ----------
+    argv : list[str]
+        Arguments for Godot.
+    replace : bool
+        On POSIX, replace the current process with Godot; this function
+        then does not return. Otherwise Godot runs as a child.
+
+    Returns
+    -------
+    Optional[int]
+        Godot's exit code, or None if Godot could not be found or
+        started.
+    """
+    from ..godot_wrapper.detector import (
+        find_godot_executable,
+        registered_installs,
+    )
+    from ..godot_wrapper.pins import pinned_install
+
+    exe = None
+    if (installs := registered_installs()) and (
+        proj := _project_dir(argv)
+    ) is not None:
+        exe = pinned_install(proj, installs)
+    exe = exe or find_godot_executable()
+    if not exe:
+        return None
+
+    cmd = [str(exe)] + argv
+    sys.stdout.flush()
+    if replace and os.name == "posix":
+        from ..utils import trace
+
+        # exec skips atexit handlers, so report now
+        trace.finish()
+        try:
+            os.execv(cmd[0], cmd)
+        except OSError:
+            # Let the caller report the error
+            return None
+
+    import subprocess
+
+    try:
+        return subprocess.run(cmd).returncode
+    except OSError:
+        return None
+
+
+def try_passthrough(argv: list[str]) -> Optional[int]:
+    """
+    Run Godot directly for passthrough arguments, see ``run_godot``.
+
+    Parameters
+    ----------
+    argv : list[str]
+        Arguments after the program name.
+
+    Returns
+    -------
+    Optional[int]
+        Godot's exit code, or None if argv is not a passthrough or Godot
+        could not be found (the full CLI then reports the problem).
+    """
+    if not is_passthrough(argv):
+        return None
+    return run_godot(argv)
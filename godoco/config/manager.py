@@ -1,67 +1,178 @@
 """Configuration manager."""
 
 from __future__ import annotations
+from contextlib import contextmanager
 from pathlib import Path
 import json
-from typing import Optional
-from .models import AppConfig
+import os
+import time
+from typing import TYPE_CHECKING, Any, Iterator, Optional
 from ..utils.errors import InvalidConfigError
+from ..utils.fs import FileLock, atomic_write_text
+from ..utils.paths import CONFIG_PATH
+from ..utils.trace import span, traced
 
-CONFIG_PATH = Path.home() / ".godoco.json"
+if TYPE_CHECKING:
+    from .models import AppConfig
+    from .registry import ProjectRegistry
 
 
 class ConfigManager:
-    """Manages loading and saving of application configuration."""
+    """
+    Manages loading and saving of application configuration.
+
+    Writes are atomic (temp file, fsync, rename) and serialized across
+    processes with an advisory lock on ``<config>.lock``. Inside
+    ``batch()`` saves and transactions are coalesced into a single write.
+    A write merges in fields other processes changed since the config
+    was read, so deferred writes do not overwrite them.
+    """
 
     def __init__(self, path: Path = CONFIG_PATH):
         self.path = path
         self._config: Optional[AppConfig] = None
+        self._lock = FileLock(path.with_name(path.name + ".lock"))
+        self._batch_depth = 0
+        self._dirty = False
+        # The config as last read from or written to disk
+        self._base: Optional[dict[str, Any]] = None
+        self._validated = False
+        self._registry: Optional[ProjectRegistry] = None
 
-    def load(self) -> AppConfig:
+    @traced("config.read")
+    def _read(self) -> AppConfig:
         """
-        Load configuration from disk.
+        Read configuration from disk.
+
+        Raises
+        ------
+        InvalidConfigError
+            If the file exists but cannot be read or parsed. The file is
+            left untouched so tracked projects are never silently lost.
         """
-        if self._config:
-            self.validate_projects()
-            return self._config
+        # Deferred: pydantic is the single most expensive import
+        from .models import AppConfig
 
-        if not self.path.exists():
-            self._config = AppConfig()
-            return self._config
+        try:
+            text = self.path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return AppConfig()
+        except OSError as e:
+            raise InvalidConfigError(f"Cannot read {self.path}: {e}") from e
 
         try:
-            data = json.loads(self.path.read_text())
-            self._config = AppConfig(**data)
-            self.validate_projects()
-            return self._config
-        except Exception:
-            # Return fresh config on error
-            self._config = AppConfig()
-            return self._config
-
-    def validate_projects(self) -> None:
-        """Remove projects that no longer exist."""
+            return AppConfig(**json.loads(text))
+        except ValueError as e:
+            raise InvalidConfigError(
+                f"{self.path} is corrupt and was left untouched; fix or "
+                f"remove it. ({e.__class__.__name__}: {e})"
+            ) from e
+
+    def _reload(self) -> AppConfig:
+        self._config = self._read()
+        self._base = self._config.model_dump(mode="json")
+        return self._config
+
+    @property
+    def registry(self) -> ProjectRegistry:
+        """Project registry (opened on first use)."""
+        if self._registry is None:
+            from .registry import ProjectRegistry
+
+            self._registry = ProjectRegistry()
+        return self._registry
+
+    @traced("config.load")
+    def load(self) -> AppConfig:
+        """
+        Load configuration from disk.
+
+        Projects still listed in the legacy ``projects`` map are moved into
+        the registry. Tracked projects are validated at most once per
+        process, and only when the last validation is older than
+        ``validation_ttl``.
+
+        Raises
+        ------
+        InvalidConfigError
+            If the config file is unreadable or corrupt.
+        """
         if not self._config:
-            return
+            self._reload()
+            if self._config.projects:
+                self.migrate_projects()
+
+        if not self._validated:
+            last = float(self.registry.get_meta("last_validated") or 0)
+            if time.time() - last >= self._config.validation_ttl:
+                self.validate_projects()
+            self._validated = True
+        return self._config
+
+    def migrate_projects(self) -> int:
+        """
+        Move the legacy JSON ``projects`` map into the registry.
+
+        Safe to repeat: names already in the registry are kept.
+
+        Returns
+        -------
+        int
+            Number of projects imported.
+        """
+        with self.transaction() as cfg:
+            added = self.registry.import_projects(cfg.projects)
+            cfg.projects = {}
+        return added
 
-        cleaned = {}
-        modified = False
-        for name, path_str in self._config.projects.items():
-            if Path(path_str).exists():
-                cleaned[name] = path_str
-            else:
-                modified = True
+    @traced("config.validate_projects")
+    def validate_projects(self, force: bool = False) -> list[str]:
+        """
+        Remove projects that no longer exist.
 
-        if modified:
-            self._config.projects = cleaned
-            if self._config.current_project not in cleaned:
-                self._config.current_project = None
-            self.save()
+        Paths are stat-ed concurrently, so slow (network) mounts overlap.
+        The validation time is recorded in the registry.
+
+        Parameters
+        ----------
+        force : bool
+            Validate even if this process already did.
+
+        Returns
+        -------
+        list[str]
+            Names of the removed projects.
+        """
+        if self._validated and not force:
+            return []
+        self._validated = True
+
+        items = list(self.registry.paths().items())
+        if len(items) > 8:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=min(32, len(items))) as pool:
+                exists = list(pool.map(os.path.exists, (p for _, p in items)))
+        else:
+            exists = [os.path.exists(p) for _, p in items]
+        missing = sorted(name for (name, _), ok in zip(items, exists) if not ok)
+
+        self.registry.remove(missing)
+        self.registry.set_meta("last_validated", str(time.time()))
+
+        cfg = self._config or self._read()
+        if cfg.current_project in missing:
+            with self.transaction() as cfg:
+                if cfg.current_project in missing:
+                    cfg.current_project = None
+        return missing
 
     def save(self, config: Optional[AppConfig] = None) -> None:
         """
         Save configuration to disk.
 
+        Inside ``batch()`` the write is deferred to the end of the batch.
+
         Parameters
         ----------
         config : Optional[AppConfig]
@@ -73,16 +184,73 @@ class ConfigManager:
         if not self._config:
             return
 
-        # Atomic write pattern could be implemented here,
-        # but simple write is fine for now.
-        content = self._config.model_dump_json(indent=4)
-        self.path.write_text(content)
+        if self._batch_depth:
+            self._dirty = True
+            return
+        self._flush()
+
+    def _flush(self) -> None:
+        with span("config.save"), self._lock:
+            if self._base is not None:
+                try:
+                    theirs = self._read().model_dump(mode="json")
+                except InvalidConfigError:
+                    theirs = self._base
+                if theirs != self._base:
+                    ours = _merge(
+                        self._base, self._config.model_dump(mode="json"), theirs
+                    )
+                    self._config = type(self._config).model_validate(ours)
+            atomic_write_text(self.path, self._config.model_dump_json(indent=4))
+            self._base = self._config.model_dump(mode="json")
+        self._dirty = False
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Coalesce saves: any number of ``save()`` calls inside the block
+        produce at most one write when the outermost batch exits.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._dirty:
+                self._flush()
+
+    @contextmanager
+    def transaction(self) -> Iterator[AppConfig]:
+        """
+        Locked read-modify-write of the config.
+
+        The config is re-read from disk while holding the lock, so changes
+        made concurrently by other godoco processes are not overwritten.
+        The result is written before the lock is released. Inside
+        ``batch()`` it joins the batch instead: unsaved changes are kept
+        rather than re-read, and the write happens when the outermost
+        batch exits.
+
+        Yields
+        ------
+        AppConfig
+            Fresh config to mutate.
+        """
+        with self._lock:
+            if not self._dirty:
+                self._reload()
+            yield self._config
+            self._dirty = True
+            if not self._batch_depth:
+                self._flush()
 
     def get_current_project(self) -> Optional[Path]:
         """Get path of current project."""
         cfg = self.load()
-        if cfg.current_project and cfg.current_project in cfg.projects:
-            return Path(cfg.projects[cfg.current_project])
+        if cfg.current_project and (
+            proj := self.registry.get(cfg.current_project)
+        ):
+            return proj.path
         return None
 
     def track_project(self, name: str, path: Path) -> None:
@@ -96,12 +264,32 @@ class ConfigManager:
         path : Path
             Project path.
         """
-        cfg = self.load()
-        cfg.projects[name] = str(path)
-        cfg.current_project = name
-        self.save()
+        self.registry.add(name, path)
+        with self.transaction() as cfg:
+            cfg.current_project = name
 
     def get_godot_path(self) -> Optional[Path]:
         """Get configured Godot executable path."""
         cfg = self.load()
         return cfg.godot.executable_path
+
+
+def _merge(base: Any, ours: Any, theirs: Any) -> Any:
+    """
+    Three-way merge of JSON data: ``theirs`` plus every key whose value
+    differs between ``base`` and ``ours``.
+    """
+    if not all(isinstance(d, dict) for d in (base, ours, theirs)):
+        return ours
+    merged = dict(theirs)
+    for key in base.keys() | ours.keys():
+        if key not in ours:
+            if key in theirs and theirs[key] == base[key]:
+                del merged[key]
+        elif ours[key] != base.get(key):
+            merged[key] = (
+                _merge(base[key], ours[key], theirs[key])
+                if key in base and key in theirs
+                else ours[key]
+            )
+    return merged
@@ -13,6 +13,7 @@ class ProjectConfig(BaseModel):
     name: str
     path: Path
     last_accessed: datetime = Field(default_factory=datetime.now)
+    tags: list[str] = Field(default_factory=list)
 
 
 class GodotConfig(BaseModel):
@@ -21,16 +22,20 @@ class GodotConfig(BaseModel):
     executable_path: Optional[Path] = None
     version: Optional[str] = "4.3"  # Default fallback
     auto_detect: bool = True
+    # Install label ("4.3.stable") -> executable; projects pick one through
+    # the version in their config/features
+    installs: Dict[str, Path] = Field(default_factory=dict)
 
 
 class AppConfig(BaseModel):
     """Global application configuration."""
 
     current_project: Optional[str] = None
-    projects: Dict[str, str] = Field(
-        default_factory=dict
-    )  # Name -> Path string
+    # Legacy Name -> Path map; migrated into the project registry on load
+    projects: Dict[str, str] = Field(default_factory=dict)
     godot: GodotConfig = Field(default_factory=GodotConfig)
+    # Seconds before project paths are checked again (see `projects --prune`)
+    validation_ttl: int = 3600
 
     @validator("projects")
     def validate_projects(cls, v):
@@ -0,0 +1,216 @@
+"""Indexed project registry backed by SQLite."""
+
+from __future__ import annotations
+from datetime import datetime
+from pathlib import Path
+import os
+import sqlite3
+import time
+from typing import Iterable, Optional
+
+from .models import ProjectConfig
+from ..utils.paths import get_data_dir
+
+REGISTRY_FILE = "projects.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    name TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    last_accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_projects_path ON projects(path);
+CREATE INDEX IF NOT EXISTS idx_projects_accessed
+    ON projects(last_accessed);
+CREATE TABLE IF NOT EXISTS project_tags (
+    name TEXT NOT NULL
+        REFERENCES projects(name) ON DELETE CASCADE ON UPDATE CASCADE,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (name, tag)
+);
+CREATE INDEX IF NOT EXISTS idx_project_tags_tag ON project_tags(tag);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Projects with their tags in one query; tags joined by TAG_SEPARATOR
+TAG_SEPARATOR = "\x1f"
+PROJECT_QUERY = (
+    "SELECT p.name, p.path, p.last_accessed,"
+    " group_concat(t.tag, char(31)) AS tags"
+    " FROM projects p LEFT JOIN project_tags t ON t.name = p.name"
+    " WHERE {where} GROUP BY p.name ORDER BY {order}"
+)
+
+
+class ProjectRegistry:
+    """
+    Tracked projects stored in ``projects.db`` in the user data dir.
+
+    Lookups by name, path, tag and last access time hit an index, so
+    commands only read the rows they need instead of the whole registry.
+    Concurrent godoco processes are serialized by SQLite itself.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or get_data_dir() / REGISTRY_FILE
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open (and create) the database on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _projects(
+        self,
+        where: str,
+        params: tuple,
+        order: str = "p.name",
+        limit: Optional[int] = None,
+    ) -> list[ProjectConfig]:
+        query = PROJECT_QUERY.format(where=where, order=order)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+        rows = self.conn.execute(query, params)
+        return [
+            ProjectConfig(
+                name=row["name"],
+                path=Path(row["path"]),
+                last_accessed=datetime.fromtimestamp(row["last_accessed"]),
+                tags=sorted(row["tags"].split(TAG_SEPARATOR))
+                if row["tags"]
+                else [],
+            )
+            for row in rows
+        ]
+
+    def get(self, name: str) -> Optional[ProjectConfig]:
+        """Get a project by name."""
+        found = self._projects("p.name = ?", (name,))
+        return found[0] if found else None
+
+    def find_by_path(self, path: Path) -> Optional[ProjectConfig]:
+        """Get the project registered at a path."""
+        found = self._projects("p.path = ?", (os.path.abspath(path),))
+        return found[0] if found else None
+
+    def by_tag(self, tag: str) -> list[ProjectConfig]:
+        """Projects carrying a tag, by name."""
+        return self._projects(
+            "p.name IN (SELECT name FROM project_tags WHERE tag = ?)", (tag,)
+        )
+
+    def recent(self, limit: int = 10) -> list[ProjectConfig]:
+        """Most recently accessed projects first."""
+        return self._projects(
+            "1", (), order="p.last_accessed DESC", limit=limit
+        )
+
+    def paths(self) -> dict[str, str]:
+        """Name -> path for every project, by name."""
+        rows = self.conn.execute(
+            "SELECT name, path FROM projects ORDER BY name"
+        )
+        return {r["name"]: r["path"] for r in rows}
+
+    def count(self) -> int:
+        """Number of registered projects."""
+        return self.conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+
+    def add(self, name: str, path: Path, tags: Iterable[str] = ()) -> None:
+        """Register (or re-point) a project and mark it accessed."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO projects (name, path, last_accessed)"
+                " VALUES (?, ?, ?) ON CONFLICT(name) DO UPDATE SET"
+                " path = excluded.path,"
+                " last_accessed = excluded.last_accessed",
+                (name, os.path.abspath(path), time.time()),
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO project_tags (name, tag) VALUES (?, ?)",
+                ((name, t) for t in tags),
+            )
+
+    def remove(self, names: Iterable[str]) -> int:
+        """Unregister projects. Returns how many were removed."""
+        with self.conn:
+            cur = self.conn.executemany(
+                "DELETE FROM projects WHERE name = ?", ((n,) for n in names)
+            )
+        return cur.rowcount
+
+    def touch(self, name: str) -> None:
+        """Update a project's last access time."""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE projects SET last_accessed = ? WHERE name = ?",
+                (time.time(), name),
+            )
+
+    def set_tags(
+        self, name: str, add: Iterable[str] = (), remove: Iterable[str] = ()
+    ) -> None:
+        """Add and remove tags on a project."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO project_tags (name, tag) VALUES (?, ?)",
+                ((name, t) for t in add),
+            )
+            self.conn.executemany(
+                "DELETE FROM project_tags WHERE name = ? AND tag = ?",
+                ((name, t) for t in remove),
+            )
+
+    def import_projects(self, projects: dict[str, str]) -> int:
+        """
+        Import a legacy ``name -> path`` map, keeping existing entries.
+
+        Returns
+        -------
+        int
+            Number of projects added.
+        """
+        now = time.time()
+        with self.conn:
+            cur = self.conn.executemany(
+                "INSERT OR IGNORE INTO projects (name, path, last_accessed)"
+                " VALUES (?, ?, ?)",
+                (
+                    (name, os.path.abspath(path), now)
+                    for name, path in projects.items()
+                ),
+            )
+        return cur.rowcount
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Read a registry metadata value."""
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row["value"] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Write a registry metadata value."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (key, value),
+            )
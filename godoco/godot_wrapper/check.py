@@ -0,0 +1,181 @@
+"""Validation of the res:// and uid:// references of a project."""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+import os
+import posixpath
+from typing import Optional
+
+from .graph import DependencyGraph, IndexStats, build_graph
+from ..utils.paths import make_godot_path_relative
+
+ERROR = "error"
+WARNING = "warning"
+
+
+@dataclass
+class Issue:
+    """A problem with one reference (or with a whole file if ``line`` is 0)."""
+
+    file: str
+    line: int
+    severity: str
+    message: str
+
+    @property
+    def location(self) -> str:
+        return f"{self.file}:{self.line}" if self.line else self.file
+
+
+class _Paths:
+    """``res://`` names of project files, and guesses for missing ones."""
+
+    def __init__(self, graph: DependencyGraph):
+        self.graph = graph
+        self._res: dict[str, str] = {}
+        # Built on the first missing file
+        self._lower: Optional[dict[str, list[str]]] = None
+        self._names: Optional[dict[str, list[str]]] = None
+
+    def res(self, rel: str) -> str:
+        if (path := self._res.get(rel)) is None:
+            root = self.graph.root
+            path = self._res[rel] = make_godot_path_relative(root, root / rel)
+        return path
+
+    def hint(self, target: str) -> str:
+        if self._lower is None:
+            self._lower, self._names = {}, {}
+            for rel in self.graph.files:
+                self._lower.setdefault(rel.lower(), []).append(rel)
+                name = posixpath.basename(rel).lower()
+                self._names.setdefault(name, []).append(rel)
+
+        same_case = self._lower.get(target.lower(), [])
+        if len(same_case) == 1:
+            return f" (case differs from {self.res(same_case[0])})"
+        moved = self._names.get(posixpath.basename(target).lower(), [])
+        if len(moved) == 1:
+            return f" (moved to {self.res(moved[0])}?)"
+        return ""
+
+
+def check_graph(graph: DependencyGraph) -> list[Issue]:
+    """
+    Validate every reference of a dependency graph.
+
+    Errors are references Godot cannot load: missing paths, unknown
+    UIDs without a usable path, and files that fail to parse. Warnings
+    are references that still load but are stale: a path that no longer
+    matches its UID, an unknown UID with a valid path, or a UID claimed
+    by several files.
+
+    Returns
+    -------
+    list[Issue]
+        Issues sorted by file and line.
+    """
+    paths = _Paths(graph)
+    res, hint = paths.res, paths.hint
+    issues: list[Issue] = []
+
+    owners: dict[str, list[str]] = {}
+    for rel, deps in graph.deps.items():
+        if deps.uid:
+            owner = (
+                posixpath.splitext(rel)[0] if rel not in graph.files else rel
+            )
+            owners.setdefault(deps.uid, []).append(owner)
+        if rel not in graph.files:
+            continue
+        if deps.error:
+            issues.append(Issue(res(rel), 0, ERROR, deps.error))
+
+        for ref in deps.refs:
+            target = graph.target_of(rel, ref.path) if ref.path else None
+            if target == "":
+                continue
+            found = target is not None and (
+                target in graph.files
+                or os.path.isdir(os.path.join(graph.root, target))
+            )
+            by_uid = graph.uids.get(ref.uid) if ref.uid else None
+
+            if by_uid:
+                if ref.path and by_uid != target:
+                    issues.append(
+                        Issue(
+                            res(rel),
+                            ref.line,
+                            WARNING,
+                            f"stale path {ref.path}: {ref.uid} is "
+                            f"{res(by_uid)}",
+                        )
+                    )
+            elif not ref.path:
+                issues.append(
+                    Issue(res(rel), ref.line, ERROR, f"unknown UID {ref.uid}")
+                )
+            elif not found:
+                issues.append(
+                    Issue(
+                        res(rel),
+                        ref.line,
+                        ERROR,
+                        f"missing {ref.path}{hint(target)}",
+                    )
+                )
+            elif ref.uid:
+                issues.append(
+                    Issue(
+                        res(rel),
+                        ref.line,
+                        WARNING,
+                        f"unknown UID {ref.uid}, Godot falls back to "
+                        f"{ref.path}",
+                    )
+                )
+
+    for uid, files in owners.items():
+        if len(files) > 1:
+            for rel in files:
+                others = ", ".join(res(f) for f in files if f != rel)
+                issues.append(
+                    Issue(
+                        res(rel),
+                        0,
+                        WARNING,
+                        f"UID {uid} is also used by {others}",
+                    )
+                )
+
+    issues.sort(key=lambda i: (i.file, i.line, i.message))
+    return issues
+
+
+def check_project(
+    proj: Path, refresh: bool = False, workers: Optional[int] = None
+) -> tuple[list[Issue], DependencyGraph, IndexStats]:
+    """
+    Check a project's references without launching Godot.
+
+    Files are parsed through ``build_graph``, so only files changed
+    since the last check or ``godoco graph`` are read again.
+
+    Parameters
+    ----------
+    proj : Path
+        Project root.
+    refresh : bool
+        Ignore the index and parse every file.
+    workers : Optional[int]
+        Parser processes (default: CPU count).
+
+    Returns
+    -------
+    tuple[list[Issue], DependencyGraph, IndexStats]
+        Issues, the graph they were found in, and indexing counts.
+    """
+    graph, stats = build_graph(proj, refresh=refresh, workers=workers)
+    return check_graph(graph), graph, stats
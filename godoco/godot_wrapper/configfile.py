@@ -0,0 +1,303 @@
+"""Godot ConfigFile format (project.godot, export_presets.cfg)."""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Optional, Union
+
+from .variant import (
+    RawVariant,
+    VariantSyntaxError,
+    encode_variant,
+    parse_variant,
+    parse_variant_at,
+    skip_variant,
+)
+
+
+@dataclass
+class ConfigHeader:
+    """A ``[section]`` line."""
+
+    name: str
+    text: str
+
+
+@dataclass
+class ConfigEntry:
+    """
+    A ``key=value`` entry, kept as the exact source text.
+
+    ``prefix`` holds everything before the value (indentation, key, ``=``
+    and spacing) and ``suffix`` everything after it up to and including
+    the newline, so unchanged entries serialize byte for byte.
+    """
+
+    section: str
+    key: str
+    prefix: str
+    text: str
+    suffix: str
+    value: Any = None
+
+
+@dataclass
+class ConfigSection:
+    """Entries of one section, indexed by key."""
+
+    name: str
+    header: Optional[ConfigHeader] = None
+    entries: dict[str, ConfigEntry] = field(default_factory=dict)
+
+
+Segment = Union[str, ConfigHeader, ConfigEntry]
+
+
+def _segment_text(segment: Segment) -> str:
+    if isinstance(segment, str):
+        return segment
+    if isinstance(segment, ConfigEntry):
+        return segment.prefix + segment.text + segment.suffix
+    return segment.text
+
+
+def _parse_key(text: str, start: int, eq: int) -> str:
+    key = text[start:eq].strip()
+    if key.startswith('"'):
+        try:
+            return parse_variant(key)
+        except VariantSyntaxError:
+            pass
+    return key
+
+
+class ConfigDocument:
+    """
+    In-memory model of a ConfigFile.
+
+    The source is parsed once into an ordered list of segments (comments
+    and blank lines, section headers, entries) plus a section -> key index
+    for O(1) lookups. Edits replace single entries, so comments and
+    formatting elsewhere are preserved. Keys before the first section
+    live in the ``""`` section.
+    """
+
+    def __init__(self):
+        self.segments: list[Segment] = []
+        self.sections: dict[str, ConfigSection] = {"": ConfigSection("")}
+
+    @classmethod
+    def parse(cls, text: str) -> ConfigDocument:
+        """
+        Parse ConfigFile text in a single pass.
+
+        Parameters
+        ----------
+        text : str
+            File content.
+
+        Returns
+        -------
+        ConfigDocument
+            Parsed document.
+        """
+        doc = cls()
+        segments = doc.segments
+        section = doc.sections[""]
+        n = len(text)
+        pos = 0
+
+        while pos < n:
+            nl = text.find("\n", pos)
+            line_end = n if nl == -1 else nl + 1
+
+            i = pos
+            while i < line_end and text[i] in " \t":
+                i += 1
+            ch = text[i] if i < line_end else "\n"
+
+            # Blank lines and comments
+            if ch in "\r\n;#":
+                segments.append(text[pos:line_end])
+                pos = line_end
+                continue
+
+            if ch == "[":
+                end = skip_variant(text, i)
+                line_end = n if end >= n else end + 1
+                raw = text[pos:line_end]
+                name = raw.strip()[1:-1].strip()
+                header = ConfigHeader(name, raw)
+                segments.append(header)
+                section = doc.sections.get(name)
+                if section is None:
+                    section = doc.sections[name] = ConfigSection(name, header)
+                pos = line_end
+                continue
+
+            eq = text.find("=", i, line_end)
+            if eq == -1:
+                # Not something we understand; keep it verbatim
+                segments.append(text[pos:line_end])
+                pos = line_end
+                continue
+
+            key = _parse_key(text, i, eq)
+            vstart = eq + 1
+            while vstart < line_end and text[vstart] in " \t":
+                vstart += 1
+
+            value, vend = RawVariant(""), vstart
+            if vstart < line_end and text[vstart] not in "\r\n":
+                try:
+                    value, vend = parse_variant_at(text, vstart)
+                    rest_end = text.find("\n", vend)
+                    rest_end = n if rest_end == -1 else rest_end
+                    rest = text[vend:rest_end].strip()
+                    if rest and rest[0] not in ";#":
+                        raise VariantSyntaxError("Trailing data")
+                except VariantSyntaxError:
+                    vend = skip_variant(text, vstart)
+                    while vend > vstart and text[vend - 1] in " \t\r":
+                        vend -= 1
+                    value = RawVariant(text[vstart:vend])
+
+            nl = text.find("\n", vend)
+            line_end = n if nl == -1 else nl + 1
+            entry = ConfigEntry(
+                section=section.name,
+                key=key,
+                prefix=text[pos:vstart],
+                text=text[vstart:vend],
+                suffix=text[vend:line_end],
+                value=value,
+            )
+            segments.append(entry)
+            section.entries[key] = entry
+            pos = line_end
+
+        return doc
+
+    def to_text(self) -> str:
+        """Serialize back to ConfigFile text."""
+        return "".join(_segment_text(s) for s in self.segments)
+
+    def has(self, section: str, key: str) -> bool:
+        """Check whether a key exists."""
+        sec = self.sections.get(section)
+        return sec is not None and key in sec.entries
+
+    def get_raw(self, section: str, key: str) -> Optional[str]:
+        """Get the literal text of a value, e.g. ``"MyGame"`` with quotes."""
+        sec = self.sections.get(section)
+        if sec and (entry := sec.entries.get(key)):
+            return entry.text
+        return None
+
+    def get(self, section: str, key: str, default: Any = None) -> Any:
+        """Get a parsed value."""
+        sec = self.sections.get(section)
+        if sec and (entry := sec.entries.get(key)):
+            return entry.value
+        return default
+
+    def keys(self, section: str) -> list[str]:
+        """Keys of a section in file order."""
+        sec = self.sections.get(section)
+        return list(sec.entries) if sec else []
+
+    def section_names(self) -> list[str]:
+        """Named sections in file order."""
+        return [name for name in self.sections if name]
+
+    def set(self, section: str, key: str, value: Any) -> bool:
+        """
+        Set a value, encoding it as Variant text.
+
+        Parameters
+        ----------
+        section : str
+            Section name ("" for keys before the first section).
+        key : str
+            Key within the section.
+        value : Any
+            Python value (see ``encode_variant``).
+
+        Returns
+        -------
+        bool
+            True if the document changed.
+        """
+        return self.set_raw(section, key, encode_variant(value), value)
+
+    def set_raw(
+        self, section: str, key: str, text: str, value: Any = None
+    ) -> bool:
+        """
+        Set a value from literal text.
+
+        Existing entries are edited in place; new keys are appended after
+        the last entry of their section, creating the section if needed.
+
+        Returns
+        -------
+        bool
+            True if the document changed.
+        """
+        if value is None and text != "null":
+            try:
+                value = parse_variant(text)
+            except VariantSyntaxError:
+                value = RawVariant(text)
+
+        sec = self.sections.get(section)
+        if sec and (entry := sec.entries.get(key)):
+            if entry.text == text:
+                return False
+            entry.text = text
+            entry.value = value
+            return True
+
+        if sec is None:
+            sec = self._add_section(section)
+
+        entry = ConfigEntry(section, key, f"{key}=", text, "\n", value)
+        self.segments.insert(self._insert_index(sec), entry)
+        sec.entries[key] = entry
+        return True
+
+    def remove(self, section: str, key: str) -> bool:
+        """Remove a key. Returns True if it existed."""
+        sec = self.sections.get(section)
+        if not sec or key not in sec.entries:
+            return False
+        entry = sec.entries.pop(key)
+        self.segments.remove(entry)
+        return True
+
+    def _add_section(self, name: str) -> ConfigSection:
+        # Separate from previous content with a blank line like Godot does
+        text = self.to_text()
+        if text and not text.endswith("\n"):
+            self.segments.append("\n")
+            text += "\n"
+        if text and not text.endswith("\n\n"):
+            self.segments.append("\n")
+        header = ConfigHeader(name, f"[{name}]\n\n")
+        self.segments.append(header)
+        sec = self.sections[name] = ConfigSection(name, header)
+        return sec
+
+    def _insert_index(self, sec: ConfigSection) -> int:
+        if sec.entries:
+            last = next(reversed(sec.entries.values()))
+            idx = self.segments.index(last) + 1
+            if not last.suffix.endswith("\n"):
+                last.suffix += "\n"
+            return idx
+        if sec.header is not None:
+            return self.segments.index(sec.header) + 1
+        # Global section: before the first header
+        for i, s in enumerate(self.segments):
+            if isinstance(s, ConfigHeader):
+                return i
+        return len(self.segments)
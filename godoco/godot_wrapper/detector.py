@@ -1,24 +1,260 @@
 """Godot executable detection."""
 
 from __future__ import annotations
-import shutil
-import platform
-import subprocess
-import re
+import stat
+import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 import os
 
+from ..utils.fs import file_signature, read_json_file, write_json_file
+from ..utils.paths import CONFIG_PATH, get_cache_dir
+from ..utils.trace import traced
 
-def find_godot_executable() -> Optional[Path]:
+if TYPE_CHECKING:
+    from .version import GodotVersion
+
+
+DISCOVERY_INDEX_FILE = "godot-executables.json"
+# Standard install locations rarely nest Godot deeper than this
+SCAN_MAX_DEPTH = 3
+# Subtrees that never contain a Godot install but can be huge
+PRUNE_DIRS = frozenset({
+    "node_modules",
+    "__pycache__",
+    "site-packages",
+    "venv",
+    "AppData",
+    "Library",
+    "$RECYCLE.BIN",
+    "System Volume Information",
+})
+
+# Per-process memo: discovery runs once per invocation at most
+_found: dict[Optional[str], Optional[Path]] = {}
+
+
+def _is_executable(path: Path) -> bool:
+    """Stat-based check that path is an executable regular file."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return stat.S_ISREG(st.st_mode) and os.access(path, os.X_OK)
+
+
+def _configured_paths(configured: Optional[Path]) -> list[Path]:
+    """Explicitly configured executables, in priority order."""
+    paths = []
+    if configured:
+        paths.append(Path(configured))
+
+    if env := os.environ.get("GODOT_BIN"):
+        paths.append(Path(env))
+
+    # Read the saved setup path without importing the config models;
+    # discovery sits on the passthrough fast path.
+    data = read_json_file(CONFIG_PATH)
+    if isinstance(data, dict):
+        godot = data.get("godot")
+        if isinstance(godot, dict) and godot.get("executable_path"):
+            paths.append(Path(godot["executable_path"]))
+    return paths
+
+
+def registered_installs() -> dict[str, Path]:
+    """
+    Godot installs registered with ``godoco versions``, by label.
+
+    Read without the config models, like ``_configured_paths``.
+    """
+    data = read_json_file(CONFIG_PATH)
+    godot = data.get("godot") if isinstance(data, dict) else None
+    installs = godot.get("installs") if isinstance(godot, dict) else None
+    if not isinstance(installs, dict):
+        return {}
+    return {k: Path(v) for k, v in installs.items() if isinstance(v, str)}
+
+
+def _search_roots(system: str) -> list[Path]:
+    """Directories worth scanning when nothing else found Godot."""
+    if system == "Windows":
+        return [Path.home() / "Desktop/Godot", Path.home() / "Downloads"]
+    if system == "Darwin":
+        return [
+            Path("/Applications"),
+            Path.home() / "Applications",
+            Path("/usr/local/bin"),
+        ]
+    return [Path("/usr/local/bin"), Path.home() / ".local/bin"]
+
+
+def _is_candidate(name: str, system: str) -> bool:
+    """Name filter for files that look like a Godot executable."""
+    lower = name.lower()
+    if "godot" not in lower:
+        return False
+    if system == "Windows":
+        return lower.endswith(".exe")
+    # Skip archives and sidecar files next to the binary
+    return not lower.endswith((".zip", ".tpz", ".pck", ".txt", ".desktop"))
+
+
+def _should_descend(name: str) -> bool:
+    """Prune hidden, tool-managed and unrelated app bundle subtrees."""
+    if name.startswith(".") or name in PRUNE_DIRS:
+        return False
+    # Only look inside macOS app bundles that are Godot's
+    if name.endswith(".app"):
+        return "godot" in name.lower()
+    return True
+
+
+def scan_for_godot(
+    root: Path, system: str, max_depth: int = SCAN_MAX_DEPTH
+) -> Optional[Path]:
+    """
+    Breadth-first, depth-bounded search for a Godot executable.
+
+    Parameters
+    ----------
+    root : Path
+        Directory to search.
+    system : str
+        ``platform.system()`` value used for name filtering.
+    max_depth : int
+        Maximum directory depth below root to descend into.
+
+    Returns
+    -------
+    Optional[Path]
+        Shallowest matching executable. Console wrappers on Windows are
+        only returned when no GUI build is found.
+    """
+    fallback = None
+    level = [root]
+    for _ in range(max_depth + 1):
+        next_level = []
+        for d in level:
+            try:
+                with os.scandir(d) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if _should_descend(entry.name):
+                            next_level.append(Path(entry.path))
+                        continue
+                except OSError:
+                    continue
+
+                if not _is_candidate(entry.name, system):
+                    continue
+                path = Path(entry.path)
+                if not _is_executable(path):
+                    continue
+                if "_console" in entry.name.lower():
+                    fallback = fallback or path
+                    continue
+                return path
+
+        if fallback:
+            return fallback
+        level = next_level
+    return None
+
+
+class ExecutableIndex:
+    """
+    Small persisted list of Godot executables found by earlier scans.
+
+    Entries are validated with a single stat before use, so a moved or
+    deleted binary simply drops out of the index.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or get_cache_dir() / DISCOVERY_INDEX_FILE
+
+    def entries(self) -> list[dict]:
+        """Raw index entries, most recently seen first."""
+        data = read_json_file(self.path)
+        if not isinstance(data, list):
+            return []
+        return [e for e in data if isinstance(e, dict) and e.get("path")]
+
+    def lookup(self) -> Optional[Path]:
+        """First indexed executable that still exists."""
+        for entry in self.entries():
+            path = Path(entry["path"])
+            if _is_executable(path):
+                return path
+        return None
+
+    def record(self, path: Path) -> None:
+        """Move path to the front of the index."""
+        path = Path(os.path.abspath(path))
+        sig = file_signature(path) or (0, 0)
+        entries = [e for e in self.entries() if e["path"] != str(path)]
+        entries.insert(
+            0,
+            {
+                "path": str(path),
+                "mtime_ns": sig[0],
+                "size": sig[1],
+                "last_seen": time.time(),
+            },
+        )
+        try:
+            write_json_file(self.path, entries[:16])
+        except OSError:
+            pass
+
+
+@traced("godot.find_executable")
+def find_godot_executable(
+    configured: Optional[Path] = None, refresh: bool = False
+) -> Optional[Path]:
     """
     Find Godot executable on the system.
 
+    Lookup order: configured paths (argument, ``GODOT_BIN``, the path
+    saved by ``godoco setup``), then PATH, then the executable index,
+    and only then a bounded scan of standard install locations. Results
+    are memoized for the lifetime of the process.
+
+    Parameters
+    ----------
+    configured : Optional[Path]
+        Preferred executable, checked before anything else.
+    refresh : bool
+        Skip the memo and index and scan again.
+
     Returns
     -------
     Optional[Path]
         Path to Godot executable if found.
     """
+    key = str(configured) if configured else None
+    if not refresh and key in _found:
+        return _found[key]
+
+    _found[key] = exe = _discover(configured, refresh)
+    return exe
+
+
+def _discover(configured: Optional[Path], refresh: bool) -> Optional[Path]:
+    for p in _configured_paths(configured):
+        if _is_executable(p):
+            return p
+
+    # Configured paths are the passthrough fast path; only a search
+    # needs these
+    import platform
+    import shutil
+
     system = platform.system()
     godot_exe = "godot.exe" if system == "Windows" else "godot"
 
@@ -26,57 +262,45 @@ def find_godot_executable() -> Optional[Path]:
     if p := shutil.which(godot_exe):
         return Path(p)
 
+    index = ExecutableIndex()
+    if not refresh and (p := index.lookup()):
+        return p
+
     # Check standard locations
-    search_paths = (
-        [Path.home() / "Desktop/Godot", Path.home() / "Downloads"]
-        if system == "Windows"
-        else [Path("/usr/local/bin")]
-    )
-
-    for d in search_paths:
-        if d.exists():
-            for f in d.rglob("*godot*"):
-                if f.is_file() and os.access(f, os.X_OK):
-                    # Basic filter to ensure it's likely the executable
-                    if system == "Windows" and not f.name.endswith(".exe"):
-                        continue
-                    return f
+    for d in _search_roots(system):
+        if p := scan_for_godot(d, system):
+            index.record(p)
+            return p
     return None
 
 
-def detect_godot_version(godot_path: Path) -> str:
+@traced("godot.detect_version")
+def detect_godot_version(
+    godot_path: Path, verify: bool = False, refresh: bool = False
+) -> GodotVersion:
     """
-    Detect Godot version by running --version.
+    Detect Godot version by running --version (cached per binary).
 
     Parameters
     ----------
     godot_path : Path
         Path to Godot executable.
+    verify : bool
+        Also key the cache on the binary's content hash.
+    refresh : bool
+        Ignore cached probe results.
 
     Returns
     -------
-    str
-        Version string (e.g. "4.3").
+    GodotVersion
+        Structured version (e.g. 4.3.stable.official.77dcf97d8).
+
+    Raises
+    ------
+    GodotVersionError
+        If the version cannot be detected. The failure is cached until
+        the binary changes.
     """
-    try:
-        # Run with timeout
-        result = subprocess.run(
-            [str(godot_path), "--version"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            check=False,
-        )
-        output = result.stdout.strip()
-        # Parse output: "Godot Engine v4.3.stable.official..."
-        # Regex to capture Major.Minor
-        if m := re.search(r"v(\d+\.\d+)", output):
-            return m.group(1)
-        # Fallback if format differs
-        if m := re.search(r"(\d+\.\d+)", output):
-            return m.group(1)
-
-    except Exception:
-        pass
-
-    return "4.3"  # Default fallback
+    from .version import probe_godot_version
+
+    return probe_godot_version(godot_path, verify=verify, refresh=refresh)
@@ -0,0 +1,530 @@
+"""Parallel export of several presets."""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from pathlib import Path
+import asyncio
+import hashlib
+import json
+import os
+import re
+from typing import Any, Callable, Iterable, Optional
+
+from .configfile import ConfigDocument
+from .process import gather_limited, run_process
+from .version import hash_file, probe_godot_version
+from .wrapper import GodotWrapper
+from ..utils.errors import ExportError, GodotVersionError
+from ..utils.fs import file_signature, read_json_file, write_json_file
+
+EXPORT_PRESETS_FILE = "export_presets.cfg"
+PRESET_SECTION = re.compile(r"^preset\.(\d+)$")
+# Rough peak resident size of one headless export
+EXPORT_MEMORY_BYTES = 1536 * 1024 * 1024
+
+MANIFEST_SUFFIX = ".godoco-manifest.json"
+# Bump when the fingerprint inputs change so old manifests never match
+MANIFEST_SCHEMA = 2
+# Never part of the exported content
+SOURCE_SKIP_DIRS = frozenset({"build"})
+
+PLATFORM_EXTENSIONS = {
+    "Windows Desktop": ".exe",
+    "Linux": ".x86_64",
+    "Linux/X11": ".x86_64",
+    "macOS": ".zip",
+    "Web": ".html",
+    "Android": ".apk",
+    "iOS": ".ipa",
+}
+
+
+@dataclass
+class ExportPreset:
+    """A ``[preset.N]`` section of export_presets.cfg."""
+
+    index: int
+    name: str
+    platform: str = ""
+    export_path: str = ""
+    # The ``[preset.N.options]`` section
+    options: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ExportJob:
+    """One preset to export."""
+
+    preset: str
+    output: Path
+    log: Path
+    debug: bool = False
+    # Digest of the export templates used (see ``preflight_export``)
+    templates: str = ""
+    # Set for incremental exports; recorded in the manifest on success
+    fingerprint: Optional[str] = None
+    sources: Optional[dict[str, list]] = None
+
+
+@dataclass
+class ExportResult:
+    """Outcome of an export job."""
+
+    job: ExportJob
+    returncode: int
+    seconds: float
+    skipped: bool = False
+    peak_rss: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+
+def read_export_presets(proj: Path) -> list[ExportPreset]:
+    """
+    Read the presets defined in a project's export_presets.cfg.
+
+    Parameters
+    ----------
+    proj : Path
+        Project root.
+
+    Returns
+    -------
+    list[ExportPreset]
+        Presets in index order; empty if the file does not exist.
+    """
+    try:
+        text = (proj / EXPORT_PRESETS_FILE).read_text(encoding="utf-8")
+    except OSError:
+        return []
+
+    doc = ConfigDocument.parse(text)
+    presets = []
+    for section in doc.section_names():
+        if m := PRESET_SECTION.match(section):
+            presets.append(
+                ExportPreset(
+                    index=int(m.group(1)),
+                    name=str(doc.get(section, "name", "")),
+                    platform=str(doc.get(section, "platform", "")),
+                    export_path=str(doc.get(section, "export_path", "")),
+                    options={
+                        key: doc.get(f"{section}.options", key)
+                        for key in doc.keys(f"{section}.options")
+                    },
+                )
+            )
+    return sorted(presets, key=lambda p: p.index)
+
+
+def default_output(proj: Path, preset: str, platform: str = "") -> Path:
+    """
+    Output path for a preset without an export_path.
+
+    ``build/<project>-<preset slug><ext>``, so presets of one platform
+    do not export over each other.
+    """
+    ext = PLATFORM_EXTENSIONS.get(platform)
+    if ext is None:
+        ext = (
+            ".exe"
+            if "Windows" in preset
+            else ".x86_64"
+            if "Linux" in preset
+            else ".zip"
+        )
+    return proj / "build" / f"{proj.name}-{preset_slug(preset)}{ext}"
+
+
+def preset_slug(name: str) -> str:
+    """File-name-safe form of a preset name."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("_") or "preset"
+
+
+def _available_memory() -> Optional[int]:
+    """Available physical memory in bytes, if it can be determined."""
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def default_worker_count(jobs: int) -> int:
+    """
+    Number of concurrent exports the machine can take.
+
+    Bounded by the job count, the CPU count and the available memory
+    divided by the typical footprint of one export.
+    """
+    limit = min(jobs, os.cpu_count() or 1)
+    if (mem := _available_memory()) is not None:
+        limit = min(limit, mem // EXPORT_MEMORY_BYTES)
+    return max(1, limit)
+
+
+def needs_import(proj: Path) -> bool:
+    """
+    Check whether Godot still has to import the project's assets.
+
+    Concurrent exports of a never-imported project would all run the
+    import step and race on ``.godot/``.
+    """
+    return not (proj / ".godot" / "imported").is_dir()
+
+
+def check_outputs(jobs: Iterable[ExportJob]) -> None:
+    """
+    Make sure no two jobs export to the same file.
+
+    Raises
+    ------
+    ExportError
+        If several presets resolve to one output.
+    """
+    owners: dict[str, list[str]] = {}
+    for job in jobs:
+        owners.setdefault(os.path.abspath(job.output), []).append(job.preset)
+    clashes = [
+        f"{', '.join(presets)} -> {output}"
+        for output, presets in owners.items()
+        if len(presets) > 1
+    ]
+    if clashes:
+        raise ExportError(
+            "Presets export to the same file: " + "; ".join(clashes)
+        )
+
+
+def manifest_path(output: Path) -> Path:
+    """Manifest stored next to an export output."""
+    return output.with_name(output.name + MANIFEST_SUFFIX)
+
+
+def _walk_sources(
+    root: str, rel: str, skip: frozenset[str], out: list[tuple[str, str]]
+) -> None:
+    try:
+        with os.scandir(os.path.join(root, rel) if rel else root) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        sub = f"{rel}/{entry.name}" if rel else entry.name
+        if sub in skip:
+            continue
+        try:
+            if entry.is_dir():
+                if not os.path.exists(os.path.join(entry.path, ".gdignore")):
+                    _walk_sources(root, sub, skip, out)
+            elif entry.is_file():
+                out.append((sub, entry.path))
+        except OSError:
+            continue
+
+
+def snapshot_sources(
+    proj: Path,
+    previous: Optional[dict[str, list]] = None,
+    skip: frozenset[str] = SOURCE_SKIP_DIRS,
+) -> dict[str, list]:
+    """
+    Hash every file Godot would export.
+
+    Hidden files and directories (``.godot``, ``.git``), sub-directories
+    containing ``.gdignore`` and ``skip`` (project-relative files and
+    directories, e.g. export outputs) are left out. A file whose mtime and size match
+    its ``previous`` entry reuses that hash, so an unchanged project costs
+    one ``stat`` per file.
+
+    Parameters
+    ----------
+    proj : Path
+        Project root.
+    previous : Optional[dict[str, list]]
+        Earlier snapshot, e.g. from a manifest.
+    skip : frozenset[str]
+        Files and directories to leave out, relative to the project root.
+
+    Returns
+    -------
+    dict[str, list]
+        ``relpath -> [mtime_ns, size, sha256]``.
+    """
+    previous = previous or {}
+    files: list[tuple[str, str]] = []
+    _walk_sources(os.fspath(proj), "", skip, files)
+
+    snapshot = {}
+    for rel, full in sorted(files):
+        try:
+            st = os.stat(full)
+        except OSError:
+            continue
+        old = previous.get(rel)
+        if old and old[0] == st.st_mtime_ns and old[1] == st.st_size:
+            digest = old[2]
+        else:
+            try:
+                digest = hash_file(Path(full))
+            except OSError:
+                continue
+        snapshot[rel] = [st.st_mtime_ns, st.st_size, digest]
+    return snapshot
+
+
+def godot_build_id(exe: Path) -> str:
+    """Identify a Godot build by version and binary signature."""
+    try:
+        version = str(probe_godot_version(exe))
+    except GodotVersionError:
+        version = "unknown"
+    mtime_ns, size = file_signature(exe) or (0, 0)
+    return f"{version}:{mtime_ns}:{size}"
+
+
+def export_fingerprint(
+    sources: dict[str, list],
+    godot: str,
+    preset: str,
+    debug: bool,
+    templates: str = "",
+) -> str:
+    """
+    Fingerprint of everything that determines an export's output.
+
+    Covers the content of every source file (``project.godot`` and
+    ``export_presets.cfg`` included), the Godot build, the export
+    templates, the preset and the debug flag. Timestamps are not part
+    of it.
+    """
+    h = hashlib.sha256()
+    h.update(
+        json.dumps([MANIFEST_SCHEMA, godot, templates, preset, debug]).encode()
+    )
+    for rel, (_, _, digest) in sorted(sources.items()):
+        h.update(f"{rel}\0{digest}\n".encode())
+    return h.hexdigest()
+
+
+def read_manifest(output: Path) -> dict:
+    """Manifest of a previous export, or an empty dict."""
+    data = read_json_file(manifest_path(output))
+    if not isinstance(data, dict) or data.get("schema") != MANIFEST_SCHEMA:
+        return {}
+    return data
+
+
+def write_manifest(job: ExportJob) -> None:
+    """Record a successful export's fingerprint next to its output."""
+    try:
+        write_json_file(
+            manifest_path(job.output),
+            {
+                "schema": MANIFEST_SCHEMA,
+                "preset": job.preset,
+                "debug": job.debug,
+                "fingerprint": job.fingerprint,
+                "sources": job.sources,
+            },
+        )
+    except OSError:
+        # The next export just won't be skipped
+        pass
+
+
+def plan_incremental(
+    proj: Path,
+    jobs: list[ExportJob],
+    godot: str,
+    other_outputs: Iterable[Path] = (),
+) -> tuple[list[ExportJob], list[ExportResult]]:
+    """
+    Split jobs into those that must run and those already up to date.
+
+    Sources are snapshotted once for all jobs, reusing hashes from the
+    existing manifests. Each job gets its fingerprint and snapshot so a
+    successful run can write its manifest.
+
+    Parameters
+    ----------
+    proj : Path
+        Project root.
+    jobs : list[ExportJob]
+        Requested exports.
+    godot : str
+        Identifies the Godot build (version and binary signature).
+    other_outputs : Iterable[Path]
+        Outputs of presets not being exported now, also left out of the
+        fingerprint.
+
+    Returns
+    -------
+    tuple[list[ExportJob], list[ExportResult]]
+        Jobs to run, and results for the skipped ones.
+    """
+    manifests = {id(job): read_manifest(job.output) for job in jobs}
+    previous: dict[str, list] = {}
+    for manifest in manifests.values():
+        if isinstance(manifest.get("sources"), dict):
+            previous.update(manifest["sources"])
+
+    # Outputs inside the project must not feed back into the fingerprint
+    skip = set(SOURCE_SKIP_DIRS)
+    root = os.path.abspath(proj)
+    for output in [job.output for job in jobs] + list(other_outputs):
+        out = os.path.abspath(output)
+        if not out.startswith(root + os.sep):
+            continue
+        out_dir = os.path.dirname(out)
+        if out_dir != root:
+            skip.add(Path(os.path.relpath(out_dir, root)).as_posix())
+            continue
+        # Exported straight into the project root: leave out the output,
+        # the pack Godot writes beside it and the manifest
+        for path in (
+            out,
+            os.path.splitext(out)[0] + ".pck",
+            os.fspath(manifest_path(Path(out))),
+        ):
+            skip.add(Path(os.path.relpath(path, root)).as_posix())
+    sources = snapshot_sources(proj, previous, frozenset(skip))
+
+    todo, skipped = [], []
+    for job in jobs:
+        job.sources = sources
+        job.fingerprint = export_fingerprint(
+            sources, godot, job.preset, job.debug, job.templates
+        )
+        manifest = manifests[id(job)]
+        if manifest.get("fingerprint") == job.fingerprint and (
+            job.output.exists()
+        ):
+            skipped.append(ExportResult(job, 0, 0.0, skipped=True))
+        else:
+            todo.append(job)
+    return todo, skipped
+
+
+async def run_export(
+    wrapper: GodotWrapper,
+    proj: Path,
+    job: ExportJob,
+    timeout: Optional[float] = None,
+) -> ExportResult:
+    """
+    Export one preset, streaming Godot's output to the job's log file.
+
+    Parameters
+    ----------
+    wrapper : GodotWrapper
+        Godot to run.
+    proj : Path
+        Project root.
+    job : ExportJob
+        Preset, output and log paths.
+    timeout : Optional[float]
+        Seconds before the export is stopped.
+
+    Returns
+    -------
+    ExportResult
+        Exit code, wall time and peak RSS.
+    """
+    job.output.parent.mkdir(parents=True, exist_ok=True)
+    job.log.parent.mkdir(parents=True, exist_ok=True)
+    cmd = wrapper.export_cmd(proj, job.preset, job.output, debug=job.debug)
+    with open(job.log, "w", encoding="utf-8") as log:
+
+        def write(line: str) -> None:
+            log.write(line + "\n")
+
+        proc = await run_process(
+            cmd, timeout=timeout, on_stdout=write, on_stderr=write
+        )
+        if proc.error:
+            log.write(f"Failed to start Godot: {proc.error}\n")
+        elif proc.timed_out:
+            log.write(f"Stopped after {timeout}s timeout\n")
+
+    code = proc.returncode if not proc.timed_out else -1
+    if code == 0 and job.fingerprint and job.output.exists():
+        write_manifest(job)
+    return ExportResult(job, code, proc.wall_seconds, peak_rss=proc.peak_rss)
+
+
+def run_exports(
+    wrapper: GodotWrapper,
+    proj: Path,
+    jobs: list[ExportJob],
+    workers: Optional[int] = None,
+    on_start: Optional[Callable[[ExportJob], None]] = None,
+    on_done: Optional[Callable[[ExportResult], None]] = None,
+    timeout: Optional[float] = None,
+) -> list[ExportResult]:
+    """
+    Export several presets with a bounded pool of headless Godot processes.
+
+    The processes are supervised from one event loop. If the project has
+    not been imported yet, the first job runs alone so the others find
+    the import cache ready. Ctrl+C stops every running export.
+
+    Parameters
+    ----------
+    wrapper : GodotWrapper
+        Godot to run.
+    proj : Path
+        Project root.
+    jobs : list[ExportJob]
+        Exports to run.
+    workers : Optional[int]
+        Maximum concurrent exports (default: ``default_worker_count``).
+    on_start : Optional[Callable[[ExportJob], None]]
+        Called when a job starts.
+    on_done : Optional[Callable[[ExportResult], None]]
+        Called when a job finishes.
+    timeout : Optional[float]
+        Per-export timeout in seconds.
+
+    Returns
+    -------
+    list[ExportResult]
+        Results in job order.
+
+    Raises
+    ------
+    ExportError
+        If two jobs share an output file.
+    """
+    check_outputs(jobs)
+
+    async def work(job: ExportJob) -> ExportResult:
+        if on_start:
+            on_start(job)
+        result = await run_export(wrapper, proj, job, timeout)
+        if on_done:
+            on_done(result)
+        return result
+
+    async def run_all() -> list[ExportResult]:
+        results: list[ExportResult] = []
+        pending = list(jobs)
+        if len(pending) > 1 and needs_import(proj):
+            results.append(await work(pending.pop(0)))
+
+        limit = workers or default_worker_count(len(pending))
+        factories = [lambda job=job: work(job) for job in pending]
+        results.extend(await gather_limited(factories, limit))
+        return results
+
+    return asyncio.run(run_all())
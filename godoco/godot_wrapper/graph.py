@@ -0,0 +1,553 @@
+"""Resource dependency graph of a project, with an incremental index."""
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+import hashlib
+import json
+import os
+import posixpath
+import re
+
+from .imports import IMPORTABLE_EXTENSIONS
+from .scenefile import HEADER_KINDS, SceneTag, iter_tags
+from .variant import VariantSyntaxError
+from ..utils.fs import atomic_write_text, read_json_file
+from ..utils.paths import get_cache_dir
+from ..utils.trace import span
+
+GRAPH_CACHE_DIR = "graphs"
+# Bump when parse results or the index layout change
+GRAPH_SCHEMA = 1
+PROJECT_FILE = "project.godot"
+# Parsed file kinds by extension
+PARSED_KINDS = {
+    ".tscn": "scene",
+    ".tres": "scene",
+    ".gd": "script",
+    ".gdshader": "shader",
+    ".gdshaderinc": "shader",
+    ".import": "sidecar",
+    ".uid": "sidecar",
+}
+SIDECAR_EXTENSIONS = (".import", ".uid")
+# Files that count as assets for ``unreferenced``
+RESOURCE_EXTENSIONS = IMPORTABLE_EXTENSIONS | {
+    ".tscn",
+    ".tres",
+    ".res",
+    ".scn",
+    ".gd",
+    ".gdshader",
+    ".gdshaderinc",
+}
+# Fewer files than this are parsed in process, as starting workers costs
+# more than it saves
+PARALLEL_MIN_FILES = 64
+
+# preload("..."), load('...'), extends "...", or text to skip over
+# (comments and other strings)
+GD_TOKEN = re.compile(
+    r"\b(?:preload|load|load_threaded_request|extends)\s*\(?\s*"
+    r"(?:\"(?P<dq>(?:[^\"\\\n]|\\.)*)\"|'(?P<sq>(?:[^'\\\n]|\\.)*)')"
+    r"|#[^\n]*"
+    r'|"""[\s\S]*?"""'
+    r"|\"(?:[^\"\\\n]|\\.)*\"|'(?:[^'\\\n]|\\.)*'"
+)
+GD_CLASS_NAME = re.compile(r"^class_name\s+([A-Za-z_]\w*)", re.MULTILINE)
+SHADER_INCLUDE = re.compile(r'^[ \t]*#include\s+"([^"]+)"', re.MULTILINE)
+# Quoted res:// and uid:// strings; autoloads carry a "*" prefix
+PROJECT_REF = re.compile(r'"\*?((?:res|uid)://[^"]*)"')
+SIDECAR_UID = re.compile(r'^uid="?(uid://[^"\s]+)', re.MULTILINE)
+
+
+class Reference(NamedTuple):
+    """A path or UID named by a file, with the line naming it."""
+
+    path: Optional[str]
+    uid: Optional[str]
+    line: int
+
+
+@dataclass
+class FileDeps:
+    """What parsing one file found."""
+
+    # The file's own UID (for sidecars: the UID of the file they describe)
+    uid: Optional[str] = None
+    # GDScript global class name; such scripts are used by name
+    class_name: Optional[str] = None
+    refs: list[Reference] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def to_json(self) -> list:
+        return [self.uid, self.class_name, self.refs, self.error]
+
+    @classmethod
+    def from_json(cls, data: list) -> FileDeps:
+        uid, class_name, refs, error = data
+        return cls(uid, class_name, list(map(Reference._make, refs)), error)
+
+
+def _string_attr(tag: SceneTag, name: str) -> Optional[str]:
+    value = tag.get(name)
+    return value if isinstance(value, str) and value else None
+
+
+def _parse_scene(text: str) -> FileDeps:
+    deps = FileDeps()
+    line, pos = 1, 0
+    try:
+        for tag in iter_tags(text):
+            if tag.kind in HEADER_KINDS:
+                deps.uid = _string_attr(tag, "uid")
+            elif tag.kind == "ext_resource":
+                start = text.find(tag.text, pos)
+                line += text.count("\n", pos, start)
+                pos = start
+                deps.refs.append(
+                    Reference(
+                        _string_attr(tag, "path"),
+                        _string_attr(tag, "uid"),
+                        line,
+                    )
+                )
+            else:
+                # Godot only accepts ext_resource tags before all others
+                break
+    except VariantSyntaxError as e:
+        deps.error = str(e)
+    return deps
+
+
+def _parse_script(text: str) -> FileDeps:
+    deps = FileDeps()
+    if m := GD_CLASS_NAME.search(text):
+        deps.class_name = m.group(1)
+    line, pos = 1, 0
+    for m in GD_TOKEN.finditer(text):
+        path = m.group("dq")
+        if path is None:
+            path = m.group("sq")
+        if path is None:
+            continue
+        line += text.count("\n", pos, m.start())
+        pos = m.start()
+        if path.startswith("uid://"):
+            deps.refs.append(Reference(None, path, line))
+        else:
+            deps.refs.append(Reference(path, None, line))
+    return deps
+
+
+def _parse_matches(pattern: re.Pattern, text: str) -> FileDeps:
+    deps = FileDeps()
+    line, pos = 1, 0
+    for m in pattern.finditer(text):
+        line += text.count("\n", pos, m.start())
+        pos = m.start()
+        ref = m.group(1)
+        if ref.startswith("uid://"):
+            deps.refs.append(Reference(None, ref, line))
+        else:
+            deps.refs.append(Reference(ref, None, line))
+    return deps
+
+
+def _parse_sidecar(text: str) -> FileDeps:
+    m = SIDECAR_UID.search(text)
+    return FileDeps(uid=m.group(1) if m else None)
+
+
+def parse_dependencies(text: str, kind: str) -> FileDeps:
+    """
+    Find the references in a file's text.
+
+    Parameters
+    ----------
+    text : str
+        File content.
+    kind : str
+        ``"scene"`` (.tscn/.tres), ``"script"``, ``"shader"``,
+        ``"sidecar"`` (.import/.uid) or ``"project"``.
+
+    Returns
+    -------
+    FileDeps
+        References in file order. Malformed scenes yield what was read
+        before the error, with ``error`` set.
+    """
+    if kind == "scene":
+        return _parse_scene(text)
+    if kind == "script":
+        return _parse_script(text)
+    if kind == "shader":
+        return _parse_matches(SHADER_INCLUDE, text)
+    if kind == "project":
+        return _parse_matches(PROJECT_REF, text)
+    if kind == "sidecar":
+        return _parse_sidecar(text)
+    raise ValueError(f"Unknown file kind: {kind}")
+
+
+def file_kind(rel: str) -> Optional[str]:
+    """Parse kind of a project file, or None if it is not parsed."""
+    if rel == PROJECT_FILE:
+        return "project"
+    return PARSED_KINDS.get(posixpath.splitext(rel)[1].lower())
+
+
+def _parse_file(
+    path: str, kind: str, known: Optional[str]
+) -> tuple[Optional[str], Optional[list]]:
+    """
+    Hash and parse one file (runs in worker processes).
+
+    Returns ``(key, parsed)``; ``parsed`` is None when the key equals
+    ``known``, whose parse result the caller already has. ``key`` is None
+    if the file cannot be read.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None, None
+    key = f"{kind}:{hashlib.sha256(data).hexdigest()}"
+    if key == known:
+        return key, None
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        return key, FileDeps(error=f"Not UTF-8: {e}").to_json()
+    return key, parse_dependencies(text, kind).to_json()
+
+
+def _walk(root: str, rel: str, out: dict[str, tuple[int, int]]) -> None:
+    try:
+        with os.scandir(os.path.join(root, rel) if rel else root) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        sub = f"{rel}/{entry.name}" if rel else entry.name
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if not os.path.exists(os.path.join(entry.path, ".gdignore")):
+                    _walk(root, sub, out)
+            elif entry.is_file():
+                st = entry.stat()
+                out[sub] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            continue
+
+
+def scan_project(proj: Path) -> dict[str, tuple[int, int]]:
+    """
+    Project files with their ``(mtime_ns, size)``.
+
+    Hidden files and directories (``.godot``, ``.git``) and directories
+    containing ``.gdignore`` are skipped, as Godot does.
+    """
+    files: dict[str, tuple[int, int]] = {}
+    _walk(os.fspath(proj), "", files)
+    return files
+
+
+@dataclass
+class IndexStats:
+    """What ``build_graph`` had to do."""
+
+    files: int = 0
+    # Files read and parsed in this run
+    parsed: int = 0
+    # Files re-read because they changed on disk, but with known content
+    rehashed: int = 0
+    workers: int = 0
+
+
+class DependencyGraph:
+    """
+    Resolved references between the files of a project.
+
+    Paths are project-relative POSIX paths; ``to_rel`` converts
+    ``res://`` paths.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        files: Iterable[str],
+        deps: dict[str, FileDeps],
+    ):
+        self.root = root
+        self.deps = deps
+        self.files = {
+            f for f in files if not f.lower().endswith(SIDECAR_EXTENSIONS)
+        }
+        # uid:// -> file
+        self.uids: dict[str, str] = {}
+        for rel, d in deps.items():
+            if d.uid:
+                owner = rel
+                if rel.lower().endswith(SIDECAR_EXTENSIONS):
+                    owner = posixpath.splitext(rel)[0]
+                self.uids[d.uid] = owner
+
+        self.edges: dict[str, list[str]] = {}
+        self.missing: dict[str, list[Reference]] = {}
+        for rel, d in deps.items():
+            if rel not in self.files:
+                continue
+            targets: list[str] = []
+            for ref in d.refs:
+                target = self.resolve(rel, ref)
+                if target is None:
+                    self.missing.setdefault(rel, []).append(ref)
+                elif target and target not in targets:
+                    targets.append(target)
+            if targets:
+                self.edges[rel] = targets
+        self._reverse: Optional[dict[str, list[str]]] = None
+
+    def resolve(self, rel: str, ref: Reference) -> Optional[str]:
+        """
+        File a reference points to, as Godot would find it.
+
+        A known UID wins over the path.
+
+        Returns
+        -------
+        Optional[str]
+            The file, ``""`` for references ``target_of`` ignores, or None
+            if it does not exist.
+        """
+        if ref.uid and (target := self.uids.get(ref.uid)):
+            return target
+        if not ref.path:
+            return None
+        target = self.target_of(rel, ref.path)
+        if not target or target in self.files:
+            return target
+        if os.path.isdir(os.path.join(self.root, target)):
+            return ""
+        return None
+
+    @staticmethod
+    def target_of(rel: str, path: str) -> str:
+        """
+        Project-relative form of a path named in file ``rel``.
+
+        Paths without a scheme are relative to the folder of ``rel``.
+        Returns ``""`` for paths outside the project (``user://``,
+        absolute paths) and for format strings built at runtime
+        (``"res://level_%d.tscn"``).
+        """
+        if "%" in path or "{" in path:
+            return ""
+        if path.startswith("res://"):
+            target = path[6:]
+        elif "://" in path or path.startswith("/"):
+            return ""
+        else:
+            target = posixpath.join(posixpath.dirname(rel), path)
+        if not target:
+            return ""
+        parts = target.split("/")
+        if "" in parts or "." in parts or ".." in parts:
+            target = posixpath.normpath(target)
+        return target
+
+    def to_rel(self, path: str) -> str:
+        """Normalize a ``res://``, absolute or relative path."""
+        if path.startswith("res://"):
+            return posixpath.normpath(path[6:])
+        if path.startswith("uid://"):
+            return self.uids.get(path, path)
+        p = Path(path)
+        if p.is_absolute():
+            try:
+                return p.resolve().relative_to(self.root.resolve()).as_posix()
+            except ValueError:
+                return p.as_posix()
+        return posixpath.normpath(p.as_posix())
+
+    @property
+    def reverse(self) -> dict[str, list[str]]:
+        """File -> files referencing it."""
+        if self._reverse is None:
+            reverse: dict[str, list[str]] = {}
+            for src, targets in self.edges.items():
+                for target in targets:
+                    reverse.setdefault(target, []).append(src)
+            self._reverse = reverse
+        return self._reverse
+
+    @staticmethod
+    def _walk(
+        edges: dict[str, list[str]], start: str, recursive: bool
+    ) -> list[str]:
+        if not recursive:
+            return sorted(edges.get(start, ()))
+        seen: set[str] = set()
+        stack = list(edges.get(start, ()))
+        while stack:
+            node = stack.pop()
+            if node not in seen and node != start:
+                seen.add(node)
+                stack.extend(edges.get(node, ()))
+        return sorted(seen)
+
+    def dependencies(self, rel: str, recursive: bool = False) -> list[str]:
+        """Files ``rel`` references (transitively if ``recursive``)."""
+        return self._walk(self.edges, rel, recursive)
+
+    def dependents(self, rel: str, recursive: bool = False) -> list[str]:
+        """Files referencing ``rel`` (transitively if ``recursive``)."""
+        return self._walk(self.reverse, rel, recursive)
+
+    def unreferenced(self) -> list[str]:
+        """
+        Assets nothing references.
+
+        Only scenes, resources, scripts, shaders and importable files are
+        considered. Scripts declaring a ``class_name`` are used by name,
+        so they never count as unreferenced.
+        """
+        reverse = self.reverse
+        found = []
+        for rel in self.files:
+            if rel in reverse or rel == PROJECT_FILE:
+                continue
+            ext = posixpath.splitext(rel)[1].lower()
+            if ext not in RESOURCE_EXTENSIONS:
+                continue
+            if (d := self.deps.get(rel)) and d.class_name:
+                continue
+            found.append(rel)
+        return sorted(found)
+
+
+def index_path(proj: Path) -> Path:
+    """Index file of a project in the user cache."""
+    key = hashlib.sha256(os.path.abspath(proj).encode()).hexdigest()[:16]
+    return get_cache_dir() / GRAPH_CACHE_DIR / f"{key}.json"
+
+
+def _parse_all(
+    proj: Path, jobs: list[tuple[str, str, Optional[str]]], workers: int
+) -> tuple[list[tuple[Optional[str], Optional[list]]], int]:
+    args = (
+        [os.path.join(proj, rel) for rel, _, _ in jobs],
+        [kind for _, kind, _ in jobs],
+        [known for _, _, known in jobs],
+    )
+    if workers > 1 and len(jobs) >= PARALLEL_MIN_FILES:
+        chunk = max(1, len(jobs) // (workers * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_parse_file, *args, chunksize=chunk))
+            return results, workers
+        except (OSError, NotImplementedError):
+            # No multiprocessing support (e.g. restricted sandboxes)
+            pass
+    return list(map(_parse_file, *args)), 1
+
+
+def build_graph(
+    proj: Path,
+    refresh: bool = False,
+    workers: Optional[int] = None,
+    index: Optional[Path] = None,
+) -> tuple[DependencyGraph, IndexStats]:
+    """
+    Build a project's dependency graph, reusing the on-disk index.
+
+    Files whose mtime and size match the index are not read. Changed
+    files are parsed on a process pool; a file whose content hash is
+    still the indexed one is not parsed again. Parse results are stored
+    by content hash, so identical files share an entry.
+
+    Parameters
+    ----------
+    proj : Path
+        Project root.
+    refresh : bool
+        Ignore the index and parse every file.
+    workers : Optional[int]
+        Parser processes (default: CPU count).
+    index : Optional[Path]
+        Index file (default: ``index_path(proj)``).
+
+    Returns
+    -------
+    tuple[DependencyGraph, IndexStats]
+        Graph and indexing counts.
+    """
+    index = index or index_path(proj)
+    stats = IndexStats()
+
+    with span("graph.scan"):
+        files = scan_project(proj)
+    stats.files = len(files)
+
+    data = None if refresh else read_json_file(index)
+    if not (isinstance(data, dict) and data.get("schema") == GRAPH_SCHEMA):
+        data = {}
+    old_files: dict[str, list] = data.get("files", {})
+    parsed: dict[str, list] = data.get("parsed", {})
+
+    entries: dict[str, list] = {}
+    jobs: list[tuple[str, str, Optional[str]]] = []
+    for rel, sig in files.items():
+        if (kind := file_kind(rel)) is None:
+            entries[rel] = [*sig, None]
+            continue
+        old = old_files.get(rel)
+        known = old[2] if old and old[2] in parsed else None
+        if known and old[0] == sig[0] and old[1] == sig[1]:
+            entries[rel] = old
+        else:
+            jobs.append((rel, kind, known))
+
+    if jobs:
+        with span("graph.parse", files=len(jobs)):
+            results, stats.workers = _parse_all(
+                proj, jobs, workers or os.cpu_count() or 1
+            )
+        for (rel, _, _), (key, result) in zip(jobs, results):
+            if key is None:
+                continue
+            if result is None:
+                stats.rehashed += 1
+            else:
+                parsed[key] = result
+                stats.parsed += 1
+            entries[rel] = [*files[rel], key]
+
+    used = {e[2] for e in entries.values() if e[2]}
+    if entries != old_files or used != parsed.keys():
+        data = {
+            "schema": GRAPH_SCHEMA,
+            "root": os.path.abspath(proj),
+            "files": entries,
+            "parsed": {k: v for k, v in parsed.items() if k in used},
+        }
+        try:
+            # Compact: indenting would triple the size of large indexes
+            atomic_write_text(index, json.dumps(data, separators=(",", ":")))
+        except OSError:
+            # The index is an optimization only
+            pass
+
+    with span("graph.resolve"):
+        deps = {
+            rel: FileDeps.from_json(parsed[e[2]])
+            for rel, e in entries.items()
+            if e[2]
+        }
+        graph = DependencyGraph(proj, files, deps)
+    return graph, stats
@@ -0,0 +1,246 @@
+"""Godot --help option discovery with a persistent cache."""
+
+from __future__ import annotations
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+import os
+import re
+import subprocess
+import time
+from typing import Optional
+
+from ..utils.fs import file_signature, read_json_file, write_json_file
+from ..utils.paths import get_cache_dir
+
+HELP_CACHE_FILE = "godot-help.json"
+# Bump when the parser output changes so stale entries are re-probed
+HELP_CACHE_SCHEMA = 1
+
+ANSI_ESCAPE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+OPTION_SPLIT = re.compile(r"(\s{2,}|\t)")
+OPTION_FALLBACK = re.compile(r"^(--?[\w-]+(?: [^ ]+)?)\s+(.*)$")
+VERSION_BANNER = re.compile(r"Godot Engine v(\S+)")
+
+
+@dataclass
+class GodotHelp:
+    """Parsed Godot help output for one executable."""
+
+    path: str
+    mtime_ns: int
+    size: int
+    version: Optional[str]
+    options: list[tuple[str, str]] = field(default_factory=list)
+    probe_seconds: float = 0.0
+    created: float = 0.0
+    cached: bool = False
+
+
+def parse_godot_help(output: str) -> list[tuple[str, str]]:
+    """
+    Extract (option, description) pairs from Godot help output.
+
+    Parameters
+    ----------
+    output : str
+        Raw stdout of ``godot --help``.
+
+    Returns
+    -------
+    list[tuple[str, str]]
+        Options in the order Godot prints them.
+    """
+    # Strip ANSI codes
+    output = ANSI_ESCAPE.sub("", output)
+
+    # Godot help format usually:
+    # "  --option <arg>    Description..."
+    # But sometimes description is close or wrapped.
+
+    options = []
+    for line in output.splitlines():
+        line = line.strip()
+        if not line.startswith("-"):
+            continue
+
+        # Skip header lines if they accidentally start with -
+        if line.startswith("---"):
+            continue
+
+        # Attempt 1: Split by 2+ spaces or tab
+        parts = OPTION_SPLIT.split(line, maxsplit=1)
+
+        opt = ""
+        desc = ""
+
+        if len(parts) >= 3:
+            opt = parts[0].strip()
+            desc = parts[2].strip()
+        else:
+            # Attempt 2: Regex for -flag [args] <space> Description
+            if match := OPTION_FALLBACK.search(line):
+                opt = match.group(1).strip()
+                desc = match.group(2).strip()
+            else:
+                # Fallback: Treat whole line as option if no split found
+                opt = line
+
+        if opt:
+            options.append((opt, desc))
+
+    return options
+
+
+class GodotHelpCache:
+    """
+    On-disk cache of parsed ``godot --help`` output.
+
+    Entries are keyed by executable path and are only reused while the
+    binary's mtime and size (and, when given, its version) still match.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or get_cache_dir() / HELP_CACHE_FILE
+
+    def _read(self) -> dict:
+        data = read_json_file(self.path)
+        if not isinstance(data, dict) or (
+            data.get("schema") != HELP_CACHE_SCHEMA
+        ):
+            return {"schema": HELP_CACHE_SCHEMA, "entries": {}}
+        return data
+
+    def get(
+        self, exe: Path, version: Optional[str] = None
+    ) -> Optional[GodotHelp]:
+        """
+        Get cached help for an executable if it is still valid.
+
+        Parameters
+        ----------
+        exe : Path
+            Godot executable.
+        version : Optional[str]
+            Expected version; a mismatch invalidates the entry.
+
+        Returns
+        -------
+        Optional[GodotHelp]
+            Cached help, or None on miss.
+        """
+        sig = file_signature(exe)
+        if sig is None:
+            return None
+
+        raw = self._read()["entries"].get(os.path.abspath(exe))
+        if not raw:
+            return None
+
+        try:
+            entry = GodotHelp(**raw)
+        except TypeError:
+            return None
+
+        if (entry.mtime_ns, entry.size) != sig:
+            return None
+        if version and entry.version and not entry.version.startswith(version):
+            return None
+
+        entry.options = [tuple(o) for o in entry.options]
+        entry.cached = True
+        return entry
+
+    def put(self, entry: GodotHelp) -> None:
+        """Store an entry, replacing any previous one for the same path."""
+        data = self._read()
+        raw = asdict(entry)
+        raw.pop("cached")
+        data["entries"][entry.path] = raw
+        try:
+            write_json_file(self.path, data)
+        except OSError:
+            # A read-only cache dir must never break help output
+            pass
+
+
+def probe_godot_help(exe: Path) -> GodotHelp:
+    """
+    Run ``godot --help`` and parse it, bypassing the cache.
+
+    Parameters
+    ----------
+    exe : Path
+        Godot executable.
+
+    Returns
+    -------
+    GodotHelp
+        Parsed help with the probe duration recorded.
+    """
+    sig = file_signature(exe) or (0, 0)
+    start = time.perf_counter()
+    try:
+        # Ensure we don't get colored output from Godot if possible,
+        # though --help usually ignores it.
+        result = subprocess.run(
+            [str(exe), "--help"],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+        output = result.stdout
+    except OSError:
+        output = ""
+    elapsed = time.perf_counter() - start
+
+    version = None
+    if m := VERSION_BANNER.search(ANSI_ESCAPE.sub("", output)):
+        version = m.group(1)
+
+    return GodotHelp(
+        path=os.path.abspath(exe),
+        mtime_ns=sig[0],
+        size=sig[1],
+        version=version,
+        options=parse_godot_help(output),
+        probe_seconds=round(elapsed, 4),
+        created=time.time(),
+    )
+
+
+def load_godot_help(
+    exe: Path,
+    refresh: bool = False,
+    version: Optional[str] = None,
+    cache: Optional[GodotHelpCache] = None,
+) -> GodotHelp:
+    """
+    Get Godot help options, spawning Godot only on a cache miss.
+
+    Parameters
+    ----------
+    exe : Path
+        Godot executable.
+    refresh : bool
+        Ignore any cached entry and re-probe.
+    version : Optional[str]
+        Known version of ``exe``; a cached entry for another version is
+        treated as stale.
+    cache : Optional[GodotHelpCache]
+        Cache to use (defaults to the user cache).
+
+    Returns
+    -------
+    GodotHelp
+        Parsed help. ``cached`` tells whether Godot was spawned.
+    """
+    cache = cache or GodotHelpCache()
+    if not refresh and (entry := cache.get(exe, version)):
+        return entry
+
+    entry = probe_godot_help(exe)
+    # Don't persist failed probes; a later run may succeed
+    if entry.options:
+        cache.put(entry)
+    return entry
@@ -0,0 +1,339 @@
+"""Asset import with a shared, content-addressed cache of import results."""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+import hashlib
+import json
+import os
+import re
+import shutil
+from typing import Callable, Optional
+
+from .export import godot_build_id
+from .process import ProcessResult
+from .version import hash_file
+from .wrapper import GodotWrapper
+from ..utils.fs import FileLock, atomic_write_text, clone_file
+from ..utils.paths import get_cache_dir
+from ..utils.trace import span
+
+IMPORT_CACHE_DIR = "imports"
+# Bump when the cache key or entry layout changes
+IMPORT_CACHE_SCHEMA = 1
+IMPORTED_DIR = ".godot/imported"
+LOCK_FILE = ".godot/godoco-import.lock"
+# Files Godot imports (textures, audio, fonts, models, translations)
+IMPORTABLE_EXTENSIONS = frozenset({
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".webp",
+    ".svg",
+    ".bmp",
+    ".tga",
+    ".hdr",
+    ".exr",
+    ".ktx",
+    ".dds",
+    ".wav",
+    ".ogg",
+    ".mp3",
+    ".ttf",
+    ".otf",
+    ".woff",
+    ".woff2",
+    ".fnt",
+    ".font",
+    ".glb",
+    ".gltf",
+    ".blend",
+    ".fbx",
+    ".obj",
+    ".dae",
+    ".csv",
+})
+# "[  42% ] reimport | Importing: res://icon.svg"
+PROGRESS_LINE = re.compile(r"^\[\s*(\d+)%\s*\]\s*(\S+)\s*\|\s*(.*?)\s*$")
+DONE_LINE = re.compile(r"^\[\s*DONE\s*\]\s*(\S+)")
+# "<file>-<md5>.<ext>" in .godot/imported
+IMPORTED_NAME = re.compile(r"^(.*-[0-9a-f]{32})\.")
+
+ProgressCallback = Callable[[str, int, str], None]
+
+
+@dataclass
+class ImportStats:
+    """Outcome of ``import_assets``."""
+
+    assets: int = 0
+    # Assets restored from the shared cache before Godot ran
+    restored: int = 0
+    # Newly imported assets added to the cache
+    stored: int = 0
+    result: Optional[ProcessResult] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.result is not None and self.result.ok
+
+
+def find_assets(proj: Path) -> list[str]:
+    """
+    Project-relative paths of the files Godot imports.
+
+    A file counts if it has a known extension or an ``.import`` sidecar.
+    Hidden directories and directories containing ``.gdignore`` are
+    skipped, as Godot does.
+    """
+    assets: list[str] = []
+    _walk_assets(os.fspath(proj), "", assets)
+    return sorted(assets)
+
+
+def _walk_assets(root: str, rel: str, out: list[str]) -> None:
+    try:
+        with os.scandir(os.path.join(root, rel) if rel else root) as it:
+            entries = list(it)
+    except OSError:
+        return
+    names = {e.name for e in entries}
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        sub = f"{rel}/{entry.name}" if rel else entry.name
+        try:
+            if entry.is_dir():
+                if not os.path.exists(os.path.join(entry.path, ".gdignore")):
+                    _walk_assets(root, sub, out)
+            elif entry.is_file() and (
+                os.path.splitext(entry.name)[1].lower() in IMPORTABLE_EXTENSIONS
+                or entry.name + ".import" in names
+            ):
+                out.append(sub)
+        except OSError:
+            continue
+
+
+def imported_prefix(rel: str) -> str:
+    """
+    Name prefix of an asset's files in ``.godot/imported``.
+
+    Godot names them ``<file>-<md5 of res:// path>``, so identical assets
+    at the same path produce identical file names in every project.
+    """
+    res = "res://" + rel
+    return f"{rel.rsplit('/', 1)[-1]}-{hashlib.md5(res.encode()).hexdigest()}"
+
+
+def imported_files(proj: Path) -> dict[str, list[str]]:
+    """Names in ``.godot/imported`` grouped by ``imported_prefix``."""
+    groups: dict[str, list[str]] = {}
+    try:
+        names = os.listdir(proj / IMPORTED_DIR)
+    except OSError:
+        return groups
+    for name in names:
+        if m := IMPORTED_NAME.match(name):
+            groups.setdefault(m.group(1), []).append(name)
+    return groups
+
+
+def _read_text(path: Path) -> Optional[str]:
+    try:
+        return path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def asset_key(proj: Path, rel: str, godot: str) -> str:
+    """
+    Cache key of one asset's import.
+
+    Covers the Godot build, the asset's path (it names the imported
+    files) and content, and its ``.import`` file as it was before
+    importing (it carries the import options).
+    """
+    sidecar = _read_text(proj / (rel + ".import"))
+    h = hashlib.sha256()
+    h.update(json.dumps([IMPORT_CACHE_SCHEMA, godot, rel, sidecar]).encode())
+    h.update(hash_file(proj / rel).encode())
+    return h.hexdigest()
+
+
+class ImportCache:
+    """
+    Import results shared by all projects, keyed by ``asset_key``.
+
+    An entry holds the files Godot wrote to ``.godot/imported`` for the
+    asset and the ``.import`` sidecar it left behind.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or get_cache_dir() / IMPORT_CACHE_DIR
+
+    def entry(self, key: str) -> Path:
+        return self.path / key[:2] / key
+
+    def restore(
+        self, proj: Path, rel: str, key: str, imported: dict[str, list[str]]
+    ) -> bool:
+        """
+        Copy a cached import into the project.
+
+        Parameters
+        ----------
+        imported : dict[str, list[str]]
+            The project's ``imported_files``.
+
+        Returns
+        -------
+        bool
+            False on a cache miss, or if the project already has import
+            output for the asset.
+        """
+        entry = self.entry(key)
+        sidecar = _read_text(entry / "import")
+        if sidecar is None:
+            return False
+
+        if imported_prefix(rel) in imported:
+            return False
+
+        dest = proj / IMPORTED_DIR
+        dest.mkdir(parents=True, exist_ok=True)
+        try:
+            for name in os.listdir(entry / "files"):
+                clone_file(entry / "files" / name, dest / name)
+            atomic_write_text(proj / (rel + ".import"), sidecar)
+        except OSError:
+            return False
+        return True
+
+    def store(
+        self, proj: Path, rel: str, key: str, imported: dict[str, list[str]]
+    ) -> bool:
+        """
+        Add a project's import of an asset to the cache.
+
+        Parameters
+        ----------
+        imported : dict[str, list[str]]
+            The project's ``imported_files``.
+
+        Returns
+        -------
+        bool
+            True if a new entry was written.
+        """
+        entry = self.entry(key)
+        if entry.is_dir():
+            return False
+        names = imported.get(imported_prefix(rel))
+        sidecar = _read_text(proj / (rel + ".import"))
+        if not names or sidecar is None:
+            return False
+
+        staging = entry.with_name(f"{key}.{os.getpid()}.tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            (staging / "files").mkdir(parents=True)
+            for name in names:
+                clone_file(proj / IMPORTED_DIR / name, staging / "files" / name)
+            (staging / "import").write_text(sidecar, encoding="utf-8")
+            os.replace(staging, entry)
+        except OSError:
+            # Lost a race with another process storing the same entry
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+        return True
+
+
+def parse_progress(line: str) -> Optional[tuple[str, int, str]]:
+    """
+    Parse one of Godot's headless progress lines.
+
+    Returns
+    -------
+    Optional[tuple[str, int, str]]
+        ``(task, percent, message)``, or None for other output.
+    """
+    if m := PROGRESS_LINE.match(line):
+        return m.group(2), int(m.group(1)), m.group(3)
+    if m := DONE_LINE.match(line):
+        return m.group(1), 100, "done"
+    return None
+
+
+def import_assets(
+    wrapper: GodotWrapper,
+    proj: Path,
+    on_progress: Optional[ProgressCallback] = None,
+    on_output: Optional[Callable[[str], None]] = None,
+    timeout: Optional[float] = None,
+    cache: Optional[ImportCache] = None,
+) -> ImportStats:
+    """
+    Import a project's assets, reusing imports from other projects.
+
+    Cached imports of identical assets are copied into ``.godot/imported``
+    first. Godot then runs ``--headless --import`` once, and only has to
+    import what was not cached. Its fresh imports are added to the cache
+    if it succeeds. Concurrent imports of one project are serialized.
+
+    Parameters
+    ----------
+    wrapper : GodotWrapper
+        Godot to import with.
+    proj : Path
+        Project root.
+    on_progress : Optional[ProgressCallback]
+        Receives ``(task, percent, message)`` for Godot's progress lines.
+    on_output : Optional[Callable[[str], None]]
+        Receives every other output line (default: discarded).
+    timeout : Optional[float]
+        Seconds before Godot is stopped.
+    cache : Optional[ImportCache]
+        Shared cache (default: the user cache directory).
+
+    Returns
+    -------
+    ImportStats
+        Counts and Godot's process result.
+    """
+    cache = cache or ImportCache()
+    stats = ImportStats()
+
+    def on_line(line: str) -> None:
+        if (progress := parse_progress(line)) is not None:
+            if on_progress:
+                on_progress(*progress)
+        elif on_output:
+            on_output(line)
+
+    with FileLock(proj / LOCK_FILE, timeout=timeout or 3600):
+        with span("import.restore"):
+            godot = godot_build_id(wrapper.godot_path)
+            keys = {
+                rel: asset_key(proj, rel, godot) for rel in find_assets(proj)
+            }
+            existing = imported_files(proj)
+            restored = {
+                rel
+                for rel, key in keys.items()
+                if cache.restore(proj, rel, key, existing)
+            }
+        stats.assets, stats.restored = len(keys), len(restored)
+
+        stats.result = wrapper.import_assets(proj, on_line, timeout=timeout)
+
+        if stats.ok:
+            with span("import.store"):
+                imported = imported_files(proj)
+                for rel, key in keys.items():
+                    # Only what Godot imported in this run
+                    if rel in restored or imported_prefix(rel) in existing:
+                        continue
+                    if cache.store(proj, rel, key, imported):
+                        stats.stored += 1
+    return stats
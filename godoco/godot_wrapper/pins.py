@@ -0,0 +1,102 @@
+"""
+Project pins and their resolution to registered installs.
+
+Standard library only: the passthrough fast path resolves pins with this
+module without loading the project.godot parser or the version store.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+import os
+import re
+from typing import Iterable, Mapping, Optional
+
+APPLICATION_SECTION = "[application]"
+# config/features=PackedStringArray("4.3", "Forward Plus")
+FEATURES_KEY = "config/features"
+FEATURE_VERSION = re.compile(r'"(\d+\.\d+)"')
+# "4.3.stable", "4.2.2.stable.mono", "4.4.dev3"
+INSTALL_LABEL = re.compile(r"^(\d+\.\d+)(?:\.(\d+))?\.([a-z]+)\d*(?:\.|$)")
+
+
+def project_pin(proj: Path) -> Optional[str]:
+    """
+    Godot version a project is made for, from ``config/features``.
+
+    Returns
+    -------
+    Optional[str]
+        Feature version such as ``"4.3"``, or None if the project does not
+        name one (Godot 3 projects have no version feature).
+    """
+    section = None
+    try:
+        with open(proj / "project.godot", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    section = line
+                    continue
+                if section != APPLICATION_SECTION:
+                    continue
+                key, sep, value = line.partition("=")
+                if sep and key.strip() == FEATURES_KEY:
+                    m = FEATURE_VERSION.search(value)
+                    return m.group(1) if m else None
+    except (OSError, UnicodeDecodeError):
+        pass
+    return None
+
+
+def label_series(label: str) -> Optional[str]:
+    """Feature version an install label belongs to (``"4.3"``), or None."""
+    m = INSTALL_LABEL.match(label)
+    return m.group(1) if m else None
+
+
+def preference(label: str) -> tuple:
+    """
+    Sort key of installs within a series; the largest is preferred.
+
+    Stable over pre-releases, then standard builds over mono (C# projects
+    pin a mono install by label), then the newest patch.
+    """
+    m = INSTALL_LABEL.match(label)
+    if m is None:
+        return (False, False, 0, label)
+    return (
+        m.group(3) == "stable",
+        "mono" not in label,
+        int(m.group(2) or 0),
+        label,
+    )
+
+
+def resolve_label(pin: str, labels: Iterable[str]) -> Optional[str]:
+    """
+    Install label a pin resolves to: the exact label, else the preferred
+    install of the feature version.
+    """
+    labels = list(labels)
+    if pin in labels:
+        return pin
+    series = [label for label in labels if label_series(label) == pin]
+    return max(series, key=preference) if series else None
+
+
+def pinned_install(proj: Path, installs: Mapping[str, Path]) -> Optional[Path]:
+    """
+    Registered executable for a project's pin.
+
+    Returns
+    -------
+    Optional[Path]
+        The executable, or None if the project has no pin, no install
+        matches or the executable no longer exists.
+    """
+    if not installs or (pin := project_pin(proj)) is None:
+        return None
+    label = resolve_label(pin, installs)
+    if label is None or not os.path.isfile(installs[label]):
+        return None
+    return installs[label]
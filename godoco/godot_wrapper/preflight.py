@@ -0,0 +1,420 @@
+"""Checks that catch doomed exports before Godot is started."""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from pathlib import Path
+import hashlib
+import os
+from typing import Any, Iterable, Optional
+
+from .export import ExportPreset
+from .version import GodotVersion, hash_file
+from .versions import godot_templates_dir, install_label
+from ..utils.fs import read_json_file, write_json_file
+from ..utils.paths import get_cache_dir
+from ..utils.trace import span
+
+TEMPLATE_MANIFEST_FILE = "export-templates.json"
+# Bump when the manifest layout changes
+TEMPLATE_MANIFEST_SCHEMA = 1
+TEMPLATES_VERSION_FILE = "version.txt"
+# Next to the executable of a self-contained Godot
+SELF_CONTAINED_MARKERS = ("_sc_", "._sc_")
+CUSTOM_TEMPLATE_KEYS = {
+    "debug": "custom_template/debug",
+    "release": "custom_template/release",
+}
+# Exports built from the project's android/build instead of a template
+GRADLE_BUILD_KEYS = (
+    "gradle_build/use_gradle_build",
+    "custom_template/use_custom_build",
+)
+
+
+@dataclass
+class Problem:
+    """Why a preset cannot be exported."""
+
+    preset: str
+    message: str
+    # Godot's own templates for the version are missing
+    missing_templates: bool = False
+
+
+@dataclass
+class Preflight:
+    """Outcome of ``preflight_export``."""
+
+    problems: list[Problem] = field(default_factory=list)
+    # Preset name -> digest of the template files it exports with
+    templates: dict[str, str] = field(default_factory=dict)
+    # Template folder looked in (None if the version is unknown)
+    folder: Optional[Path] = None
+    label: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems
+
+
+def template_names(
+    platform: str, options: dict[str, Any], version: GodotVersion, debug: bool
+) -> Optional[list[str]]:
+    """
+    Files Godot needs from its template folder to export a preset.
+
+    Parameters
+    ----------
+    platform : str
+        The preset's ``platform``.
+    options : dict[str, Any]
+        The preset's ``[preset.N.options]``.
+    version : GodotVersion
+        Godot version exporting.
+    debug : bool
+        Debug export.
+
+    Returns
+    -------
+    Optional[list[str]]
+        Template file names (empty if none is needed), or None for
+        platforms whose templates are not known here.
+    """
+    target = "debug" if debug else "release"
+    if any(options.get(key) for key in GRADLE_BUILD_KEYS):
+        return []
+
+    if version.major >= 4:
+        arch = str(options.get("binary_format/architecture") or "x86_64")
+        if platform in ("Linux", "Linux/X11"):
+            return [f"linux_{target}.{arch}"]
+        if platform == "Windows Desktop":
+            return [f"windows_{target}_{arch}.exe"]
+        if platform == "macOS":
+            return ["macos.zip"]
+        if platform == "iOS":
+            return ["ios.zip"]
+        if platform == "Android":
+            return [f"android_{target}.apk"]
+        if platform == "Web":
+            # Single-threaded builds are the default since 4.3
+            threads = options.get(
+                "variant/thread_support",
+                (version.major, version.minor) < (4, 3),
+            )
+            name = "web"
+            if options.get("variant/extensions_support"):
+                name += "_dlink"
+            if not threads:
+                name += "_nothreads"
+            return [f"{name}_{target}.zip"]
+        return None
+
+    bits = "64" if options.get("binary_format/64_bits", True) else "32"
+    if platform == "Linux/X11":
+        return [f"linux_x11_{bits}_{target}"]
+    if platform == "Windows Desktop":
+        return [f"windows_{bits}_{target}.exe"]
+    if platform == "Mac OSX":
+        return ["osx.zip"]
+    if platform == "iOS":
+        return ["iphone.zip"]
+    if platform == "Android":
+        return [f"android_{target}.apk"]
+    if platform == "HTML5":
+        variant = {1: "_threads", 2: "_gdnative"}.get(
+            options.get("variant/export_type", 0), ""
+        )
+        return [f"webassembly{variant}_{target}.zip"]
+    return None
+
+
+def template_info(name: str) -> tuple[str, str]:
+    """
+    Platform and target of a template file.
+
+    ``linux_release.x86_64`` is ``("linux", "release")``; files used by
+    both targets (``macos.zip``) have an empty target.
+    """
+    parts = name.split(".", 1)[0].split("_")
+    target = next((p for p in parts if p in ("debug", "release")), "")
+    return parts[0], target
+
+
+def templates_folder(exe: Optional[Path], label: str) -> Path:
+    """
+    Folder Godot reads a version's export templates from.
+
+    A self-contained Godot keeps them next to its executable.
+    """
+    if exe is not None:
+        home = exe.parent
+        if any((home / marker).exists() for marker in SELF_CONTAINED_MARKERS):
+            return home / "editor_data" / "export_templates" / label
+    return godot_templates_dir() / label
+
+
+class TemplateManifest:
+    """
+    Cached listing of installed export templates.
+
+    Each folder records the version its ``version.txt`` names and, per
+    template file, its platform, target, mtime, size and content hash.
+    Files are re-listed with one ``stat`` each; a hash is computed only
+    when a template is needed and its mtime or size changed.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or get_cache_dir() / TEMPLATE_MANIFEST_FILE
+        data = read_json_file(self.path)
+        if (
+            not isinstance(data, dict)
+            or data.get("schema") != TEMPLATE_MANIFEST_SCHEMA
+        ):
+            data = {"schema": TEMPLATE_MANIFEST_SCHEMA, "folders": {}}
+        data.setdefault("custom", {})
+        self.data = data
+        self.dirty = False
+
+    def scan(self, folder: Path) -> Optional[dict]:
+        """
+        Current entry of a template folder.
+
+        Returns
+        -------
+        Optional[dict]
+            ``{"version": str, "files": {name: {...}}}``, or None if the
+            folder does not exist.
+        """
+        key = os.fspath(folder)
+        old = self.data["folders"].get(key) or {}
+        try:
+            with os.scandir(folder) as it:
+                entries = [e for e in it if e.is_file()]
+        except OSError:
+            if key in self.data["folders"]:
+                del self.data["folders"][key]
+                self.dirty = True
+            return None
+
+        version = ""
+        files: dict[str, dict] = {}
+        for entry in entries:
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            if entry.name == TEMPLATES_VERSION_FILE:
+                try:
+                    with open(entry.path, encoding="utf-8") as f:
+                        version = f.read().strip()
+                except OSError:
+                    pass
+                continue
+            prev = old.get("files", {}).get(entry.name)
+            if (
+                prev
+                and prev["mtime_ns"] == st.st_mtime_ns
+                and prev["size"] == st.st_size
+            ):
+                files[entry.name] = prev
+                continue
+            platform, target = template_info(entry.name)
+            files[entry.name] = {
+                "platform": platform,
+                "target": target,
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "sha256": None,
+            }
+
+        entry = {"version": version, "files": files}
+        if entry != old:
+            self.data["folders"][key] = entry
+            self.dirty = True
+        return entry
+
+    def digest(self, folder: Path, name: str) -> str:
+        """Content hash of a scanned template, hashing it if needed."""
+        record = self.data["folders"][os.fspath(folder)]["files"][name]
+        if not record["sha256"]:
+            record["sha256"] = hash_file(folder / name)
+            self.dirty = True
+        return record["sha256"]
+
+    def file_digest(self, path: Path) -> str:
+        """
+        Content hash of a custom template, cached by mtime and size.
+
+        Raises
+        ------
+        OSError
+            If the file cannot be read.
+        """
+        st = os.stat(path)
+        key = os.fspath(path)
+        record = self.data["custom"].get(key)
+        if record and record[:2] == [st.st_mtime_ns, st.st_size]:
+            return record[2]
+        digest = hash_file(path)
+        self.data["custom"][key] = [st.st_mtime_ns, st.st_size, digest]
+        self.dirty = True
+        return digest
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        try:
+            write_json_file(self.path, self.data)
+            self.dirty = False
+        except OSError:
+            # Rebuilt on the next run
+            pass
+
+
+def templates_archive_name(version: GodotVersion) -> str:
+    """Name of the official templates archive, as offered for download."""
+    mono = "_mono" if "mono" in version.build.split(".") else ""
+    return (
+        f"Godot_v{version.number}-{version.status}{mono}_export_templates.tpz"
+    )
+
+
+def _custom_template(proj: Path, value: str) -> Path:
+    if value.startswith("res://"):
+        return proj / value[len("res://") :]
+    path = Path(value).expanduser()
+    return path if path.is_absolute() else proj / path
+
+
+def preflight_export(
+    proj: Path,
+    presets: Iterable[str],
+    defined: dict[str, ExportPreset],
+    version: Optional[GodotVersion],
+    debug: bool = False,
+    exe: Optional[Path] = None,
+    manifest: Optional[TemplateManifest] = None,
+) -> Preflight:
+    """
+    Find presets an export would fail on, without starting Godot.
+
+    Checks that each preset is defined, that its custom templates exist
+    and, for the others, that Godot's templates for ``version`` are
+    installed, non-empty and labelled with that version. Android presets
+    built with Gradle need the project's ``android/build`` instead.
+
+    Parameters
+    ----------
+    proj : Path
+        Project root.
+    presets : Iterable[str]
+        Presets to export.
+    defined : dict[str, ExportPreset]
+        Presets of export_presets.cfg by name.
+    version : Optional[GodotVersion]
+        Godot version exporting; without it templates are not checked.
+    debug : bool
+        Debug export.
+    exe : Optional[Path]
+        Godot executable, to find the templates of a self-contained Godot.
+    manifest : Optional[TemplateManifest]
+        Template manifest (default: the user cache).
+
+    Returns
+    -------
+    Preflight
+        Problems and the template digest of each exportable preset.
+    """
+    result = Preflight()
+    if version is not None:
+        result.label = install_label(version)
+        result.folder = templates_folder(exe, result.label)
+    target = "debug" if debug else "release"
+    manifest = manifest or TemplateManifest()
+    listing: Optional[dict] = None
+    scanned = False
+
+    with span("export.preflight"):
+        for name in presets:
+            preset = defined.get(name)
+            if preset is None:
+                result.problems.append(
+                    Problem(name, "no such preset in export_presets.cfg")
+                )
+                continue
+            options = preset.options
+
+            h = hashlib.sha256()
+            custom = str(options.get(CUSTOM_TEMPLATE_KEYS[target]) or "")
+            if custom:
+                path = _custom_template(proj, custom)
+                try:
+                    h.update(manifest.file_digest(path).encode())
+                except OSError:
+                    result.problems.append(
+                        Problem(
+                            name, f"custom {target} template {custom} not found"
+                        )
+                    )
+                    continue
+                result.templates[name] = h.hexdigest()
+                continue
+
+            if (
+                any(options.get(key) for key in GRADLE_BUILD_KEYS)
+                and not (proj / "android" / "build").is_dir()
+            ):
+                result.problems.append(
+                    Problem(
+                        name,
+                        "Gradle build needs android/build; install it from "
+                        "Project > Install Android Build Template",
+                    )
+                )
+                continue
+
+            if version is None:
+                continue
+            needed = template_names(preset.platform, options, version, debug)
+            if needed is None:
+                continue
+
+            if needed and not scanned:
+                listing = manifest.scan(result.folder)
+                scanned = True
+            files = listing["files"] if listing else {}
+            if listing and needed and listing["version"] != result.label:
+                result.problems.append(
+                    Problem(
+                        name,
+                        f"templates in {result.folder} are for "
+                        f"{listing['version'] or 'an unknown version'}, "
+                        f"not {result.label}",
+                        missing_templates=True,
+                    )
+                )
+                continue
+
+            bad = False
+            for file in needed:
+                record = files.get(file)
+                if record is None or not record["size"]:
+                    state = "missing" if record is None else "empty"
+                    result.problems.append(
+                        Problem(
+                            name,
+                            f"{result.label} template {file} is {state}",
+                            missing_templates=True,
+                        )
+                    )
+                    bad = True
+                    continue
+                h.update(
+                    f"{file}\0{manifest.digest(result.folder, file)}\n".encode()
+                )
+            if not bad:
+                result.templates[name] = h.hexdigest()
+
+        manifest.save()
+    return result
@@ -0,0 +1,301 @@
+"""Asyncio-based supervision of Godot child processes."""
+
+from __future__ import annotations
+from dataclasses import dataclass
+import os
+import subprocess
+import sys
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, Sequence
+
+from ..utils.trace import span
+
+# asyncio is imported where it is used: it costs more than the rest of
+# a simple command, and this module is imported by every Godot wrapper
+if TYPE_CHECKING:
+    import asyncio
+
+TERMINATE_GRACE = 5.0
+RSS_SAMPLE_INTERVAL = 0.1
+READ_CHUNK = 64 * 1024
+
+LineCallback = Callable[[str], None]
+
+
+@dataclass
+class ProcessResult:
+    """Outcome of a supervised process."""
+
+    cmd: list[str]
+    returncode: int
+    wall_seconds: float
+    # Peak resident set size in bytes, where the platform exposes it
+    peak_rss: Optional[int] = None
+    timed_out: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+
+def echo_stdout(line: str) -> None:
+    """Write a child's stdout line to ours, unbuffered."""
+    sys.stdout.write(line + "\n")
+    sys.stdout.flush()
+
+
+def echo_stderr(line: str) -> None:
+    """Write a child's stderr line to ours, unbuffered."""
+    sys.stderr.write(line + "\n")
+    sys.stderr.flush()
+
+
+def _proc_status_kb(pid: int, field: str) -> Optional[int]:
+    """A ``kB`` field of ``/proc/<pid>/status``, or None if unavailable."""
+    prefix = field + ":"
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(prefix):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def read_peak_rss(pid: int) -> Optional[int]:
+    """
+    Peak resident set size of a running process (Linux ``VmHWM``).
+
+    Returns
+    -------
+    Optional[int]
+        Bytes, or None where ``/proc`` is unavailable.
+    """
+    kb = _proc_status_kb(pid, "VmHWM")
+    return None if kb is None else kb * 1024
+
+
+def read_rss(pid: int) -> Optional[int]:
+    """Current resident set size of a process (Linux ``VmRSS``), in bytes."""
+    kb = _proc_status_kb(pid, "VmRSS")
+    return None if kb is None else kb * 1024
+
+
+async def pump_lines(
+    stream: Optional[asyncio.StreamReader], on_line: LineCallback
+) -> None:
+    """Forward a pipe line by line, holding at most one partial line."""
+    if stream is None:
+        return
+    pending = b""
+    while chunk := await stream.read(READ_CHUNK):
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            on_line(line.decode("utf-8", "replace").rstrip("\r"))
+    if pending:
+        on_line(pending.decode("utf-8", "replace").rstrip("\r"))
+
+
+async def _sample_rss(pid: int, peak: list[Optional[int]]) -> None:
+    import asyncio
+
+    while True:
+        if (rss := read_peak_rss(pid)) is not None:
+            peak[0] = max(peak[0] or 0, rss)
+        await asyncio.sleep(RSS_SAMPLE_INTERVAL)
+
+
+async def terminate(
+    proc: asyncio.subprocess.Process, grace: float = TERMINATE_GRACE
+) -> None:
+    """
+    Stop a child: SIGTERM, then SIGKILL if it is still alive after ``grace``.
+
+    Parameters
+    ----------
+    proc : asyncio.subprocess.Process
+        Child to stop.
+    grace : float
+        Seconds to wait for a clean exit.
+    """
+    import asyncio
+
+    if proc.returncode is not None:
+        return
+    try:
+        proc.terminate()
+        await asyncio.wait_for(proc.wait(), grace)
+    except ProcessLookupError:
+        return
+    except TimeoutError:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            return
+        await proc.wait()
+
+
+async def run_process(
+    cmd: Sequence[str],
+    *,
+    cwd: Optional[os.PathLike | str] = None,
+    timeout: Optional[float] = None,
+    on_stdout: Optional[LineCallback] = None,
+    on_stderr: Optional[LineCallback] = None,
+    merge_stderr: bool = False,
+    grace: float = TERMINATE_GRACE,
+    interactive: bool = False,
+) -> ProcessResult:
+    """
+    Run a command, streaming its output and enforcing a timeout.
+
+    Output is forwarded line by line as it arrives and never accumulated.
+    An ``interactive`` child inherits our stdin, stdout and stderr
+    instead, so it keeps the terminal (colours, input). On timeout, or when the awaiting task is cancelled (e.g. by Ctrl+C
+    under ``asyncio.run``), the child gets SIGTERM and, after ``grace``
+    seconds, SIGKILL.
+
+    Parameters
+    ----------
+    cmd : Sequence[str]
+        Command line.
+    cwd : Optional[os.PathLike | str]
+        Working directory.
+    timeout : Optional[float]
+        Seconds before the child is stopped.
+    on_stdout : Optional[LineCallback]
+        Receives stdout lines (default: echo to our stdout).
+    on_stderr : Optional[LineCallback]
+        Receives stderr lines (default: echo to our stderr).
+    merge_stderr : bool
+        Send stderr into stdout so ``on_stdout`` sees both in order.
+    grace : float
+        Seconds between SIGTERM and SIGKILL.
+    interactive : bool
+        Inherit stdio; the output callbacks are not used.
+
+    Returns
+    -------
+    ProcessResult
+        Exit code, wall time and peak RSS. A command that cannot be
+        started yields returncode -1 and ``error``.
+    """
+    cmd = [str(c) for c in cmd]
+    with span("process", cmd=cmd):
+        return await _run_process(
+            cmd,
+            cwd,
+            timeout,
+            on_stdout,
+            on_stderr,
+            merge_stderr,
+            grace,
+            interactive,
+        )
+
+
+async def _run_process(
+    cmd: list[str],
+    cwd: Optional[os.PathLike | str],
+    timeout: Optional[float],
+    on_stdout: Optional[LineCallback],
+    on_stderr: Optional[LineCallback],
+    merge_stderr: bool,
+    grace: float,
+    interactive: bool,
+) -> ProcessResult:
+    import asyncio
+
+    start = time.perf_counter()
+    try:
+        if interactive:
+            proc = await asyncio.create_subprocess_exec(*cmd, cwd=cwd)
+        else:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=cwd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT if merge_stderr else subprocess.PIPE,
+            )
+    except OSError as e:
+        return ProcessResult(cmd, -1, time.perf_counter() - start, error=str(e))
+
+    peak: list[Optional[int]] = [None]
+    sampler = asyncio.create_task(_sample_rss(proc.pid, peak))
+    readers = (
+        []
+        if interactive
+        else [
+            asyncio.create_task(
+                pump_lines(proc.stdout, on_stdout or echo_stdout)
+            ),
+            asyncio.create_task(
+                pump_lines(proc.stderr, on_stderr or echo_stderr)
+            ),
+        ]
+    )
+    timed_out = False
+    try:
+        try:
+            await asyncio.wait_for(proc.wait(), timeout)
+        except TimeoutError:
+            timed_out = True
+            await terminate(proc, grace)
+        # Grandchildren may keep the pipes open; don't wait on them forever
+        if readers:
+            await asyncio.wait(readers, timeout=grace)
+    except asyncio.CancelledError:
+        await terminate(proc, grace)
+        raise
+    finally:
+        sampler.cancel()
+        for reader in readers:
+            reader.cancel()
+
+    return ProcessResult(
+        cmd,
+        proc.returncode if proc.returncode is not None else -1,
+        time.perf_counter() - start,
+        peak_rss=peak[0],
+        timed_out=timed_out,
+    )
+
+
+async def gather_limited(
+    factories: Sequence[Callable[[], Awaitable]], limit: int
+) -> list:
+    """
+    Await coroutines with at most ``limit`` running at once.
+
+    Parameters
+    ----------
+    factories : Sequence[Callable[[], Awaitable]]
+        Zero-argument callables creating the coroutines, so none starts
+        before a slot is free.
+    limit : int
+        Maximum concurrency.
+
+    Returns
+    -------
+    list
+        Results in input order.
+    """
+    import asyncio
+
+    sem = asyncio.Semaphore(max(1, limit))
+
+    async def guarded(factory: Callable[[], Awaitable]):
+        async with sem:
+            return await factory()
+
+    return await asyncio.gather(*(guarded(f) for f in factories))
+
+
+def run_sync(cmd: Sequence[str], **kwargs) -> ProcessResult:
+    """Blocking ``run_process`` for synchronous callers."""
+    import asyncio
+
+    return asyncio.run(run_process(cmd, **kwargs))
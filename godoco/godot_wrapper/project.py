@@ -1,9 +1,19 @@
 """Godot project file management."""
 
 from __future__ import annotations
+from contextlib import contextmanager
 from pathlib import Path
 import re
-from typing import Optional
+from typing import Any, Optional
+
+from .configfile import ConfigDocument
+from .variant import GodotCall
+from ..utils.fs import atomic_write_text, file_signature
+from ..utils.trace import span, traced
+
+# Parsed documents shared by all instances, keyed by file path and
+# invalidated when the file's mtime or size changes
+_documents: dict[str, tuple[tuple[int, int], ConfigDocument]] = {}
 
 
 class ProjectGodotFile:
@@ -16,26 +26,92 @@ class ProjectGodotFile:
         """Check if project.godot exists."""
         return self.path.exists()
 
+    @traced("project.read")
     def read(self) -> str:
         """Read content."""
         return self.path.read_text(encoding="utf-8") if self.exists() else ""
 
+    @traced("project.write")
     def write(self, content: str) -> None:
-        """Write content."""
-        self.path.write_text(content, encoding="utf-8")
+        """Write content (atomically replaces the file)."""
+        _documents.pop(str(self.path), None)
+        atomic_write_text(self.path, content)
+
+    def document(self) -> ConfigDocument:
+        """
+        Get the parsed file, reusing the cached parse while unchanged.
+
+        Returns
+        -------
+        ConfigDocument
+            Parsed model (empty if the file does not exist).
+        """
+        sig = file_signature(self.path)
+        if sig is None:
+            return ConfigDocument()
+
+        key = str(self.path)
+        if (cached := _documents.get(key)) and cached[0] == sig:
+            return cached[1]
+
+        text = self.read()
+        with span("project.parse"):
+            doc = ConfigDocument.parse(text)
+        _documents[key] = (sig, doc)
+        return doc
 
     def get_value(self, section: str, key: str) -> Optional[str]:
         """
-        Get value from config.
-        Crucial simplified parser: mostly looks for key=value
+        Get the literal text of a value (strings keep their quotes).
+
+        Parameters
+        ----------
+        section : str
+            Section name, e.g. "application".
+        key : str
+            Key within the section, e.g. "config/name".
+
+        Returns
+        -------
+        Optional[str]
+            Value text, or None if the key is not set.
+        """
+        return self.document().get_raw(section, key)
+
+    def get(self, section: str, key: str, default: Any = None) -> Any:
+        """Get a parsed value (see ``parse_variant``)."""
+        return self.document().get(section, key, default)
+
+    def edit(self) -> ProjectEdit:
         """
-        content = self.read()
-        # Regex (simplified): key="value" or key=123
-        # Use simple search for parsing, not full ini parser as Godot has unique syntax
-        pattern = re.compile(rf"{key}=(.+)")
-        if m := pattern.search(content):
-            return m.group(1).strip()
-        return None
+        Start a batch of changes that is written once.
+
+        Use as a context manager; changes are committed on normal exit::
+
+            with pf.edit() as tx:
+                tx.set("application", "config/name", "MyGame")
+                tx.set("rendering", "renderer/rendering_method", "mobile")
+            print(tx.changed)
+
+        Returns
+        -------
+        ProjectEdit
+            Empty transaction bound to this file.
+        """
+        return ProjectEdit(self)
+
+    def set_value(self, section: str, key: str, value: Any) -> bool:
+        """
+        Set a value and write the file if it changed.
+
+        Returns
+        -------
+        bool
+            True if the file was rewritten.
+        """
+        with self.edit() as tx:
+            tx.set(section, key, value)
+        return bool(tx.changed)
 
     def update_setting(self, key_pattern: str, new_value: str) -> bool:
         """
@@ -50,30 +126,114 @@ class ProjectGodotFile:
             return True
         return False
 
-    def update_icon(self, icon_path: str) -> None:
+    def update_icon(
+        self, icon_path: str, tx: Optional[ProjectEdit] = None
+    ) -> None:
         """Update application/config/icon."""
-        # This regex tries to find config/icon="old"
-        self.update_setting(
-            r'config/icon="[^"]*"', f'config/icon="{icon_path}"'
-        )
+        with _staged(self, tx) as tx:
+            tx.set("application", "config/icon", icon_path)
 
-    def update_main_scene(self, scene_path: str) -> None:
+    def update_main_scene(
+        self, scene_path: str, tx: Optional[ProjectEdit] = None
+    ) -> None:
         """Update run/main_scene."""
-        self.update_setting(
-            r'run/main_scene="[^"]*"', f'run/main_scene="{scene_path}"'
-        )
+        with _staged(self, tx) as tx:
+            tx.set("application", "run/main_scene", scene_path)
 
-    def set_renderer(self, renderer: str, version: str) -> None:
-        """Set rendering method."""
+    def set_renderer(
+        self, renderer: str, version: str, tx: Optional[ProjectEdit] = None
+    ) -> None:
+        """Set rendering method (and the matching feature tag)."""
         feat = {
             "forward_plus": "Forward Plus",
             "mobile": "Mobile",
             "gl_compatibility": "GL Compatibility",
         }.get(renderer, "Forward Plus")
-        self.update_setting(
-            r'rendering_method="[^"]*"', f'rendering_method="{renderer}"'
-        )
-        self.update_setting(
-            r"config/features=PackedStringArray\([^)]*\)",
-            f'config/features=PackedStringArray("{version}", "{feat}")',
-        )
+        with _staged(self, tx) as tx:
+            tx.set("rendering", "renderer/rendering_method", renderer)
+            tx.set(
+                "application",
+                "config/features",
+                GodotCall("PackedStringArray", [version, feat]),
+            )
+
+
+class ProjectEdit:
+    """
+    Staged project.godot changes, applied in one pass and one write.
+
+    Changes are applied to the parsed model on ``commit()``; the file is
+    replaced atomically, and only if at least one value actually differs.
+    """
+
+    def __init__(self, project: ProjectGodotFile):
+        self.project = project
+        self._staged: dict[tuple[str, str], Any] = {}
+        self._removed: set[tuple[str, str]] = set()
+        self.changed: list[str] = []
+
+    def set(self, section: str, key: str, value: Any) -> ProjectEdit:
+        """Stage a value. Later calls for the same key win."""
+        self._removed.discard((section, key))
+        self._staged[(section, key)] = value
+        return self
+
+    def remove(self, section: str, key: str) -> ProjectEdit:
+        """Stage removal of a key."""
+        self._staged.pop((section, key), None)
+        self._removed.add((section, key))
+        return self
+
+    def commit(self) -> list[str]:
+        """
+        Apply staged changes and write the file once if anything changed.
+
+        Returns
+        -------
+        list[str]
+            Changed keys as ``section/key`` (empty if nothing changed).
+        """
+        pf = self.project
+        doc = pf.document()
+        changed = []
+        for (section, key), value in self._staged.items():
+            if doc.set(section, key, value):
+                changed.append(f"{section}/{key}" if section else key)
+        for section, key in self._removed:
+            if doc.remove(section, key):
+                changed.append(f"{section}/{key}" if section else key)
+
+        self._staged.clear()
+        self._removed.clear()
+        self.changed.extend(changed)
+        if not changed:
+            return changed
+
+        try:
+            pf.write(doc.to_text())
+        except BaseException:
+            # The cached model was edited in place; drop it
+            _documents.pop(str(pf.path), None)
+            raise
+
+        # Keep the already-parsed model for the file we just wrote
+        if sig := file_signature(pf.path):
+            _documents[str(pf.path)] = (sig, doc)
+        return changed
+
+    def __enter__(self) -> ProjectEdit:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+
+
+@contextmanager
+def _staged(pf: ProjectGodotFile, tx: Optional[ProjectEdit]):
+    """Use the caller's transaction, or a one-off one committed on exit."""
+    if tx is not None:
+        yield tx
+        return
+    with pf.edit() as own:
+        yield own
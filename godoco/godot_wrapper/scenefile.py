@@ -0,0 +1,563 @@
+"""Godot text scene and resource format (.tscn, .tres)."""
+
+from __future__ import annotations
+from dataclasses import asdict, dataclass, field
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+
+from .variant import (
+    IDENTIFIER,
+    GodotCall,
+    RawVariant,
+    VariantSyntaxError,
+    encode_string,
+    parse_variant,
+    parse_variant_at,
+    skip_variant,
+)
+from ..utils.fs import file_signature, read_json_file, write_json_file
+from ..utils.paths import get_cache_dir
+
+HEADER_KINDS = frozenset({"gd_scene", "gd_resource"})
+SCENE_INDEX_FILE = "scene-index.json"
+# Entries kept in the scene index; oldest are dropped first
+SCENE_INDEX_LIMIT = 256
+
+
+@dataclass
+class SceneProperty:
+    """
+    A ``key = value`` line, kept as the exact source text.
+
+    ``prefix`` holds the key, ``=`` and spacing, ``suffix`` everything
+    after the value up to and including the newline.
+    """
+
+    key: str
+    prefix: str
+    text: str
+    suffix: str
+
+    @property
+    def value(self) -> Any:
+        return _parse_value(self.text)
+
+
+@dataclass
+class SceneTag:
+    """
+    A ``[kind attr=value ...]`` header with the lines that follow it.
+
+    ``attrs`` maps attribute names to their literal text in file order.
+    ``body`` holds properties and verbatim lines (blank lines, comments)
+    up to the next tag.
+    """
+
+    kind: str
+    attrs: dict[str, str]
+    text: str
+    tail: str = "\n"
+    body: list[Union[str, SceneProperty]] = field(default_factory=list)
+    properties: dict[str, SceneProperty] = field(default_factory=dict)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Parsed value of an attribute."""
+        raw = self.attrs.get(name)
+        return default if raw is None else _parse_value(raw)
+
+    def set_attr(
+        self, name: str, text: Optional[str], before: str = ""
+    ) -> bool:
+        """
+        Set an attribute from literal text, or remove it with None.
+
+        New attributes go before ``before`` if present, else last.
+
+        Returns
+        -------
+        bool
+            True if the tag changed.
+        """
+        if self.attrs.get(name) == text:
+            return False
+        if text is None:
+            del self.attrs[name]
+        elif name in self.attrs or before not in self.attrs:
+            self.attrs[name] = text
+        else:
+            attrs = {}
+            for key, value in self.attrs.items():
+                if key == before:
+                    attrs[name] = text
+                attrs[key] = value
+            self.attrs = attrs
+        self.text = _header_text(self.kind, self.attrs, self.tail)
+        return True
+
+    def set_property(self, key: str, text: str) -> bool:
+        """
+        Set a property from literal text.
+
+        New properties are added after the last existing one.
+
+        Returns
+        -------
+        bool
+            True if the tag changed.
+        """
+        if prop := self.properties.get(key):
+            if prop.text == text:
+                return False
+            prop.text = text
+            return True
+
+        prop = SceneProperty(key, f"{key} = ", text, "\n")
+        index = 0
+        for i, segment in enumerate(self.body):
+            if isinstance(segment, SceneProperty):
+                index = i + 1
+        if index and not self.body[index - 1].suffix.endswith("\n"):
+            self.body[index - 1].suffix += "\n"
+        elif not index and not self.tail.endswith("\n"):
+            self.tail += "\n"
+            self.text += "\n"
+        self.body.insert(index, prop)
+        self.properties[key] = prop
+        return True
+
+    def to_text(self) -> str:
+        parts = [self.text]
+        for segment in self.body:
+            if isinstance(segment, SceneProperty):
+                parts.append(segment.prefix + segment.text + segment.suffix)
+            else:
+                parts.append(segment)
+        return "".join(parts)
+
+
+def _is_blank(segment: Union[str, SceneProperty, None]) -> bool:
+    return isinstance(segment, str) and not segment.strip()
+
+
+def _parse_value(text: str) -> Any:
+    try:
+        return parse_variant(text)
+    except VariantSyntaxError:
+        return RawVariant(text)
+
+
+def _header_text(kind: str, attrs: dict[str, str], tail: str) -> str:
+    return (
+        "[" + kind + "".join(f" {k}={v}" for k, v in attrs.items()) + "]" + tail
+    )
+
+
+def _line_end(text: str, pos: int) -> int:
+    nl = text.find("\n", pos)
+    return len(text) if nl == -1 else nl + 1
+
+
+def _parse_header(text: str, pos: int) -> tuple[SceneTag, int]:
+    """Parse a tag header starting at ``[``; return it and the next offset."""
+    m = IDENTIFIER.match(text, pos + 1)
+    if not m:
+        raise VariantSyntaxError(f"Malformed tag at offset {pos}")
+    kind = m.group()
+    attrs: dict[str, str] = {}
+    i, n = m.end(), len(text)
+    while True:
+        while i < n and text[i] in " \t":
+            i += 1
+        if i >= n:
+            raise VariantSyntaxError(f"Unterminated tag at offset {pos}")
+        if text[i] == "]":
+            break
+        m = IDENTIFIER.match(text, i)
+        if not m or not text.startswith("=", m.end()):
+            raise VariantSyntaxError(f"Malformed attribute at offset {i}")
+        _, end = parse_variant_at(text, m.end() + 1)
+        attrs[m.group()] = text[m.end() + 1 : end].strip()
+        i = end
+
+    end = _line_end(text, i)
+    tail = text[i + 1 : end]
+    return SceneTag(kind, attrs, text[pos:end], tail), end
+
+
+def iter_tags(text: str, pos: int = 0) -> Iterator[SceneTag]:
+    """
+    Parse tags one at a time.
+
+    Each tag is yielded once its body is complete, so callers can stop
+    early. Property values are delimited but not interpreted.
+
+    Parameters
+    ----------
+    text : str
+        File content.
+    pos : int
+        Offset of the first tag.
+
+    Yields
+    ------
+    SceneTag
+        Tags in file order.
+
+    Raises
+    ------
+    VariantSyntaxError
+        If a tag header is malformed.
+    """
+    n = len(text)
+    tag: Optional[SceneTag] = None
+    while pos < n:
+        line_end = _line_end(text, pos)
+        i = pos
+        while i < line_end and text[i] in " \t":
+            i += 1
+        ch = text[i] if i < line_end else "\n"
+
+        if ch == "[":
+            if tag is not None:
+                yield tag
+            tag, pos = _parse_header(text, i)
+            continue
+
+        if tag is None or ch in "\r\n;":
+            # Blank lines and comments (text before the first tag is the
+            # caller's business)
+            if tag is not None:
+                tag.body.append(text[pos:line_end])
+            pos = line_end
+            continue
+
+        eq = text.find("=", i, line_end)
+        if eq == -1:
+            tag.body.append(text[pos:line_end])
+            pos = line_end
+            continue
+
+        vstart = eq + 1
+        while vstart < line_end and text[vstart] in " \t":
+            vstart += 1
+        vend = skip_variant(text, vstart)
+        while vend > vstart and text[vend - 1] in " \t\r":
+            vend -= 1
+        end = _line_end(text, vend)
+        prop = SceneProperty(
+            text[i:eq].strip(),
+            text[pos:vstart],
+            text[vstart:vend],
+            text[vend:end],
+        )
+        tag.body.append(prop)
+        tag.properties[prop.key] = prop
+        pos = end
+
+    if tag is not None:
+        yield tag
+
+
+def _first_tag(text: str) -> int:
+    pos, n = 0, len(text)
+    while pos < n:
+        stripped = text[pos : _line_end(text, pos)].lstrip(" \t\ufeff")
+        if stripped.startswith("["):
+            return pos
+        pos = _line_end(text, pos)
+    return n
+
+
+class SceneDocument:
+    """
+    In-memory model of a ``.tscn`` or ``.tres`` file.
+
+    Tags keep their source text, and edits only rewrite the headers and
+    property lines they touch, so serializing an edited document gives a
+    minimal diff.
+    """
+
+    def __init__(
+        self, preamble: str = "", tags: Optional[list[SceneTag]] = None
+    ):
+        self.preamble = preamble
+        self.tags: list[SceneTag] = tags or []
+
+    @classmethod
+    def parse(cls, text: str) -> SceneDocument:
+        """
+        Parse scene or resource text.
+
+        Raises
+        ------
+        VariantSyntaxError
+            If a tag header is malformed.
+        """
+        start = _first_tag(text)
+        return cls(text[:start], list(iter_tags(text, start)))
+
+    def to_text(self) -> str:
+        """Serialize back to text."""
+        return self.preamble + "".join(t.to_text() for t in self.tags)
+
+    @property
+    def header(self) -> Optional[SceneTag]:
+        """The ``gd_scene``/``gd_resource`` tag."""
+        if self.tags and self.tags[0].kind in HEADER_KINDS:
+            return self.tags[0]
+        return None
+
+    @property
+    def format(self) -> int:
+        """File format: 3 for Godot 4, 2 for Godot 3."""
+        fmt = self.header.get("format", 3) if self.header else 3
+        return fmt if isinstance(fmt, int) else 3
+
+    def of_kind(self, kind: str) -> list[SceneTag]:
+        return [t for t in self.tags if t.kind == kind]
+
+    @property
+    def ext_resources(self) -> list[SceneTag]:
+        return self.of_kind("ext_resource")
+
+    @property
+    def sub_resources(self) -> list[SceneTag]:
+        return self.of_kind("sub_resource")
+
+    @property
+    def nodes(self) -> list[SceneTag]:
+        return self.of_kind("node")
+
+    @property
+    def root(self) -> Optional[SceneTag]:
+        """The node without a ``parent``."""
+        for tag in self.tags:
+            if tag.kind == "node" and "parent" not in tag.attrs:
+                return tag
+        return None
+
+    def ext_resource(self, id: Any) -> Optional[SceneTag]:
+        """External resource by id."""
+        for tag in self.ext_resources:
+            if tag.get("id") == id:
+                return tag
+        return None
+
+    def find_ext_resource(self, path: str) -> Optional[SceneTag]:
+        """External resource by ``res://`` path."""
+        for tag in self.ext_resources:
+            if tag.get("path") == path:
+                return tag
+        return None
+
+    def allocate_id(self, path: str) -> Any:
+        """
+        Unused external resource id.
+
+        Godot 4 ids look like ``"2_a1b2c"`` (index and a suffix derived
+        from the path, so regenerating is stable); Godot 3 ids are ints.
+        """
+        used = {t.get("id") for t in self.ext_resources}
+        index = len(used) + 1
+        if self.format < 3:
+            ints = [i for i in used if isinstance(i, int)]
+            return max(ints, default=0) + 1
+        suffix = hashlib.sha1(path.encode()).hexdigest()[:5]
+        while f"{index}_{suffix}" in used:
+            index += 1
+        return f"{index}_{suffix}"
+
+    def add_ext_resource(
+        self, type: str, path: str, uid: Optional[str] = None
+    ) -> Any:
+        """
+        Reference an external resource, reusing an existing entry.
+
+        The new tag goes after the last ``ext_resource`` (or after the
+        file header) and ``load_steps`` is updated.
+
+        Returns
+        -------
+        Any
+            The resource id.
+        """
+        if existing := self.find_ext_resource(path):
+            return existing.get("id")
+
+        id = self.allocate_id(path)
+        attrs = {"type": encode_string(type)}
+        if uid:
+            attrs["uid"] = encode_string(uid)
+        attrs["path"] = encode_string(path)
+        attrs["id"] = encode_string(id) if isinstance(id, str) else str(id)
+        tag = SceneTag(
+            "ext_resource", attrs, _header_text("ext_resource", attrs, "\n")
+        )
+
+        previous = self.ext_resources
+        if previous:
+            after = previous[-1]
+            # Keep the run of ext_resources together: the blank line that
+            # followed the last one now follows the new one
+            while _is_blank(after.body[-1] if after.body else None):
+                tag.body.insert(0, after.body.pop())
+        else:
+            after = self.header
+            tag.body.append("\n")
+        if after is None:
+            self.tags.insert(0, tag)
+        else:
+            self._ensure_newline(after)
+            self.tags.insert(self.tags.index(after) + 1, tag)
+        self.update_load_steps()
+        return id
+
+    @staticmethod
+    def _ensure_newline(tag: SceneTag) -> None:
+        if not tag.to_text().endswith("\n"):
+            if tag.body and isinstance(tag.body[-1], SceneProperty):
+                tag.body[-1].suffix += "\n"
+            elif tag.body:
+                tag.body[-1] += "\n"
+            else:
+                tag.tail += "\n"
+                tag.text += "\n"
+
+    def update_load_steps(self) -> bool:
+        """
+        Set the header's ``load_steps`` to the resource count plus one.
+
+        Godot omits it for files without resources.
+
+        Returns
+        -------
+        bool
+            True if the header changed.
+        """
+        if self.header is None:
+            return False
+        steps = len(self.ext_resources) + len(self.sub_resources) + 1
+        return self.header.set_attr(
+            "load_steps", str(steps) if steps > 1 else None, before="format"
+        )
+
+
+def attach_script(doc: SceneDocument, path: str) -> bool:
+    """
+    Attach a script to the root node unless it already has one.
+
+    Parameters
+    ----------
+    doc : SceneDocument
+        Scene to edit.
+    path : str
+        ``res://`` path of the script.
+
+    Returns
+    -------
+    bool
+        True if the scene changed.
+    """
+    root = doc.root
+    if root is None or "script" in root.properties:
+        return False
+    id = doc.add_ext_resource("Script", path)
+    ref = encode_string(id) if isinstance(id, str) else str(id)
+    return root.set_property("script", f"ExtResource({ref})")
+
+
+@dataclass
+class SceneSummary:
+    """What pre-run checks need to know about a scene."""
+
+    root: Optional[str] = None
+    root_type: Optional[str] = None
+    # res:// path of the root node's script
+    root_script: Optional[str] = None
+
+
+def summarize_scene(text: str) -> SceneSummary:
+    """
+    Summarize a scene, parsing only up to the end of its root node.
+
+    Raises
+    ------
+    VariantSyntaxError
+        If a tag header is malformed.
+    """
+    ext: dict[Any, str] = {}
+    for tag in iter_tags(text, _first_tag(text)):
+        if tag.kind == "ext_resource":
+            ext[tag.get("id")] = tag.get("path")
+        elif tag.kind == "node" and "parent" not in tag.attrs:
+            script = None
+            if prop := tag.properties.get("script"):
+                value = prop.value
+                if isinstance(value, GodotCall) and value.args:
+                    script = ext.get(value.args[0])
+            return SceneSummary(tag.get("name"), tag.get("type"), script)
+    return SceneSummary()
+
+
+class SceneIndex:
+    """
+    Persisted scene summaries, valid while a file's mtime and size match.
+
+    Stored in the user cache directory, keyed by absolute path.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or get_cache_dir() / SCENE_INDEX_FILE
+
+    def _read(self) -> dict:
+        data = read_json_file(self.path)
+        return data if isinstance(data, dict) else {}
+
+    def get(self, scene: Path) -> Optional[SceneSummary]:
+        """
+        Summary of a scene, re-parsing it only if it changed.
+
+        Returns
+        -------
+        Optional[SceneSummary]
+            None if the file is missing or not a valid scene.
+        """
+        sig = file_signature(scene)
+        if sig is None:
+            return None
+        key = os.path.abspath(scene)
+        cached = self._read().get(key)
+        if (
+            isinstance(cached, list)
+            and len(cached) == 3
+            and cached[:2] == list(sig)
+        ):
+            try:
+                return SceneSummary(**cached[2])
+            except TypeError:
+                pass
+
+        try:
+            summary = summarize_scene(scene.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError, VariantSyntaxError):
+            return None
+        self.put(scene, summary)
+        return summary
+
+    def put(self, scene: Path, summary: SceneSummary) -> None:
+        """Record a scene's summary for its current mtime and size."""
+        if (sig := file_signature(scene)) is None:
+            return
+        data = self._read()
+        key = os.path.abspath(scene)
+        data.pop(key, None)
+        data[key] = [*sig, asdict(summary)]
+        while len(data) > SCENE_INDEX_LIMIT:
+            data.pop(next(iter(data)))
+        try:
+            write_json_file(self.path, data)
+        except OSError:
+            # Caching is an optimization only
+            pass
@@ -0,0 +1,87 @@
+"""Scene discovery for picking a default main scene."""
+
+from __future__ import annotations
+from collections import deque
+from pathlib import Path
+import os
+from typing import Optional
+
+from ..utils.trace import traced
+
+SCENE_EXTENSION = ".tscn"
+PREFERRED_NAMES = ("main.tscn",)
+
+# Directories that never hold a project's main scene
+SKIP_DIRS = frozenset({".godot", ".import", "addons", "build"})
+
+
+def _scan_dir(path: str) -> tuple[list[str], list[str]]:
+    """Return (scene file names, sub-directory names) of a directory."""
+    scenes: list[str] = []
+    dirs: list[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                name = entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in SKIP_DIRS and not name.startswith("."):
+                            dirs.append(name)
+                    elif name.lower().endswith(SCENE_EXTENSION):
+                        scenes.append(name)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return scenes, dirs
+
+
+def _pick(scenes: list[str]) -> Optional[str]:
+    """Preferred scene of one directory: ``main.tscn``, else first by name."""
+    if not scenes:
+        return None
+    lowered = {s.lower(): s for s in scenes}
+    for name in PREFERRED_NAMES:
+        if name in lowered:
+            return lowered[name]
+    return min(scenes, key=lambda s: (s.lower(), s))
+
+
+@traced("scenes.discover")
+def discover_main_scene(proj: Path) -> Optional[str]:
+    """
+    Find the scene Godot should run by default, without walking the tree.
+
+    Only needed while ``run/main_scene`` is unset; the result is saved
+    there, so it is not cached separately.
+
+    Directories are visited breadth-first in name order and the search
+    stops at the first directory containing a scene, so a root
+    ``main.tscn`` is found after a single ``scandir``. ``.godot``,
+    ``addons``, ``build``, hidden directories and sub-directories with a
+    ``.gdignore`` file (which Godot itself does not import) are skipped.
+
+    Parameters
+    ----------
+    proj : Path
+        Project root.
+
+    Returns
+    -------
+    Optional[str]
+        Scene path relative to the project root in POSIX form, or None if
+        the project has no scenes.
+    """
+    root = os.fspath(proj)
+    queue: deque[str] = deque([""])
+    while queue:
+        rel = queue.popleft()
+        scenes, dirs = _scan_dir(os.path.join(root, rel) if rel else root)
+        if found := _pick(scenes):
+            return f"{rel}/{found}" if rel else found
+
+        for name in sorted(dirs, key=lambda d: (d.lower(), d)):
+            sub = f"{rel}/{name}" if rel else name
+            if not os.path.exists(os.path.join(root, sub, ".gdignore")):
+                queue.append(sub)
+    return None
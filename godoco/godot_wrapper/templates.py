@@ -0,0 +1,409 @@
+"""Project templates: directories or archives rendered into new projects."""
+
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+import hashlib
+import os
+import re
+import shutil
+from typing import Optional
+
+from ..utils.errors import TemplateError
+from ..utils.fs import (
+    FileLock,
+    clone_file,
+    file_signature,
+    read_json_file,
+    write_json_file,
+)
+from ..utils.paths import get_cache_dir, get_data_dir
+from ..utils.trace import span
+
+TEMPLATES_DIR = "templates"
+INDEX_FILE = "index.json"
+# Bump when the index layout changes so old indexes are rebuilt
+INDEX_SCHEMA = 1
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+# Never copied into a new project
+SKIP_NAMES = frozenset({".git", ".godot", ".import"})
+# Larger files are copied verbatim without looking for placeholders
+RENDER_MAX_BYTES = 1024 * 1024
+PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+PLACEHOLDER_BYTES = re.compile(PLACEHOLDER.pattern.encode())
+
+
+@dataclass
+class Template:
+    """An indexed template ready to be materialized."""
+
+    source: Path
+    # Directory the files are copied from (the extracted tree for archives)
+    root: Path
+    dirs: list[str] = field(default_factory=list)
+    # relpath -> [mtime_ns, size, needs rendering, executable]
+    files: dict[str, list] = field(default_factory=dict)
+
+
+@dataclass
+class MaterializeStats:
+    """What ``materialize`` did."""
+
+    rendered: int = 0
+    # Plain files by method ("link", "reflink", "copy")
+    methods: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def files(self) -> int:
+        return self.rendered + sum(self.methods.values())
+
+
+def user_templates_dir() -> Path:
+    """Directory holding named templates (``create -t NAME``)."""
+    return get_data_dir() / TEMPLATES_DIR
+
+
+def is_archive(path: Path) -> bool:
+    """Whether a path names a supported template archive."""
+    return path.name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def resolve_template(spec: str) -> Path:
+    """
+    Find a template by path or by name in ``user_templates_dir()``.
+
+    Raises
+    ------
+    TemplateError
+        If nothing matches.
+    """
+    path = Path(spec).expanduser()
+    if path.exists():
+        return path.resolve()
+
+    base = user_templates_dir()
+    for candidate in [base / spec] + [
+        base / (spec + s) for s in ARCHIVE_SUFFIXES
+    ]:
+        if candidate.exists():
+            return candidate.resolve()
+    raise TemplateError(
+        f"Template not found: {spec} (not a path, nor a template in {base})"
+    )
+
+
+def _scan_tree(
+    root: str, rel: str, dirs: list[str], files: dict[str, os.stat_result]
+) -> None:
+    with os.scandir(os.path.join(root, rel) if rel else root) as it:
+        for entry in it:
+            if entry.name in SKIP_NAMES:
+                continue
+            child = f"{rel}/{entry.name}" if rel else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                dirs.append(child)
+                _scan_tree(root, child, dirs, files)
+            elif entry.is_file():
+                files[child] = entry.stat()
+
+
+def _needs_render(path: str, size: int) -> bool:
+    if size > RENDER_MAX_BYTES:
+        return False
+    with open(path, "rb") as f:
+        data = f.read()
+    if not PLACEHOLDER_BYTES.search(data):
+        return False
+    try:
+        data.decode("utf-8")
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def index_tree(
+    root: Path, previous: Optional[dict[str, list]] = None
+) -> tuple[list[str], dict[str, list]]:
+    """
+    List a template tree and find the files containing placeholders.
+
+    Files whose mtime and size match their ``previous`` entry are not
+    read again, so re-indexing an unchanged tree costs one ``stat`` per
+    file.
+
+    Parameters
+    ----------
+    root : Path
+        Template root.
+    previous : Optional[dict[str, list]]
+        Files of an earlier index of the same tree.
+
+    Returns
+    -------
+    tuple[list[str], dict[str, list]]
+        Sorted directories and ``relpath -> [mtime_ns, size, render,
+        executable]``.
+    """
+    previous = previous or {}
+    dirs: list[str] = []
+    stats: dict[str, os.stat_result] = {}
+    _scan_tree(os.fspath(root), "", dirs, stats)
+
+    files = {}
+    for rel, st in sorted(stats.items()):
+        old = previous.get(rel)
+        if old and old[0] == st.st_mtime_ns and old[1] == st.st_size:
+            render = old[2]
+        else:
+            render = _needs_render(os.path.join(root, rel), st.st_size)
+        files[rel] = [
+            st.st_mtime_ns,
+            st.st_size,
+            render,
+            bool(st.st_mode & 0o111),
+        ]
+    return sorted(dirs), files
+
+
+def _extract(archive: Path, dest: Path) -> None:
+    """Unpack an archive, refusing members that escape ``dest``."""
+    if archive.name.lower().endswith(".zip"):
+        import zipfile
+
+        with zipfile.ZipFile(archive) as zf:
+            base = dest.resolve()
+            for name in zf.namelist():
+                target = (base / name).resolve()
+                if target != base and base not in target.parents:
+                    raise TemplateError(f"{archive}: unsafe member {name!r}")
+            zf.extractall(dest)
+    else:
+        import tarfile
+
+        with tarfile.open(archive) as tf:
+            try:
+                tf.extractall(dest, filter="data")
+            except tarfile.FilterError as e:
+                raise TemplateError(f"{archive}: {e}") from e
+
+
+def _tree_root(tree: Path) -> Path:
+    """Skip a single top-level folder, as most archives have one."""
+    entries = [e for e in tree.iterdir() if e.name not in SKIP_NAMES]
+    if len(entries) == 1 and entries[0].is_dir():
+        return entries[0]
+    return tree
+
+
+def _load_archive(source: Path, slot: Path, refresh: bool) -> Template:
+    sig = file_signature(source)
+    if sig is None:
+        raise TemplateError(f"Cannot read template {source}")
+
+    index_path = slot / INDEX_FILE
+    with FileLock(slot / ".lock"):
+        index = None if refresh else read_json_file(index_path)
+        if (
+            isinstance(index, dict)
+            and index.get("schema") == INDEX_SCHEMA
+            and index.get("signature") == list(sig)
+            and (slot / index["root"]).is_dir()
+        ):
+            return Template(
+                source, slot / index["root"], index["dirs"], index["files"]
+            )
+
+        tree, staging = slot / "tree", slot / f"tree.{os.getpid()}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        try:
+            with span("template.extract", archive=str(source)):
+                _extract(source, staging)
+        except Exception as e:
+            shutil.rmtree(staging, ignore_errors=True)
+            if isinstance(e, TemplateError):
+                raise
+            # zipfile and tarfile raise assorted types for corrupt archives
+            raise TemplateError(f"Cannot extract {source}: {e}") from e
+        shutil.rmtree(tree, ignore_errors=True)
+        os.replace(staging, tree)
+
+        root = _tree_root(tree)
+        dirs, files = index_tree(root)
+        write_json_file(
+            index_path,
+            {
+                "schema": INDEX_SCHEMA,
+                "source": str(source),
+                "signature": list(sig),
+                "root": root.relative_to(slot).as_posix(),
+                "dirs": dirs,
+                "files": files,
+            },
+        )
+        return Template(source, root, dirs, files)
+
+
+def _load_directory(source: Path, slot: Path, refresh: bool) -> Template:
+    index_path = slot / INDEX_FILE
+    index = None if refresh else read_json_file(index_path)
+    previous = None
+    if isinstance(index, dict) and index.get("schema") == INDEX_SCHEMA:
+        previous = index.get("files")
+
+    dirs, files = index_tree(source, previous)
+    if files != previous:
+        try:
+            write_json_file(
+                index_path,
+                {
+                    "schema": INDEX_SCHEMA,
+                    "source": str(source),
+                    "files": files,
+                },
+            )
+        except OSError:
+            pass
+    return Template(source, source, dirs, files)
+
+
+def load_template(spec: str, refresh: bool = False) -> Template:
+    """
+    Load a template, served from the local cache when possible.
+
+    Archives are extracted once into the cache and re-extracted only when
+    the archive changes. Directories are used in place; their index only
+    saves re-reading unchanged files for placeholders.
+
+    Parameters
+    ----------
+    spec : str
+        Template path (directory or archive) or name.
+    refresh : bool
+        Ignore cached extractions and indexes.
+
+    Returns
+    -------
+    Template
+        Indexed template.
+
+    Raises
+    ------
+    TemplateError
+        If the template cannot be found or unpacked.
+    """
+    source = resolve_template(spec)
+    key = hashlib.sha256(str(source).encode()).hexdigest()[:16]
+    slot = get_cache_dir() / TEMPLATES_DIR / key
+
+    with span("template.load", template=str(source)):
+        if source.is_dir():
+            return _load_directory(source, slot, refresh)
+        if not is_archive(source):
+            raise TemplateError(
+                f"Unsupported template {source}: expected a directory or "
+                f"one of {', '.join(ARCHIVE_SUFFIXES)}"
+            )
+        return _load_archive(source, slot, refresh)
+
+
+def render_text(text: str, variables: dict[str, str], origin: str) -> str:
+    """
+    Replace ``{{ name }}`` placeholders.
+
+    Raises
+    ------
+    TemplateError
+        If a placeholder names an unknown variable.
+    """
+
+    def value(match: re.Match) -> str:
+        try:
+            return variables[match.group(1)]
+        except KeyError:
+            raise TemplateError(
+                f"{origin}: unknown template variable '{match.group(1)}'"
+            ) from None
+
+    return PLACEHOLDER.sub(value, text)
+
+
+def _render_file(src: str, dst: str, variables: dict[str, str], rel: str):
+    with open(src, encoding="utf-8", newline="") as f:
+        text = render_text(f.read(), variables, rel)
+    with open(dst, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+
+
+def materialize(
+    template: Template,
+    dest: Path,
+    variables: dict[str, str],
+    link: bool = False,
+    workers: Optional[int] = None,
+) -> MaterializeStats:
+    """
+    Write a template's files into ``dest``.
+
+    Paths and files containing placeholders are rendered; every other
+    file is cloned (hard link if ``link``, else reflink, else copy) on a
+    thread pool, so large templates are bound by the filesystem.
+
+    Parameters
+    ----------
+    template : Template
+        Loaded template.
+    dest : Path
+        Existing destination directory.
+    variables : dict[str, str]
+        Placeholder values.
+    link : bool
+        Hard link plain files to the template (shares their content).
+    workers : Optional[int]
+        Copy threads (default: scaled from the CPU count).
+
+    Returns
+    -------
+    MaterializeStats
+        Counts by method.
+
+    Raises
+    ------
+    TemplateError
+        If a placeholder names an unknown variable.
+    """
+
+    def target(rel: str) -> str:
+        if "{{" in rel:
+            rel = render_text(rel, variables, rel)
+        return os.path.join(dest, rel)
+
+    stats = MaterializeStats()
+    with span("template.materialize", files=len(template.files)):
+        for rel in template.dirs:
+            os.makedirs(target(rel), exist_ok=True)
+
+        root = os.fspath(template.root)
+        plain, executable = [], []
+        for rel, (_, _, render, is_exec) in template.files.items():
+            src, dst = os.path.join(root, rel), target(rel)
+            if render:
+                _render_file(src, dst, variables, rel)
+                stats.rendered += 1
+            else:
+                plain.append((src, dst))
+            if is_exec:
+                executable.append(dst)
+
+        workers = workers or min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for method in pool.map(
+                lambda job: clone_file(*job, link=link), plain
+            ):
+                stats.methods[method] = stats.methods.get(method, 0) + 1
+
+        for dst in executable:
+            if not os.path.islink(dst):
+                os.chmod(dst, os.stat(dst).st_mode | 0o111)
+    return stats
@@ -0,0 +1,446 @@
+"""Sharded GDScript test runner with JUnit output."""
+
+from __future__ import annotations
+import asyncio
+from dataclasses import dataclass, field
+from pathlib import Path
+import json
+import os
+from typing import Callable, Optional
+import xml.etree.ElementTree as ET
+
+from .process import run_process
+from .workers import is_main_loop_script
+from .wrapper import GodotWrapper
+from ..utils.fs import (
+    atomic_write_text,
+    read_json_file,
+    write_cached_script,
+    write_json_file,
+)
+from ..utils.paths import make_godot_path_relative
+
+RUNNER_SCRIPT_FILE = "godoco_test_runner.gd"
+TIMINGS_FILE = "godoco-test-timings.json"
+MARK = "@@godoco-test:"
+# Assumed duration of a test file without history
+DEFAULT_TEST_SECONDS = 1.0
+SKIP_DIRS = frozenset({"addons", "build"})
+
+# Runs every ``test*`` method of each script given with --godoco-test.
+# A test fails if it returns false or a non-zero int, or if Godot reports
+# a script error while it runs.
+RUNNER_SCRIPT = """extends SceneTree
+# godoco test runner: runs the test* methods of the given scripts.
+
+const MARK := "@@godoco-test:"
+
+
+func _initialize() -> void:
+	for arg in OS.get_cmdline_user_args():
+		if arg.begins_with("--godoco-test="):
+			run_file(arg.substr(arg.find("=") + 1))
+	quit(0)
+
+
+func report(data: Dictionary) -> void:
+	print(MARK + JSON.stringify(data))
+
+
+func run_file(path: String) -> void:
+	report({"event": "file", "file": path})
+	var script = ResourceLoader.load(path, "", ResourceLoader.CACHE_MODE_REPLACE)
+	if not script is Script or not script.can_instantiate():
+		report({"event": "case", "file": path, "name": "load", "status": "error", "ms": 0.0, "message": "cannot load script"})
+		return
+	var names := []
+	for method in script.get_script_method_list():
+		if method.name.begins_with("test") and not names.has(method.name):
+			names.append(method.name)
+	for name in names:
+		var obj = script.new()
+		if obj.has_method("before_each"):
+			obj.before_each()
+		report({"event": "start", "file": path, "name": name})
+		var start := Time.get_ticks_usec()
+		var result = obj.call(name)
+		var ms := (Time.get_ticks_usec() - start) / 1000.0
+		var failed: bool = (result is bool and not result) or (result is int and result != 0)
+		var message := ("returned " + str(result)) if failed else ""
+		report({"event": "case", "file": path, "name": name, "status": "fail" if failed else "pass", "ms": ms, "message": message})
+		if obj.has_method("after_each"):
+			obj.after_each()
+		if obj is Node:
+			obj.free()
+"""
+
+
+@dataclass
+class TestCase:
+    """Result of one test method (or of a whole main-loop test script)."""
+
+    file: str
+    name: str
+    status: str
+    seconds: float = 0.0
+    message: str = ""
+    output: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "pass"
+
+
+@dataclass
+class TestFile:
+    """Results of one test script."""
+
+    file: str
+    cases: list[TestCase] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(c.ok for c in self.cases)
+
+
+def runner_script_path() -> Path:
+    """Write the runner GDScript to the cache dir (if needed) and return it."""
+    return write_cached_script(RUNNER_SCRIPT_FILE, RUNNER_SCRIPT)
+
+
+def is_test_file(name: str) -> bool:
+    """``test_*.gd`` or ``*_test.gd``."""
+    return name.endswith(".gd") and (
+        name.startswith("test_") or name.endswith("_test.gd")
+    )
+
+
+def discover_tests(
+    proj: Path, paths: Optional[list[Path]] = None
+) -> list[Path]:
+    """
+    Find test scripts.
+
+    Parameters
+    ----------
+    proj : Path
+        Project root.
+    paths : Optional[list[Path]]
+        Files and folders to search (default: the whole project). Files
+        are taken as given; folders are searched recursively, skipping
+        hidden folders, ``addons``, ``build`` and ``.gdignore``'d ones.
+
+    Returns
+    -------
+    list[Path]
+        Test scripts, sorted.
+    """
+    found: set[Path] = set()
+    for base in paths or [proj]:
+        if base.is_file():
+            found.add(base.resolve())
+            continue
+        for root, dirs, files in os.walk(base):
+            dirs[:] = [
+                d
+                for d in dirs
+                if not d.startswith(".")
+                and d not in SKIP_DIRS
+                and not os.path.exists(os.path.join(root, d, ".gdignore"))
+            ]
+            found.update(
+                Path(root, f).resolve() for f in files if is_test_file(f)
+            )
+    return sorted(found)
+
+
+class TimingHistory:
+    """
+    Last known duration of each test file, kept in the project's ``.godot``.
+    """
+
+    def __init__(self, proj: Path):
+        self.path = proj / ".godot" / TIMINGS_FILE
+        data = read_json_file(self.path)
+        self.timings: dict[str, float] = data if isinstance(data, dict) else {}
+
+    def estimate(self, file: str) -> float:
+        """Expected duration; the mean of known files if it never ran."""
+        if file in self.timings:
+            return self.timings[file]
+        if self.timings:
+            return sum(self.timings.values()) / len(self.timings)
+        return DEFAULT_TEST_SECONDS
+
+    def update(self, files: list[TestFile]) -> None:
+        """Record new durations and save."""
+        for f in files:
+            self.timings[f.file] = round(f.seconds, 4)
+        try:
+            write_json_file(self.path, self.timings)
+        except OSError:
+            pass
+
+
+def plan_shards(
+    files: list[str], shards: int, estimate: Callable[[str], float]
+) -> list[list[str]]:
+    """
+    Split files into shards of similar total duration.
+
+    Longest-processing-time-first: files are taken from longest to
+    shortest and each goes to the currently lightest shard, which keeps
+    the slowest shard close to ``total / shards``.
+
+    Parameters
+    ----------
+    files : list[str]
+        Test files.
+    shards : int
+        Number of shards.
+    estimate : Callable[[str], float]
+        Expected duration of a file.
+
+    Returns
+    -------
+    list[list[str]]
+        Non-empty shards, each ordered longest first.
+    """
+    buckets: list[list[str]] = [[] for _ in range(max(1, shards))]
+    loads = [0.0] * len(buckets)
+    for f in sorted(files, key=lambda f: (-estimate(f), f)):
+        i = loads.index(min(loads))
+        buckets[i].append(f)
+        loads[i] += estimate(f)
+    return [b for b in buckets if b]
+
+
+class _ShardCollector:
+    """Turns runner output into TestFile results."""
+
+    def __init__(self, files: list[str]):
+        self.files = {f: TestFile(f) for f in files}
+        self.started: set[str] = set()
+        self.current: Optional[TestCase] = None
+        self.output: list[str] = []
+
+    def line(self, line: str) -> None:
+        if not line.startswith(MARK):
+            self.output.append(line)
+            return
+        try:
+            event = json.loads(line[len(MARK) :])
+        except ValueError:
+            return
+        kind = event.get("event")
+        if kind == "file":
+            self.started.add(event["file"])
+        elif kind == "start":
+            self.output = []
+            self.current = TestCase(event["file"], event["name"], "running")
+        elif kind == "case":
+            case = TestCase(
+                event["file"],
+                event["name"],
+                event.get("status", "error"),
+                float(event.get("ms", 0.0)) / 1000,
+                event.get("message", ""),
+                self.output,
+            )
+            if case.ok and any("SCRIPT ERROR" in o for o in case.output):
+                case.status = "error"
+                case.message = "script error"
+            self.files[case.file].cases.append(case)
+            self.current = None
+            self.output = []
+
+    def finish(self, returncode: int, timed_out: bool) -> list[TestFile]:
+        """Account for tests cut short by a crash or timeout."""
+        reason = (
+            "timed out" if timed_out else f"Godot exited with code {returncode}"
+        )
+        if self.current is not None:
+            self.current.status = "error"
+            self.current.message = reason
+            self.current.output = self.output
+            self.files[self.current.file].cases.append(self.current)
+        for f in self.files.values():
+            if f.file not in self.started:
+                f.cases.append(TestCase(f.file, "run", "error", 0.0, reason))
+            f.seconds = sum(c.seconds for c in f.cases)
+        return list(self.files.values())
+
+
+async def run_shard(
+    wrapper: GodotWrapper,
+    proj: Path,
+    files: list[str],
+    timeout: Optional[float] = None,
+) -> list[TestFile]:
+    """Run a shard of method-style test files in one headless Godot."""
+    collector = _ShardCollector(files)
+    result = await run_process(
+        wrapper.headless_cmd(
+            proj,
+            runner_script_path(),
+            [f"--godoco-test={f}" for f in files],
+        ),
+        timeout=timeout,
+        on_stdout=collector.line,
+        merge_stderr=True,
+    )
+    return collector.finish(result.returncode, result.timed_out)
+
+
+async def run_main_loop_test(
+    wrapper: GodotWrapper,
+    proj: Path,
+    file: str,
+    script: Path,
+    timeout: Optional[float] = None,
+) -> list[TestFile]:
+    """Run an ``extends SceneTree`` test script; its exit code decides."""
+    lines: list[str] = []
+    result = await run_process(
+        wrapper.headless_cmd(proj, script),
+        timeout=timeout,
+        on_stdout=lines.append,
+        merge_stderr=True,
+    )
+    if result.ok:
+        status, message = "pass", ""
+    elif result.timed_out:
+        status, message = "error", "timed out"
+    else:
+        status, message = "fail", f"exit code {result.returncode}"
+    case = TestCase(file, "run", status, result.wall_seconds, message, lines)
+    return [TestFile(file, [case], result.wall_seconds)]
+
+
+def run_tests(
+    wrapper: GodotWrapper,
+    proj: Path,
+    scripts: list[Path],
+    shards: int,
+    timeout: Optional[float] = None,
+    on_file: Optional[Callable[[TestFile], None]] = None,
+) -> list[TestFile]:
+    """
+    Run test scripts across concurrent headless Godot processes.
+
+    Method-style test files are packed into ``shards`` processes using
+    the project's timing history; main-loop scripts get their own
+    process. All processes share one concurrency limit of ``shards``.
+    Durations are written back to the history afterwards.
+
+    Parameters
+    ----------
+    wrapper : GodotWrapper
+        Godot to run.
+    proj : Path
+        Project root.
+    scripts : list[Path]
+        Test scripts (see ``discover_tests``).
+    shards : int
+        Concurrent Godot processes.
+    timeout : Optional[float]
+        Timeout per process in seconds.
+    on_file : Optional[Callable[[TestFile], None]]
+        Called with each file's results as its process finishes.
+
+    Returns
+    -------
+    list[TestFile]
+        Results sorted by file.
+    """
+    root = proj.resolve()
+    by_name = {make_godot_path_relative(root, s): s for s in scripts}
+    main_loop = [n for n, s in by_name.items() if is_main_loop_script(s)]
+    methods = [n for n in by_name if n not in main_loop]
+
+    history = TimingHistory(proj)
+    plan = plan_shards(methods, shards, history.estimate)
+    # Whole main-loop scripts are scheduled like shards, longest first
+    jobs = [(sum(map(history.estimate, s)), "shard", s) for s in plan]
+    jobs += [(history.estimate(f), "main", [f]) for f in main_loop]
+    jobs.sort(key=lambda j: -j[0])
+
+    async def main() -> list[TestFile]:
+        sem = asyncio.Semaphore(max(1, shards))
+
+        async def run(kind: str, files: list[str]) -> list[TestFile]:
+            async with sem:
+                if kind == "shard":
+                    done = await run_shard(wrapper, proj, files, timeout)
+                else:
+                    done = await run_main_loop_test(
+                        wrapper, proj, files[0], by_name[files[0]], timeout
+                    )
+            if on_file:
+                for f in done:
+                    on_file(f)
+            return done
+
+        batches = await asyncio.gather(*(run(k, f) for _, k, f in jobs))
+        return [f for batch in batches for f in batch]
+
+    results = sorted(asyncio.run(main()), key=lambda f: f.file)
+    history.update(results)
+    return results
+
+
+def write_junit(files: list[TestFile], path: Path, suite: str) -> None:
+    """
+    Write results as JUnit XML, one ``<testsuite>`` per test file.
+
+    Parameters
+    ----------
+    files : list[TestFile]
+        Results.
+    path : Path
+        Output file.
+    suite : str
+        Name of the top-level ``<testsuites>`` element.
+    """
+    root = ET.Element("testsuites", name=suite)
+    totals = {"tests": 0, "failures": 0, "errors": 0}
+    for f in files:
+        failures = sum(c.status == "fail" for c in f.cases)
+        errors = sum(c.status == "error" for c in f.cases)
+        totals["tests"] += len(f.cases)
+        totals["failures"] += failures
+        totals["errors"] += errors
+        ts = ET.SubElement(
+            root,
+            "testsuite",
+            name=f.file,
+            tests=str(len(f.cases)),
+            failures=str(failures),
+            errors=str(errors),
+            time=f"{f.seconds:.4f}",
+        )
+        for c in f.cases:
+            tc = ET.SubElement(
+                ts,
+                "testcase",
+                classname=f.file,
+                name=c.name,
+                time=f"{c.seconds:.4f}",
+            )
+            if c.status in ("fail", "error"):
+                tag = "failure" if c.status == "fail" else "error"
+                ET.SubElement(tc, tag, message=c.message).text = c.message
+            if c.output:
+                ET.SubElement(tc, "system-out").text = "\n".join(c.output)
+    for k, v in totals.items():
+        root.set(k, str(v))
+    root.set("time", f"{sum(f.seconds for f in files):.4f}")
+
+    ET.indent(root)
+    atomic_write_text(
+        path,
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        + ET.tostring(root, encoding="unicode")
+        + "\n",
+    )
@@ -0,0 +1,354 @@
+"""Godot Variant text format (as used by project.godot, .tscn and .tres)."""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+import math
+import re
+from typing import Any
+
+NUMBER = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+WHITESPACE = " \t\r\n"
+ESCAPES = {
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+    "b": "\b",
+    "f": "\f",
+    '"': '"',
+    "'": "'",
+    "\\": "\\",
+}
+ENCODE_ESCAPES = {"\\": "\\\\", '"': '\\"'}
+
+
+class StringName(str):
+    """A ``&"name"`` literal."""
+
+
+class NodePath(str):
+    """A ``^"path"`` literal."""
+
+
+@dataclass
+class GodotCall:
+    """
+    Constructor-style literal, e.g. ``Vector2(1, 2)`` or ``ExtResource("1")``.
+
+    ``Object(...)`` arguments of the form ``"key": value`` are kept as
+    ``(key, value)`` tuples.
+    """
+
+    name: str
+    args: list[Any] = field(default_factory=list)
+
+
+@dataclass
+class RawVariant:
+    """Text the parser could not interpret; written back unchanged."""
+
+    text: str
+
+
+class VariantSyntaxError(ValueError):
+    """Raised on malformed Variant text."""
+
+
+class _Parser:
+    """Recursive-descent parser over a string, starting at an offset."""
+
+    def __init__(self, text: str, pos: int = 0):
+        self.text = text
+        self.pos = pos
+
+    def error(self, msg: str) -> VariantSyntaxError:
+        line = self.text.count("\n", 0, self.pos) + 1
+        return VariantSyntaxError(f"{msg} at line {line}")
+
+    def skip_ws(self) -> None:
+        text, n = self.text, len(self.text)
+        while self.pos < n and text[self.pos] in WHITESPACE:
+            self.pos += 1
+
+    def peek(self) -> str:
+        self.skip_ws()
+        return self.text[self.pos] if self.pos < len(self.text) else ""
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise self.error(f"Expected {ch!r}")
+        self.pos += 1
+
+    def string(self) -> str:
+        # Assumes self.text[self.pos] == '"'
+        text, n = self.text, len(self.text)
+        self.pos += 1
+        start = self.pos
+        # Fast path: no escapes
+        end = text.find('"', start)
+        if end != -1 and text.find("\\", start, end) == -1:
+            self.pos = end + 1
+            return text[start:end]
+
+        out = []
+        while self.pos < n:
+            ch = text[self.pos]
+            if ch == '"':
+                self.pos += 1
+                return "".join(out)
+            if ch == "\\" and self.pos + 1 < n:
+                esc = text[self.pos + 1]
+                if esc == "u" and self.pos + 6 <= n:
+                    out.append(chr(int(text[self.pos + 2 : self.pos + 6], 16)))
+                    self.pos += 6
+                    continue
+                out.append(ESCAPES.get(esc, esc))
+                self.pos += 2
+                continue
+            out.append(ch)
+            self.pos += 1
+        raise self.error("Unterminated string")
+
+    def value(self) -> Any:
+        ch = self.peek()
+        if not ch:
+            raise self.error("Expected value")
+
+        if ch == '"':
+            return self.string()
+        if ch in "&^" and self.text.startswith('"', self.pos + 1):
+            self.pos += 1
+            s = self.string()
+            return StringName(s) if ch == "&" else NodePath(s)
+        if ch == "[":
+            self.pos += 1
+            return self.sequence("]")
+        if ch == "{":
+            return self.dictionary()
+        if ch in "+-.0123456789":
+            m = NUMBER.match(self.text, self.pos)
+            if not m:
+                raise self.error("Malformed number")
+            self.pos = m.end()
+            lit = m.group()
+            if any(c in lit for c in ".eE"):
+                return float(lit)
+            return int(lit)
+
+        m = IDENTIFIER.match(self.text, self.pos)
+        if not m:
+            raise self.error(f"Unexpected character {ch!r}")
+        self.pos = m.end()
+        word = m.group()
+        if word == "true":
+            return True
+        if word == "false":
+            return False
+        if word in ("null", "nil"):
+            return None
+        if word == "inf":
+            return math.inf
+        if word == "inf_neg":
+            return -math.inf
+        if word == "nan":
+            return math.nan
+        end = self.pos
+        if self.peek() == "(":
+            self.pos += 1
+            return GodotCall(word, self.sequence(")", keyed=True))
+        # Bare identifiers only appear as Object() class names
+        self.pos = end
+        return word
+
+    def sequence(self, close: str, keyed: bool = False) -> list[Any]:
+        items = []
+        while True:
+            if self.peek() == close:
+                self.pos += 1
+                return items
+            item = self.value()
+            if keyed and self.peek() == ":":
+                self.pos += 1
+                item = (item, self.value())
+            items.append(item)
+            ch = self.peek()
+            if ch == ",":
+                self.pos += 1
+            elif ch != close:
+                raise self.error(f"Expected ',' or {close!r}")
+
+    def dictionary(self) -> dict:
+        self.expect("{")
+        result = {}
+        while True:
+            if self.peek() == "}":
+                self.pos += 1
+                return result
+            key = self.value()
+            self.expect(":")
+            result[_hashable(key)] = self.value()
+            ch = self.peek()
+            if ch == ",":
+                self.pos += 1
+            elif ch != "}":
+                raise self.error("Expected ',' or '}'")
+
+
+def _hashable(key: Any) -> Any:
+    """Dictionary keys may be arrays or constructors; make them hashable."""
+    if isinstance(key, list):
+        return tuple(_hashable(k) for k in key)
+    if isinstance(key, GodotCall):
+        return (key.name, tuple(_hashable(a) for a in key.args))
+    return key
+
+
+def parse_variant_at(text: str, pos: int = 0) -> tuple[Any, int]:
+    """
+    Parse one Variant literal starting at an offset.
+
+    Parameters
+    ----------
+    text : str
+        Source text.
+    pos : int
+        Offset where the value starts (leading whitespace allowed).
+
+    Returns
+    -------
+    tuple[Any, int]
+        Parsed value and the offset just past it.
+
+    Raises
+    ------
+    VariantSyntaxError
+        If the text is not a valid literal.
+    """
+    p = _Parser(text, pos)
+    value = p.value()
+    return value, p.pos
+
+
+def parse_variant(text: str) -> Any:
+    """
+    Parse a complete Variant literal.
+
+    Parameters
+    ----------
+    text : str
+        Literal text, e.g. ``PackedStringArray("4.3", "Mobile")``.
+
+    Returns
+    -------
+    Any
+        Python value: str, int, float, bool, None, list, dict,
+        StringName, NodePath or GodotCall.
+    """
+    value, end = parse_variant_at(text)
+    if text[end:].strip():
+        raise VariantSyntaxError(f"Trailing data after value: {text[end:]!r}")
+    return value
+
+
+def skip_variant(text: str, pos: int) -> int:
+    """
+    Find the end of a value without interpreting it.
+
+    Tracks brackets and strings, stopping at the first newline outside
+    both. Used as a fallback for literals the parser does not understand.
+
+    Parameters
+    ----------
+    text : str
+        Source text.
+    pos : int
+        Offset where the value starts.
+
+    Returns
+    -------
+    int
+        Offset of the terminating newline (or end of text).
+    """
+    depth = 0
+    in_string = False
+    n = len(text)
+    i = pos
+    while i < n:
+        ch = text[i]
+        if in_string:
+            if ch == "\\":
+                i += 1
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+        elif ch == "\n" and depth <= 0:
+            return i
+        i += 1
+    return n
+
+
+def encode_string(s: str) -> str:
+    """Quote a string the way Godot writes it."""
+    return '"' + "".join(ENCODE_ESCAPES.get(c, c) for c in s) + '"'
+
+
+def encode_variant(value: Any) -> str:
+    """
+    Serialize a Python value as Godot Variant text.
+
+    Parameters
+    ----------
+    value : Any
+        Value as returned by ``parse_variant``.
+
+    Returns
+    -------
+    str
+        Literal text, e.g. ``PackedStringArray("4.3", "Mobile")``.
+    """
+    if isinstance(value, RawVariant):
+        return value.text
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, StringName):
+        return "&" + encode_string(value)
+    if isinstance(value, NodePath):
+        return "^" + encode_string(value)
+    if isinstance(value, str):
+        return encode_string(value)
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "nan"
+        if math.isinf(value):
+            return "inf" if value > 0 else "inf_neg"
+        return repr(value)
+    if isinstance(value, GodotCall):
+        args = ", ".join(
+            f"{encode_variant(a[0])}: {encode_variant(a[1])}"
+            if isinstance(a, tuple)
+            else encode_variant(a)
+            for a in value.args
+        )
+        return f"{value.name}({args})"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(encode_variant(v) for v in value) + "]"
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        items = ",\n".join(
+            f"{encode_variant(k)}: {encode_variant(v)}"
+            for k, v in value.items()
+        )
+        return "{\n" + items + "\n}"
+    raise TypeError(f"Cannot encode {type(value).__name__} as a Variant")
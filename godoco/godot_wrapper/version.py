@@ -0,0 +1,248 @@
+"""Godot version probing with a persistent cache."""
+
+from __future__ import annotations
+from dataclasses import dataclass, asdict
+from pathlib import Path
+import hashlib
+import os
+import re
+import subprocess
+import time
+from typing import Optional
+
+from ..utils.errors import GodotVersionError
+from ..utils.fs import file_signature, read_json_file, write_json_file
+from ..utils.paths import get_cache_dir
+
+VERSION_CACHE_FILE = "godot-versions.json"
+PROBE_TIMEOUT = 5
+
+# "4.3.stable.official.77dcf97d8", "v4.2.2.stable.mono.official.15073afe3",
+# "4.4.dev3.custom_build"
+VERSION_PATTERN = re.compile(
+    r"v?(?P<major>\d+)\.(?P<minor>\d+)(?:\.(?P<patch>\d+))?"
+    r"\.(?P<status>[a-z]+\d*)"
+    r"(?:\.(?P<build>[a-z_][\w.]*?))?"
+    r"(?:\.(?P<hash>[0-9a-f]{7,40}))?(?=\s|$)"
+)
+
+
+@dataclass(frozen=True)
+class GodotVersion:
+    """Structured Godot version as printed by ``godot --version``."""
+
+    major: int
+    minor: int
+    patch: int = 0
+    status: str = "stable"
+    build: str = ""
+    hash: str = ""
+
+    @property
+    def short(self) -> str:
+        """Major.minor, as used in ``config/features`` (e.g. "4.3")."""
+        return f"{self.major}.{self.minor}"
+
+    @property
+    def number(self) -> str:
+        """Version number without status, patch omitted when zero."""
+        patch = f".{self.patch}" if self.patch else ""
+        return f"{self.major}.{self.minor}{patch}"
+
+    def __str__(self) -> str:
+        parts = [self.number, self.status]
+        if self.build:
+            parts.append(self.build)
+        if self.hash:
+            parts.append(self.hash)
+        return ".".join(parts)
+
+
+def parse_godot_version(output: str) -> Optional[GodotVersion]:
+    """
+    Parse ``godot --version`` output.
+
+    Parameters
+    ----------
+    output : str
+        Raw stdout; warnings printed before the version are ignored.
+
+    Returns
+    -------
+    Optional[GodotVersion]
+        Parsed version, or None if no version string was found.
+    """
+    for line in reversed(output.strip().splitlines()):
+        if m := VERSION_PATTERN.search(line.strip()):
+            return GodotVersion(
+                major=int(m["major"]),
+                minor=int(m["minor"]),
+                patch=int(m["patch"] or 0),
+                status=m["status"],
+                build=m["build"] or "",
+                hash=m["hash"] or "",
+            )
+    return None
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's content."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class VersionCache:
+    """
+    On-disk cache of ``godot --version`` probe results.
+
+    Entries are keyed by executable path and valid while size and mtime
+    match; a content hash is stored and compared when verification is
+    requested. Failed probes are cached too, so a broken binary is not
+    re-spawned on every call.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or get_cache_dir() / VERSION_CACHE_FILE
+
+    def _read(self) -> dict:
+        data = read_json_file(self.path)
+        return data if isinstance(data, dict) else {}
+
+    def get(self, exe: Path, verify: bool = False) -> Optional[dict]:
+        """
+        Get the cached probe record for an executable.
+
+        Parameters
+        ----------
+        exe : Path
+            Godot executable.
+        verify : bool
+            Also compare the content hash (reads the whole binary).
+
+        Returns
+        -------
+        Optional[dict]
+            Record with either ``version`` or ``error``, or None on miss.
+        """
+        sig = file_signature(exe)
+        if sig is None:
+            return None
+
+        record = self._read().get(os.path.abspath(exe))
+        if not isinstance(record, dict):
+            return None
+        if (record.get("mtime_ns"), record.get("size")) != sig:
+            return None
+        if verify and record.get("sha256") != hash_file(exe):
+            return None
+        return record
+
+    def put(self, exe: Path, record: dict) -> None:
+        """Store a probe record for an executable."""
+        data = self._read()
+        data[os.path.abspath(exe)] = record
+        try:
+            write_json_file(self.path, data)
+        except OSError:
+            pass
+
+
+def cached_godot_version(exe: Path) -> Optional[GodotVersion]:
+    """
+    Get a previously probed version without spawning Godot.
+
+    Parameters
+    ----------
+    exe : Path
+        Godot executable.
+
+    Returns
+    -------
+    Optional[GodotVersion]
+        Cached version, or None if unknown or the last probe failed.
+    """
+    record = VersionCache().get(exe)
+    if record and record.get("version"):
+        return GodotVersion(**record["version"])
+    return None
+
+
+def probe_godot_version(
+    exe: Path,
+    verify: bool = False,
+    refresh: bool = False,
+    cache: Optional[VersionCache] = None,
+) -> GodotVersion:
+    """
+    Get the version of a Godot executable, spawning it only on cache miss.
+
+    Parameters
+    ----------
+    exe : Path
+        Godot executable.
+    verify : bool
+        Key the cache on the binary's content hash as well.
+    refresh : bool
+        Ignore cached results, including cached failures.
+    cache : Optional[VersionCache]
+        Cache to use (defaults to the user cache).
+
+    Returns
+    -------
+    GodotVersion
+        Detected version.
+
+    Raises
+    ------
+    GodotVersionError
+        If Godot cannot be run or its output cannot be parsed.
+    """
+    cache = cache or VersionCache()
+    if not refresh and (record := cache.get(exe, verify)):
+        if record.get("version"):
+            return GodotVersion(**record["version"])
+        raise GodotVersionError(record.get("error", "Unknown probe error"))
+
+    sig = file_signature(exe)
+    if sig is None:
+        raise GodotVersionError(f"Godot executable not found: {exe}")
+
+    record = {
+        "mtime_ns": sig[0],
+        "size": sig[1],
+        "sha256": hash_file(exe) if verify else None,
+        "probed_at": time.time(),
+    }
+    try:
+        result = subprocess.run(
+            [str(exe), "--version"],
+            capture_output=True,
+            text=True,
+            timeout=PROBE_TIMEOUT,
+            check=False,
+        )
+        version = parse_godot_version(result.stdout)
+        if version is None:
+            output = result.stdout.strip() or result.stderr.strip()
+            error = (
+                f"Unrecognized output from '{exe} --version': "
+                f"{output[:200]!r} (exit code {result.returncode})"
+            )
+    except subprocess.TimeoutExpired:
+        version = None
+        error = f"'{exe} --version' timed out after {PROBE_TIMEOUT}s"
+    except OSError as e:
+        version = None
+        error = f"Could not run '{exe}': {e}"
+
+    if version is None:
+        record["error"] = error
+        cache.put(exe, record)
+        raise GodotVersionError(error)
+
+    record["version"] = asdict(version)
+    cache.put(exe, record)
+    return version
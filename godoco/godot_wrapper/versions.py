@@ -0,0 +1,485 @@
+"""Several Godot installs side by side: pins, resolution and a shared store."""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from pathlib import Path
+import hashlib
+import os
+import platform
+import re
+import shutil
+import sys
+from typing import Mapping, Optional
+
+from .pins import project_pin, resolve_label
+from .version import GodotVersion
+from ..utils.errors import GodotVersionError, InstallError
+from ..utils.fs import (
+    FileLock,
+    clone_file,
+    file_signature,
+    read_json_file,
+    write_json_file,
+)
+from ..utils.paths import get_data_dir
+from ..utils.trace import span
+
+STORE_DIR = "godot"
+OBJECTS_DIR = "objects"
+EDITORS_DIR = "editors"
+TEMPLATES_DIR = "templates"
+STORE_MANIFEST = "store.json"
+# Bump when the store layout changes
+STORE_SCHEMA = 1
+ARCHIVE_SUFFIXES = (".zip", ".tpz")
+TEMPLATES_VERSION_FILE = "templates/version.txt"
+TEMPLATES_LABEL = re.compile(r"^\d+\.\d+(?:\.\d+)?\.[a-z]+\d*(?:\.mono)?$")
+COPY_CHUNK = 1 << 20
+
+
+def install_label(version: GodotVersion) -> str:
+    """
+    Name of an install, e.g. ``4.3.stable`` or ``4.2.2.stable.mono``.
+
+    This is also the folder name Godot uses for its export templates.
+    """
+    label = f"{version.number}.{version.status}"
+    if "mono" in version.build.split("."):
+        label += ".mono"
+    return label
+
+
+class InstallIndex:
+    """
+    Registered installs by label.
+
+    A pin resolves by exact label first, then by feature version
+    (``"4.3"``), which maps to the preferred install of that series (see
+    ``pins.resolve_label``, shared with the passthrough fast path).
+    """
+
+    def __init__(self, installs: Mapping[str, Path]):
+        self.installs = dict(installs)
+
+    def label_for(self, pin: str) -> Optional[str]:
+        """Label a pin resolves to, or None if no install matches."""
+        return resolve_label(pin, self.installs)
+
+    def resolve(self, pin: str) -> Optional[Path]:
+        """Executable for a pin, or None if no install matches."""
+        label = self.label_for(pin)
+        return self.installs[label] if label else None
+
+
+def pinned_executable(
+    proj: Path, installs: Mapping[str, Path]
+) -> tuple[Optional[str], Optional[Path]]:
+    """
+    Registered executable matching a project's pin.
+
+    Returns
+    -------
+    tuple[Optional[str], Optional[Path]]
+        The pin (None if the project has none) and the executable (None
+        if no registered install matches or it no longer exists).
+    """
+    if not installs or (pin := project_pin(proj)) is None:
+        return None, None
+    exe = InstallIndex(installs).resolve(pin)
+    if exe is None or not os.path.isfile(exe):
+        return pin, None
+    return pin, exe
+
+
+def godot_templates_dir() -> Path:
+    """Directory where Godot looks for export templates."""
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA")
+        root = Path(base) if base else Path.home() / "AppData" / "Roaming"
+        return root / "Godot" / "export_templates"
+    if sys.platform == "darwin":
+        root = Path.home() / "Library" / "Application Support"
+        return root / "Godot" / "export_templates"
+    base = os.environ.get("XDG_DATA_HOME")
+    root = Path(base) if base else Path.home() / ".local" / "share"
+    return root / "godot" / "export_templates"
+
+
+@dataclass
+class InstallResult:
+    """Outcome of installing one archive."""
+
+    archive: Path
+    # "editor" or "templates"
+    kind: str = ""
+    label: str = ""
+    # Editor executable, or the export templates folder
+    path: Optional[Path] = None
+    # Already installed from the same archive
+    cached: bool = False
+    files: int = 0
+    # Uncompressed bytes, and the part not already in the store
+    bytes: int = 0
+    new_bytes: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class _Member:
+    name: str
+    compressed: int = 0
+    digest: str = ""
+    size: int = 0
+    executable: bool = False
+    new: bool = False
+
+
+@dataclass
+class _Archive:
+    path: Path
+    key: list
+    members: list[_Member] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class InstallStore:
+    """
+    Content-addressed store of unpacked Godot editors and templates.
+
+    Every unpacked file is stored once under ``objects/`` by SHA-256 and
+    hard linked into ``editors/<label>`` or ``templates/<label>``, so
+    files shared between versions or builds (mono and standard, repeated
+    downloads) take space once. Hard links fall back to copies across
+    filesystems.
+
+    Files in an install share their content with the store: edit them
+    and every install using that content changes.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = root or get_data_dir() / STORE_DIR
+        self.objects = self.root / OBJECTS_DIR
+        self._lock = FileLock(self.root / ".lock", timeout=600)
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest
+
+    def _manifest(self) -> dict:
+        data = read_json_file(self.root / STORE_MANIFEST)
+        if isinstance(data, dict) and data.get("schema") == STORE_SCHEMA:
+            return data
+        return {"schema": STORE_SCHEMA, "archives": {}}
+
+    def _store_members(self, archive: Path, members: list[_Member]) -> None:
+        """Unpack archive members into the object store."""
+        import zipfile
+
+        with zipfile.ZipFile(archive) as zf:
+            for member in members:
+                self._store_member(zf, member)
+
+    def _store_member(self, zf, member: _Member) -> None:
+        tmp = self.objects / f"tmp.{os.getpid()}.{id(member)}"
+        h = hashlib.sha256()
+        info = zf.getinfo(member.name)
+        member.executable = bool((info.external_attr >> 16) & 0o111)
+        with zf.open(info) as src, open(tmp, "wb") as dst:
+            while chunk := src.read(COPY_CHUNK):
+                h.update(chunk)
+                dst.write(chunk)
+                member.size += len(chunk)
+
+        member.digest = h.hexdigest()
+        obj = self.object_path(member.digest)
+        if obj.exists():
+            tmp.unlink()
+            return
+        obj.parent.mkdir(exist_ok=True)
+        if member.executable:
+            os.chmod(tmp, 0o755)
+        os.replace(tmp, obj)
+        member.new = True
+
+    def _materialize(self, members: list[_Member], dest: Path, strip: str):
+        """Link stored members into a new tree."""
+        for m in members:
+            if not m.name.startswith(strip):
+                continue
+            target = dest / m.name[len(strip) :]
+            target.parent.mkdir(parents=True, exist_ok=True)
+            clone_file(self.object_path(m.digest), target, link=True)
+            if m.executable and not os.access(target, os.X_OK):
+                os.chmod(target, os.stat(target).st_mode | 0o111)
+
+    def install(
+        self, archives: list[Path], workers: Optional[int] = None
+    ) -> list[InstallResult]:
+        """
+        Unpack Godot editor and export template archives.
+
+        All members of all archives are unpacked concurrently. Archives
+        already installed (same path, size and mtime) are skipped. The
+        store is locked for the whole install, so a concurrent ``gc``
+        cannot free objects before they are linked.
+
+        Parameters
+        ----------
+        archives : list[Path]
+            Official ``.zip`` editor downloads and ``.tpz`` export
+            templates.
+        workers : Optional[int]
+            Unpacking threads (default: scaled from the CPU count).
+
+        Returns
+        -------
+        list[InstallResult]
+            One result per archive, in order. Editors are identified by
+            running ``--version`` on the unpacked executable.
+        """
+        # gc() deletes every object without links, including objects
+        # stored but not linked yet: hold the lock until they are linked
+        with self._lock:
+            return self._install(archives, workers)
+
+    def _install(
+        self, archives: list[Path], workers: Optional[int]
+    ) -> list[InstallResult]:
+        from concurrent.futures import ThreadPoolExecutor
+        import zipfile
+
+        self.objects.mkdir(parents=True, exist_ok=True)
+        manifest = self._manifest()
+        results = [InstallResult(Path(a).resolve()) for a in archives]
+
+        pending: list[tuple[InstallResult, _Archive]] = []
+        for res in results:
+            sig = file_signature(res.archive)
+            if sig is None or not res.archive.name.lower().endswith(
+                ARCHIVE_SUFFIXES
+            ):
+                res.error = "not a .zip or .tpz archive"
+                continue
+            key = [str(res.archive), *sig]
+            known = manifest["archives"].get(key[0])
+            if known and known["key"] == key and Path(known["path"]).exists():
+                res.kind, res.label = known["kind"], known["label"]
+                res.path, res.cached = Path(known["path"]), True
+                continue
+            try:
+                archive = _list_archive(res.archive, key)
+            except (OSError, zipfile.BadZipFile, InstallError) as e:
+                res.error = f"cannot read archive: {e}"
+                continue
+            pending.append((res, archive))
+
+        workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        jobs = [
+            (a, chunk)
+            for _, a in pending
+            for chunk in _split(a.members, workers)
+        ]
+        if jobs:
+            files = sum(len(a.members) for _, a in pending)
+            with span("godot.unpack", files=files):
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    futures = [
+                        (a, pool.submit(self._store_members, a.path, chunk))
+                        for a, chunk in jobs
+                    ]
+                    for a, future in futures:
+                        try:
+                            future.result()
+                        except (OSError, zipfile.BadZipFile, RuntimeError) as e:
+                            a.error = a.error or f"cannot unpack: {e}"
+
+        for res, archive in pending:
+            if archive.error:
+                res.error = archive.error
+                continue
+            try:
+                self._finish(res, archive)
+            except InstallError as e:
+                res.error = str(e)
+                continue
+            except OSError as e:
+                res.error = f"cannot install: {e}"
+                continue
+            manifest["archives"][archive.key[0]] = {
+                "key": archive.key,
+                "kind": res.kind,
+                "label": res.label,
+                "path": str(res.path),
+            }
+        write_json_file(self.root / STORE_MANIFEST, manifest)
+        return results
+
+    def _finish(self, res: InstallResult, archive: _Archive) -> None:
+        members = archive.members
+        res.files = len(members)
+        res.bytes = sum(m.size for m in members)
+        res.new_bytes = sum(m.size for m in members if m.new)
+
+        staging = self.root / f"staging.{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            version_file = next(
+                (m for m in members if m.name == TEMPLATES_VERSION_FILE), None
+            )
+            if version_file is not None:
+                res.kind = "templates"
+                label = (
+                    self
+                    .object_path(version_file.digest)
+                    .read_text(encoding="utf-8")
+                    .strip()
+                )
+                if not TEMPLATES_LABEL.match(label):
+                    raise InstallError(
+                        f"{res.archive.name}: unexpected templates version "
+                        f"{label!r}"
+                    )
+                self._materialize(members, staging, "templates/")
+                res.label = label
+                res.path = self._place(staging, TEMPLATES_DIR, label)
+                return
+
+            res.kind = "editor"
+            self._materialize(members, staging, "")
+            exe = _find_editor(staging)
+            if exe is None:
+                raise InstallError(f"{res.archive.name}: no Godot executable")
+            version = _probe(exe)
+            res.label = install_label(version)
+            dest = self._place(staging, EDITORS_DIR, res.label)
+            res.path = dest / exe.relative_to(staging)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _place(self, staging: Path, kind: str, label: str) -> Path:
+        """Move a finished tree to ``<kind>/<label>``, replacing it."""
+        dest = self.root / kind / label
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        old = dest.with_name(f"{label}.old.{os.getpid()}")
+        if dest.exists():
+            os.replace(dest, old)
+        os.replace(staging, dest)
+        shutil.rmtree(old, ignore_errors=True)
+        return dest
+
+    def uninstall(self, kind: str, label: str) -> bool:
+        """
+        Delete an install from the store (``gc`` then frees its files).
+
+        Parameters
+        ----------
+        kind : str
+            ``"editor"`` or ``"templates"``.
+        label : str
+            Install label.
+
+        Returns
+        -------
+        bool
+            False if the store has no such install.
+        """
+        dest = self.root / (EDITORS_DIR if kind == "editor" else TEMPLATES_DIR)
+        dest = dest / label
+        with self._lock:
+            if not dest.is_dir():
+                return False
+            shutil.rmtree(dest)
+            manifest = self._manifest()
+            manifest["archives"] = {
+                k: v
+                for k, v in manifest["archives"].items()
+                if (v["kind"], v["label"]) != (kind, label)
+            }
+            write_json_file(self.root / STORE_MANIFEST, manifest)
+        return True
+
+    def gc(self) -> int:
+        """
+        Delete objects no install links to.
+
+        Returns
+        -------
+        int
+            Bytes freed.
+        """
+        freed = 0
+        with self._lock:
+            for obj in self.objects.glob("*/*"):
+                try:
+                    st = obj.stat()
+                    if st.st_nlink == 1:
+                        obj.unlink()
+                        freed += st.st_size
+                except OSError:
+                    continue
+        return freed
+
+
+def _list_archive(path: Path, key: list) -> _Archive:
+    import zipfile
+
+    archive = _Archive(path, key)
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            parts = info.filename.split("/")
+            if info.filename.startswith("/") or ".." in parts:
+                raise InstallError(f"unsafe member {info.filename!r}")
+            archive.members.append(_Member(info.filename, info.compress_size))
+    return archive
+
+
+def _split(members: list[_Member], count: int) -> list[list[_Member]]:
+    """Spread members over up to ``count`` chunks of similar size."""
+    chunks: list[list[_Member]] = [[] for _ in range(min(count, len(members)))]
+    sizes = [0] * len(chunks)
+    for m in sorted(members, key=lambda m: m.compressed, reverse=True):
+        i = sizes.index(min(sizes))
+        chunks[i].append(m)
+        sizes[i] += m.compressed + 1
+    return chunks
+
+
+def _find_editor(tree: Path) -> Optional[Path]:
+    from .detector import scan_for_godot
+
+    return scan_for_godot(tree, platform.system())
+
+
+def _probe(exe: Path) -> GodotVersion:
+    from .detector import detect_godot_version
+
+    try:
+        return detect_godot_version(exe)
+    except GodotVersionError as e:
+        raise InstallError(f"{exe.name}: {e}") from e
+
+
+def link_templates(source: Path, label: str) -> Optional[Path]:
+    """
+    Make installed templates visible to Godot.
+
+    Hard links the tree into ``godot_templates_dir()/<label>`` unless
+    Godot already has templates for that version.
+
+    Returns
+    -------
+    Optional[Path]
+        The new folder, or None if one already existed.
+    """
+    dest = godot_templates_dir() / label
+    if dest.exists():
+        return None
+    for path in sorted(source.rglob("*")):
+        target = dest / path.relative_to(source)
+        if path.is_dir():
+            target.mkdir(parents=True, exist_ok=True)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            clone_file(path, target, link=True)
+    return dest
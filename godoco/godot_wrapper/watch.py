@@ -0,0 +1,163 @@
+"""Filesystem watching for ``godoco run --watch``."""
+
+from __future__ import annotations
+from pathlib import Path
+import os
+import subprocess
+import threading
+import time
+from typing import Callable, Optional
+
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+
+WATCH_EXTENSIONS = frozenset({".gd", ".tscn", ".tres"})
+IGNORE_DIRS = frozenset({".godot", ".import", "build"})
+DEBOUNCE_SECONDS = 0.3
+STOP_TIMEOUT = 5.0
+
+
+class ChangeCollector(FileSystemEventHandler):
+    """
+    Collect relevant changes under a project and debounce them.
+
+    Events arrive on the observer thread; ``wait_for_changes`` returns
+    once changes have stopped arriving for ``debounce`` seconds, so a
+    burst of saves (an editor writing several files, "save all") yields
+    a single batch.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        extensions: frozenset[str] = WATCH_EXTENSIONS,
+        ignore: frozenset[str] = IGNORE_DIRS,
+        debounce: float = DEBOUNCE_SECONDS,
+    ):
+        super().__init__()
+        self.root = os.path.abspath(root)
+        self.extensions = extensions
+        self.ignore = ignore
+        self.debounce = debounce
+        self._cond = threading.Condition()
+        self._changed: set[str] = set()
+        self._last = 0.0
+
+    def relevant(self, path: str) -> Optional[str]:
+        """Project-relative path if a change to it matters, else None."""
+        if os.path.splitext(path)[1].lower() not in self.extensions:
+            return None
+        rel = os.path.relpath(path, self.root)
+        parts = rel.split(os.sep)
+        if parts[0] == ".." or any(p in self.ignore for p in parts[:-1]):
+            return None
+        return "/".join(parts)
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        if event.is_directory or event.event_type in (
+            "opened",
+            "closed_no_write",
+        ):
+            return
+        paths = [event.src_path, getattr(event, "dest_path", "")]
+        hits = [r for p in paths if p and (r := self.relevant(os.fsdecode(p)))]
+        if not hits:
+            return
+        with self._cond:
+            self._changed.update(hits)
+            self._last = time.monotonic()
+            self._cond.notify_all()
+
+    def wait_for_changes(self, timeout: Optional[float] = None) -> set[str]:
+        """
+        Wait for a settled batch of changes.
+
+        Parameters
+        ----------
+        timeout : Optional[float]
+            Maximum time to wait for the first change.
+
+        Returns
+        -------
+        set[str]
+            Changed project-relative paths; empty if the timeout expired.
+        """
+        with self._cond:
+            if not self._changed:
+                self._cond.wait(timeout)
+                if not self._changed:
+                    return set()
+            while (
+                remaining := self._last + self.debounce - time.monotonic()
+            ) > 0:
+                self._cond.wait(remaining)
+            changed, self._changed = self._changed, set()
+            return changed
+
+
+def stop_process(proc: subprocess.Popen, timeout: float = STOP_TIMEOUT) -> None:
+    """Terminate a child process, killing it if it does not exit in time."""
+    if proc.poll() is not None:
+        return
+    proc.terminate()
+    try:
+        proc.wait(timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def watch_and_restart(
+    root: Path,
+    spawn: Callable[[], Optional[subprocess.Popen]],
+    on_restart: Optional[Callable[[set[str]], None]] = None,
+    on_exit: Optional[Callable[[int], None]] = None,
+    debounce: float = DEBOUNCE_SECONDS,
+) -> None:
+    """
+    Run a process and restart it whenever project sources change.
+
+    Blocks until interrupted (KeyboardInterrupt), then stops the child
+    and the observer. If the child exits on its own it is started again
+    on the next change.
+
+    Parameters
+    ----------
+    root : Path
+        Project root to watch recursively.
+    spawn : Callable[[], Optional[subprocess.Popen]]
+        Starts the child process; None if it could not be started, in
+        which case the next change tries again.
+    on_restart : Optional[Callable[[set[str]], None]]
+        Called with the changed paths before each restart.
+    on_exit : Optional[Callable[[int], None]]
+        Called with the exit code when the child exits by itself.
+    debounce : float
+        Quiet period that ends a burst of changes.
+    """
+    collector = ChangeCollector(root, debounce=debounce)
+    observer = Observer()
+    observer.schedule(collector, os.fspath(root), recursive=True)
+    observer.start()
+
+    proc: Optional[subprocess.Popen] = spawn()
+    try:
+        while True:
+            changed = collector.wait_for_changes(timeout=0.5)
+            if not changed:
+                if proc is not None and (code := proc.poll()) is not None:
+                    proc = None
+                    if on_exit:
+                        on_exit(code)
+                continue
+
+            if on_restart:
+                on_restart(changed)
+            if proc is not None:
+                stop_process(proc)
+            proc = spawn()
+    finally:
+        if proc is not None:
+            stop_process(proc)
+        observer.stop()
+        observer.join()
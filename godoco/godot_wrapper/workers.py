@@ -0,0 +1,563 @@
+"""Warm pool of headless Godot processes for running GDScript jobs."""
+
+from __future__ import annotations
+import asyncio
+from dataclasses import dataclass, field
+from pathlib import Path
+import json
+import os
+import secrets
+import subprocess
+import time
+from typing import Callable, Optional, Sequence
+
+from .process import (
+    gather_limited,
+    pump_lines,
+    read_rss,
+    run_process,
+    terminate,
+)
+from .wrapper import GodotWrapper
+from ..utils.errors import WorkerPoolError
+from ..utils.fs import write_cached_script
+from ..utils.paths import make_godot_path_relative
+
+WORKER_SCRIPT_FILE = "godoco_worker.gd"
+MARK = "@@godoco:"
+START_TIMEOUT = 30.0
+MAX_JOBS_PER_WORKER = 200
+# Recycle a worker once its RSS grew this much since it became ready
+MAX_RSS_GROWTH = 512 * 1024 * 1024
+
+# Pool jobs are scripts defining ``func run(args: PackedStringArray) -> int``.
+# The same file runs a single job when started with --godoco-job.
+WORKER_SCRIPT = """extends SceneTree
+# godoco worker: runs GDScript jobs sent by godoco over a local socket.
+
+const MARK := "@@godoco:"
+
+var peer := StreamPeerTCP.new()
+var token := ""
+var greeted := false
+var pending := ""
+
+
+func _initialize() -> void:
+	var port := 0
+	var job := ""
+	var job_args := PackedStringArray()
+	for arg in OS.get_cmdline_user_args():
+		if arg.begins_with("--godoco-port="):
+			port = arg.get_slice("=", 1).to_int()
+		elif arg.begins_with("--godoco-token="):
+			token = arg.get_slice("=", 1)
+		elif arg.begins_with("--godoco-job="):
+			job = arg.substr(arg.find("=") + 1)
+		elif arg.begins_with("--godoco-arg="):
+			job_args.append(arg.substr(arg.find("=") + 1))
+	if job:
+		quit(run_script(job, job_args))
+		return
+	OS.low_processor_usage_mode = true
+	if port <= 0 or peer.connect_to_host("127.0.0.1", port) != OK:
+		quit(2)
+
+
+func _process(_delta: float) -> bool:
+	peer.poll()
+	var status := peer.get_status()
+	if status == StreamPeerTCP.STATUS_CONNECTING:
+		return false
+	if status != StreamPeerTCP.STATUS_CONNECTED:
+		return true
+	if not greeted:
+		var hello := JSON.stringify({"hello": token}) + "\\n"
+		peer.put_data(hello.to_utf8_buffer())
+		greeted = true
+	var available := peer.get_available_bytes()
+	if available > 0:
+		var chunk: Array = peer.get_data(available)
+		pending += (chunk[1] as PackedByteArray).get_string_from_utf8()
+	while pending.contains("\\n"):
+		var nl := pending.find("\\n")
+		var line := pending.substr(0, nl)
+		pending = pending.substr(nl + 1)
+		handle(JSON.parse_string(line))
+	return false
+
+
+func handle(job) -> void:
+	if not job is Dictionary:
+		return
+	var id := str(job.get("id", ""))
+	print(MARK + token + ":begin " + id)
+	var code := run_script(str(job.get("script", "")), PackedStringArray(job.get("args", [])))
+	print(MARK + token + ":end " + id + " " + str(code))
+
+
+func run_script(path: String, args: PackedStringArray) -> int:
+	var script = ResourceLoader.load(path, "", ResourceLoader.CACHE_MODE_REPLACE)
+	if not script is Script or not script.can_instantiate():
+		printerr("godoco: cannot load script ", path)
+		return 1
+	var obj = script.new()
+	if not obj.has_method("run"):
+		printerr("godoco: ", path, " has no run(args) method")
+		return 1
+	var result = obj.run(args)
+	if obj is Node:
+		obj.free()
+	return result if result is int else 0
+"""
+
+
+@dataclass
+class JobResult:
+    """Outcome of one script job."""
+
+    script: str
+    returncode: int
+    seconds: float
+    output: list[str] = field(default_factory=list)
+    # Pid of the pool worker that ran it; None for one-shot runs
+    worker: Optional[int] = None
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+
+def worker_script_path() -> Path:
+    """Write the worker GDScript to the cache dir (if needed) and return it."""
+    return write_cached_script(WORKER_SCRIPT_FILE, WORKER_SCRIPT)
+
+
+def is_main_loop_script(path: Path) -> bool:
+    """
+    Check whether a script is a classic ``--script`` entry point.
+
+    Scripts extending SceneTree or MainLoop own the engine's main loop
+    and can only run one-shot; everything else is a pool job.
+    """
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("extends"):
+                    base = line.split(None, 1)[1] if " " in line else ""
+                    return base.strip() in ("SceneTree", "MainLoop")
+    except OSError:
+        pass
+    return False
+
+
+def _has_script_error(lines: list[str]) -> bool:
+    return any(line.lstrip().startswith("SCRIPT ERROR") for line in lines)
+
+
+class _Worker:
+    """One long-lived headless Godot and the job it is running."""
+
+    def __init__(self, token: str):
+        self.token = token
+        self.mark = f"{MARK}{token}:"
+        self.proc: Optional[asyncio.subprocess.Process] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.connected: asyncio.Future = (
+            asyncio.get_running_loop().create_future()
+        )
+        self.jobs = 0
+        self.base_rss: Optional[int] = None
+        self._job: Optional[asyncio.Future] = None
+        self._lines: list[str] = []
+        self._pumps: list[asyncio.Task] = []
+        self._exit_watch: Optional[asyncio.Task] = None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.proc.pid if self.proc else None
+
+    async def start(self, cmd: list[str]) -> None:
+        self.proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self._pumps = [
+            asyncio.create_task(pump_lines(self.proc.stdout, self._stdout)),
+            asyncio.create_task(pump_lines(self.proc.stderr, self._stderr)),
+        ]
+        self._exit_watch = asyncio.create_task(self._watch_exit())
+
+    async def _watch_exit(self) -> None:
+        code = await self.proc.wait()
+        await asyncio.wait(self._pumps, timeout=1)
+        err = WorkerPoolError(f"exited with code {code}")
+        for fut in (self.connected, self._job):
+            if fut is not None and not fut.done():
+                fut.set_exception(err)
+
+    def _stdout(self, line: str) -> None:
+        if line.startswith(self.mark):
+            kind, _, rest = line[len(self.mark) :].partition(" ")
+            if kind == "end" and self._job and not self._job.done():
+                self._job.set_result(int(rest.split()[-1]))
+            return
+        if self._job is not None:
+            self._lines.append(line)
+
+    def _stderr(self, line: str) -> None:
+        if self._job is not None:
+            self._lines.append(line)
+
+    async def run(
+        self, job_id: int, script: str, args: Sequence[str]
+    ) -> tuple[int, list[str]]:
+        """Send a job and wait for its end marker."""
+        self._lines = []
+        self._job = asyncio.get_running_loop().create_future()
+        msg = {"id": job_id, "script": script, "args": list(args)}
+        self.writer.write((json.dumps(msg) + "\n").encode())
+        await self.writer.drain()
+        try:
+            code = await self._job
+        finally:
+            self._job = None
+        self.jobs += 1
+        return code, self._lines
+
+    async def stop(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        if self.proc is not None:
+            await terminate(self.proc, grace=2)
+
+
+class WorkerPool:
+    """
+    Long-lived headless Godot processes that run GDScript jobs.
+
+    Each worker runs ``godoco_worker.gd`` and connects back to a local TCP
+    server owned by the pool; jobs are sent as JSON lines and the worker
+    marks the start and end of each job on stdout so its output can be
+    attributed. Workers are replaced after ``max_jobs`` jobs, when their
+    RSS grows by more than ``max_rss_growth`` bytes, or when they die.
+    """
+
+    def __init__(
+        self,
+        wrapper: GodotWrapper,
+        project: Path,
+        size: int,
+        max_jobs: int = MAX_JOBS_PER_WORKER,
+        max_rss_growth: int = MAX_RSS_GROWTH,
+        start_timeout: float = START_TIMEOUT,
+    ):
+        self.wrapper = wrapper
+        self.project = project
+        self.size = max(1, size)
+        self.max_jobs = max_jobs
+        self.max_rss_growth = max_rss_growth
+        self.start_timeout = start_timeout
+        self._server: Optional[asyncio.Server] = None
+        self._port = 0
+        self._script = Path()
+        self._pending: dict[str, _Worker] = {}
+        # None is queued once the last worker is gone for good
+        self._idle: asyncio.Queue[Optional[_Worker]] = asyncio.Queue()
+        self._workers: set[_Worker] = set()
+        self._next_id = 0
+
+    async def start(self) -> None:
+        """
+        Start the server and the workers.
+
+        Raises
+        ------
+        WorkerPoolError
+            If no worker connects within ``start_timeout``.
+        """
+        self._script = worker_script_path()
+        self._server = await asyncio.start_server(
+            self._on_connect, "127.0.0.1", 0
+        )
+        self._port = self._server.sockets[0].getsockname()[1]
+
+        results = await asyncio.gather(
+            *(self._spawn() for _ in range(self.size)),
+            return_exceptions=True,
+        )
+        if not any(isinstance(r, _Worker) for r in results):
+            await self.close()
+            raise WorkerPoolError(str(results[0]))
+
+    async def _spawn(self) -> _Worker:
+        worker = _Worker(secrets.token_hex(8))
+        self._pending[worker.token] = worker
+        self._workers.add(worker)
+        cmd = self.wrapper.headless_cmd(
+            self.project,
+            self._script,
+            [f"--godoco-port={self._port}", f"--godoco-token={worker.token}"],
+        )
+        try:
+            await worker.start(cmd)
+            await asyncio.wait_for(worker.connected, self.start_timeout)
+        except (OSError, TimeoutError, WorkerPoolError) as e:
+            self._workers.discard(worker)
+            await worker.stop()
+            raise WorkerPoolError(f"Godot worker failed to start: {e}")
+        finally:
+            self._pending.pop(worker.token, None)
+
+        worker.base_rss = read_rss(worker.pid)
+        self._idle.put_nowait(worker)
+        return worker
+
+    async def _on_connect(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            hello = json.loads(await reader.readline())
+            worker = self._pending.get(hello.get("hello"))
+        except (ValueError, AttributeError):
+            worker = None
+        if worker is None or worker.connected.done():
+            writer.close()
+            return
+        worker.writer = writer
+        worker.connected.set_result(True)
+
+    async def _replace(self, worker: _Worker) -> None:
+        self._workers.discard(worker)
+        await worker.stop()
+        try:
+            await self._spawn()
+        except WorkerPoolError:
+            if not self._workers:
+                self._idle.put_nowait(None)
+
+    def _worn_out(self, worker: _Worker) -> bool:
+        if worker.jobs >= self.max_jobs:
+            return True
+        rss = read_rss(worker.pid)
+        return bool(
+            rss
+            and worker.base_rss
+            and rss - worker.base_rss > self.max_rss_growth
+        )
+
+    async def run(
+        self,
+        script: str,
+        args: Sequence[str] = (),
+        timeout: Optional[float] = None,
+    ) -> JobResult:
+        """
+        Run a job on the next idle worker.
+
+        Parameters
+        ----------
+        script : str
+            ``res://`` or absolute path of a script with ``run(args)``.
+        args : Sequence[str]
+            Passed to ``run`` as a PackedStringArray.
+        timeout : Optional[float]
+            Seconds before the worker is killed and replaced.
+
+        Returns
+        -------
+        JobResult
+            Exit code (``run``'s int return value) and output.
+        """
+        self._next_id += 1
+        job_id = self._next_id
+        worker = await self._idle.get()
+        if worker is None:
+            # Wake the next waiter too
+            self._idle.put_nowait(None)
+            return JobResult(script, -1, 0.0, ["No Godot worker available"])
+        start = time.perf_counter()
+        timed_out = False
+        lines: list[str] = []
+        try:
+            code, lines = await asyncio.wait_for(
+                worker.run(job_id, script, args), timeout
+            )
+        except TimeoutError:
+            code, timed_out = -1, True
+        except (WorkerPoolError, OSError) as e:
+            code, lines = -1, worker._lines + [str(e)]
+        seconds = time.perf_counter() - start
+
+        if code == 0 and _has_script_error(lines):
+            code = 1
+        if code == -1 or self._worn_out(worker):
+            await self._replace(worker)
+        else:
+            self._idle.put_nowait(worker)
+        return JobResult(
+            script, code, seconds, lines, worker.pid, timed_out=timed_out
+        )
+
+    async def close(self) -> None:
+        """Stop all workers and the server."""
+        await asyncio.gather(
+            *(w.stop() for w in self._workers), return_exceptions=True
+        )
+        self._workers.clear()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> WorkerPool:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+
+async def run_one_shot(
+    wrapper: GodotWrapper,
+    project: Path,
+    script: Path,
+    args: Sequence[str] = (),
+    timeout: Optional[float] = None,
+) -> JobResult:
+    """
+    Run a script in a fresh headless Godot.
+
+    Main-loop scripts run directly with ``--script``; pool-style scripts
+    run through the worker script's single-job mode.
+    """
+    if is_main_loop_script(script):
+        cmd = wrapper.headless_cmd(project, script, list(args))
+    else:
+        job = make_godot_path_relative(project.resolve(), script.resolve())
+        user_args = [f"--godoco-job={job}"]
+        user_args += [f"--godoco-arg={a}" for a in args]
+        cmd = wrapper.headless_cmd(project, worker_script_path(), user_args)
+
+    lines: list[str] = []
+    result = await run_process(
+        cmd, timeout=timeout, on_stdout=lines.append, on_stderr=lines.append
+    )
+    if result.error:
+        lines.append(result.error)
+    code = result.returncode
+    if code == 0 and _has_script_error(lines):
+        code = 1
+    return JobResult(
+        str(script), code, result.wall_seconds, lines, None, result.timed_out
+    )
+
+
+def run_scripts(
+    wrapper: GodotWrapper,
+    project: Path,
+    scripts: list[Path],
+    args: Sequence[str] = (),
+    workers: Optional[int] = None,
+    one_shot: bool = False,
+    timeout: Optional[float] = None,
+    on_done: Optional[Callable[[JobResult], None]] = None,
+    on_fallback: Optional[Callable[[str], None]] = None,
+) -> list[JobResult]:
+    """
+    Run many scripts, reusing warm Godot workers where possible.
+
+    Main-loop scripts (``extends SceneTree``) always run one-shot. If the
+    pool cannot start, every script falls back to one-shot mode.
+
+    Parameters
+    ----------
+    wrapper : GodotWrapper
+        Godot to run.
+    project : Path
+        Project the scripts run in.
+    scripts : list[Path]
+        Script files.
+    args : Sequence[str]
+        Arguments for every script.
+    workers : Optional[int]
+        Pool size and one-shot concurrency (default: CPU count).
+    one_shot : bool
+        Never use the pool.
+    timeout : Optional[float]
+        Per-script timeout in seconds.
+    on_done : Optional[Callable[[JobResult], None]]
+        Called as each script finishes.
+    on_fallback : Optional[Callable[[str], None]]
+        Called with the reason when the pool is unavailable.
+
+    Returns
+    -------
+    list[JobResult]
+        Results in input order.
+    """
+    limit = workers or os.cpu_count() or 1
+    root = project.resolve()
+
+    def done(result: JobResult) -> JobResult:
+        if on_done:
+            on_done(result)
+        return result
+
+    async def one(script: Path) -> JobResult:
+        return done(await run_one_shot(wrapper, project, script, args, timeout))
+
+    async def main() -> list[JobResult]:
+        pooled = [
+            i
+            for i, s in enumerate(scripts)
+            if not one_shot and not is_main_loop_script(s)
+        ]
+        results: list[Optional[JobResult]] = [None] * len(scripts)
+        factories = {
+            i: (lambda s=s: one(s))
+            for i, s in enumerate(scripts)
+            if i not in pooled
+        }
+
+        pool = None
+        if pooled:
+            pool = WorkerPool(wrapper, project, min(limit, len(pooled)))
+            try:
+                await pool.start()
+            except WorkerPoolError as e:
+                pool = None
+                if on_fallback:
+                    on_fallback(str(e))
+                factories.update({
+                    i: (lambda s=scripts[i]: one(s)) for i in pooled
+                })
+
+        async def pooled_job(i: int) -> JobResult:
+            res_path = make_godot_path_relative(root, scripts[i].resolve())
+            result = await pool.run(res_path, args, timeout)
+            result.script = str(scripts[i])
+            return done(result)
+
+        try:
+            tasks = []
+            if pool is not None:
+                tasks.append(asyncio.gather(*(pooled_job(i) for i in pooled)))
+            order = sorted(factories)
+            tasks.append(gather_limited([factories[i] for i in order], limit))
+            outputs = await asyncio.gather(*tasks)
+        finally:
+            if pool is not None:
+                await pool.close()
+
+        if pool is not None:
+            for i, r in zip(pooled, outputs[0]):
+                results[i] = r
+        for i, r in zip(sorted(factories), outputs[-1]):
+            results[i] = r
+        return results
+
+    return asyncio.run(main())
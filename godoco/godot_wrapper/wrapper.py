@@ -3,7 +3,10 @@
 from __future__ import annotations
 import subprocess
 from pathlib import Path
-from typing import Optional, List, Any
+from typing import Callable, Optional, List, Any
+
+from .process import ProcessResult, run_sync
+from ..utils.trace import span
 
 
 class GodotWrapper:
@@ -15,18 +18,7 @@ class GodotWrapper:
     def _build_cmd(self, project_path: Path, args: List[str]) -> List[str]:
         return [str(self.godot_path), "--path", str(project_path)] + args
 
-    def run_editor(
-        self, project_path: Path, **kwargs
-    ) -> subprocess.CompletedProcess:
-        """
-        Run Godot editor or game.
-
-        Kwargs can be:
-        - editor: bool (open editor)
-        - scene: str (run specific scene)
-        - fullscreen: bool
-        - debug: bool
-        """
+    def _editor_args(self, **kwargs) -> List[str]:
         args = []
         if kwargs.get("editor"):
             args.append("--editor")
@@ -40,33 +32,116 @@ class GodotWrapper:
         if scene := kwargs.get("scene"):
             args.append(scene)
 
-        cmd = self._build_cmd(project_path, args)
-        return subprocess.run(cmd)
+        return args
+
+    def run_editor(self, project_path: Path, **kwargs) -> ProcessResult:
+        """
+        Run Godot editor or game on our terminal and wait for it.
+
+        Godot inherits stdin, stdout and stderr; it is only supervised to
+        enforce the timeout and to stop it on Ctrl+C.
+
+        Kwargs can be:
+        - editor: bool (open editor)
+        - scene: str (run specific scene)
+        - fullscreen: bool
+        - debug: bool
+        - timeout: float (stop Godot after this many seconds)
+        """
+        cmd = self._build_cmd(project_path, self._editor_args(**kwargs))
+        return run_sync(cmd, timeout=kwargs.get("timeout"), interactive=True)
+
+    def spawn_editor(self, project_path: Path, **kwargs) -> subprocess.Popen:
+        """
+        Start Godot editor or game without waiting for it.
+
+        Takes the same kwargs as ``run_editor``.
+        """
+        cmd = self._build_cmd(project_path, self._editor_args(**kwargs))
+        with span("godot.spawn", cmd=cmd):
+            return subprocess.Popen(cmd)
 
     def run_headless(
-        self, project_path: Path, script: Optional[Path] = None, **kwargs
-    ) -> subprocess.CompletedProcess:
+        self,
+        project_path: Path,
+        script: Optional[Path] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> ProcessResult:
         """Run headless (for scripts/formatting)."""
+        cmd = self.headless_cmd(project_path, script)
+        return run_sync(cmd, timeout=timeout)
+
+    def headless_cmd(
+        self,
+        project_path: Path,
+        script: Optional[Path] = None,
+        user_args: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Command line running Godot headless, optionally with a script."""
         args = ["--headless"]
         if script:
             args.extend(["--script", str(script)])
+        if user_args:
+            args.append("--")
+            args.extend(user_args)
+        return self._build_cmd(project_path, args)
+
+    def import_cmd(self, project_path: Path) -> List[str]:
+        """Command line importing the project's assets, then quitting."""
+        return self._build_cmd(project_path, ["--headless", "--import"])
+
+    def import_assets(
+        self,
+        project_path: Path,
+        on_line: Optional[Callable[[str], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> ProcessResult:
+        """
+        Import the project's assets headless, without opening the editor.
 
-        cmd = self._build_cmd(project_path, args)
-        return subprocess.run(cmd)
-
-    def export_project(
+        Output (stdout and stderr, in order) goes to ``on_line``.
+        """
+        return run_sync(
+            self.import_cmd(project_path),
+            timeout=timeout,
+            on_stdout=on_line or (lambda line: None),
+            merge_stderr=True,
+        )
+
+    def export_cmd(
         self, project_path: Path, preset: str, output: Path, debug: bool = False
-    ) -> subprocess.CompletedProcess:
-        """Export project."""
+    ) -> List[str]:
+        """Command line exporting one preset."""
         args = [
             "--headless",
             "--export-debug" if debug else "--export-release",
             preset,
             str(output),
         ]
+        return self._build_cmd(project_path, args)
 
-        cmd = self._build_cmd(project_path, args)
-        return subprocess.run(cmd, check=True)
+    def export_project(
+        self,
+        project_path: Path,
+        preset: str,
+        output: Path,
+        debug: bool = False,
+        timeout: Optional[float] = None,
+    ) -> ProcessResult:
+        """
+        Export project.
+
+        Raises
+        ------
+        subprocess.CalledProcessError
+            If the export fails or times out.
+        """
+        cmd = self.export_cmd(project_path, preset, output, debug=debug)
+        result = run_sync(cmd, timeout=timeout)
+        if not result.ok:
+            raise subprocess.CalledProcessError(result.returncode, cmd)
+        return result
 
     def get_cli_args(self, **kwargs) -> List[str]:
         """Convert kwargs to CLI args (helper)."""
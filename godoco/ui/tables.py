@@ -32,3 +32,44 @@ def create_info_table(data: Dict[str, Any]) -> Table:
         table.add_row(k, str(v))
 
     return table
+
+
+def create_export_table(results: list[Any]) -> Table:
+    """Create export summary table."""
+    table = Table(
+        title="Exports", show_header=True, header_style="bold magenta"
+    )
+    table.add_column("Preset", style="cyan")
+    table.add_column("Status")
+    table.add_column("Time", justify="right")
+    table.add_column("Peak RSS", justify="right")
+    table.add_column("Output", style="dim")
+
+    for r in results:
+        if r.skipped:
+            status = "[info]up to date[/info]"
+        elif r.ok:
+            status = "[success]ok[/success]"
+        else:
+            status = f"[error]exit {r.returncode}[/error]"
+        rss = f"{r.peak_rss / (1024 * 1024):.0f} MiB" if r.peak_rss else "-"
+        table.add_row(
+            r.job.preset, status, f"{r.seconds:.1f}s", rss, str(r.job.output)
+        )
+
+    return table
+
+
+def create_versions_table(rows: list[tuple[str, str, str]]) -> Table:
+    """Create registered Godot versions table."""
+    table = Table(
+        title="Godot Versions", show_header=True, header_style="bold magenta"
+    )
+    table.add_column("Version", style="cyan")
+    table.add_column("Executable", style="dim")
+    table.add_column("Used by")
+
+    for label, path, marks in rows:
+        table.add_row(label, path, marks)
+
+    return table
@@ -29,3 +29,33 @@ class ExportError(GodocoError):
     """Raised when project export fails."""
 
     pass
+
+
+class GodotVersionError(GodocoError):
+    """Raised when the Godot version cannot be detected."""
+
+    pass
+
+
+class LockTimeoutError(GodocoError):
+    """Raised when a file lock cannot be acquired in time."""
+
+    pass
+
+
+class WorkerPoolError(GodocoError):
+    """Raised when the headless worker pool cannot be started."""
+
+    pass
+
+
+class TemplateError(GodocoError):
+    """Raised when a project template cannot be loaded or rendered."""
+
+    pass
+
+
+class InstallError(GodocoError):
+    """Raised when a Godot archive cannot be installed."""
+
+    pass
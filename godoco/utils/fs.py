@@ -0,0 +1,293 @@
+"""Filesystem helpers for Godoco."""
+
+from __future__ import annotations
+from pathlib import Path
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Optional
+
+from .errors import LockTimeoutError
+from .paths import get_cache_dir
+
+
+def file_signature(path: Path) -> Optional[tuple[int, int]]:
+    """
+    Get a cheap change-detection signature for a file.
+
+    Parameters
+    ----------
+    path : Path
+        File to stat.
+
+    Returns
+    -------
+    Optional[tuple[int, int]]
+        ``(mtime_ns, size)`` or None if the file cannot be stat-ed.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _target_mode(path: Path) -> int:
+    """Mode for a replacement file: the existing one's, else umask default."""
+    try:
+        return os.stat(path).st_mode & 0o777
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write_text(
+    path: Path, content: str, encoding: str = "utf-8"
+) -> None:
+    """
+    Write text to a file atomically.
+
+    The content goes to a temporary file in the same directory, is flushed
+    and fsync-ed, then renamed over the target, so readers only ever see
+    the old or the new content.
+
+    Parameters
+    ----------
+    path : Path
+        Destination file.
+    content : str
+        Text to write.
+    encoding : str
+        Text encoding.
+    """
+    # Imported here: reads on the passthrough fast path never need it
+    import tempfile
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    try:
+        with os.fdopen(fd, "w", encoding=encoding, newline="") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 files; keep the permissions users expect
+        os.chmod(tmp, _target_mode(path))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def read_json_file(path: Path) -> Any:
+    """
+    Read a JSON file, returning None if it is missing or unreadable.
+
+    Parameters
+    ----------
+    path : Path
+        JSON file.
+
+    Returns
+    -------
+    Any
+        Decoded JSON, or None.
+    """
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def write_json_file(path: Path, data: Any) -> None:
+    """
+    Atomically write data as JSON.
+
+    Parameters
+    ----------
+    path : Path
+        Destination file.
+    data : Any
+        JSON-serializable data.
+    """
+    atomic_write_text(path, json.dumps(data, indent=2))
+
+
+def write_cached_script(name: str, text: str) -> Path:
+    """
+    Write a helper script to the cache dir (if needed) and return it.
+
+    Parameters
+    ----------
+    name : str
+        File name in the cache dir.
+    text : str
+        Script content; the file is rewritten only when it differs.
+
+    Returns
+    -------
+    Path
+        The cached script.
+    """
+    path = get_cache_dir() / name
+    try:
+        current = path.read_text(encoding="utf-8")
+    except OSError:
+        current = None
+    if current != text:
+        atomic_write_text(path, text)
+    return path
+
+
+# Linux ioctl cloning a file's extents (copy-on-write, e.g. Btrfs, XFS)
+FICLONE = 0x40049409
+# Cleared after the first failed clone so unsupported filesystems cost
+# one attempt per process
+_reflink_supported = sys.platform.startswith("linux")
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    global _reflink_supported
+    if not _reflink_supported:
+        return False
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return True
+        except OSError:
+            _reflink_supported = False
+            return False
+
+
+def clone_file(src: Path, dst: Path, link: bool = False) -> str:
+    """
+    Copy a file as cheaply as the filesystem allows.
+
+    Tries a hard link (only if ``link``), then a copy-on-write clone,
+    then a regular copy (in-kernel where the platform supports it).
+
+    Parameters
+    ----------
+    src : Path
+        Source file.
+    dst : Path
+        Destination; its parent directory must exist.
+    link : bool
+        Allow hard links. The copy then shares its content with ``src``,
+        so editing one edits both.
+
+    Returns
+    -------
+    str
+        ``"link"``, ``"reflink"`` or ``"copy"``.
+    """
+    if link:
+        try:
+            os.link(src, dst)
+            return "link"
+        except OSError:
+            pass
+    if _reflink(src, dst):
+        return "reflink"
+    import shutil
+
+    shutil.copyfile(src, dst)
+    return "copy"
+
+
+class FileLock:
+    """
+    Advisory inter-process lock held on a sidecar lock file.
+
+    Uses ``fcntl.flock`` on POSIX and ``msvcrt.locking`` on Windows. The
+    lock is re-entrant within a process, so nested ``with`` blocks on the
+    same instance do not deadlock.
+    """
+
+    def __init__(self, path: Path, timeout: float = 10.0):
+        self.path = path
+        self.timeout = timeout
+        self._fd: Optional[int] = None
+        self._depth = 0
+        self._guard = threading.RLock()
+
+    def acquire(self) -> None:
+        """
+        Acquire the lock, polling until the timeout expires.
+
+        Raises
+        ------
+        LockTimeoutError
+            If another process holds the lock for longer than the timeout.
+        """
+        self._guard.acquire()
+        if self._depth:
+            self._depth += 1
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                _lock_fd(fd)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    self._guard.release()
+                    raise LockTimeoutError(
+                        f"Timed out waiting for lock {self.path}"
+                    )
+                time.sleep(0.05)
+
+        self._fd = fd
+        self._depth = 1
+
+    def release(self) -> None:
+        """Release one level of the lock."""
+        if not self._depth:
+            return
+        self._depth -= 1
+        if not self._depth and self._fd is not None:
+            try:
+                _unlock_fd(self._fd)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+        self._guard.release()
+
+    def __enter__(self) -> FileLock:
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_fd(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+    def _unlock_fd(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_fd(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock_fd(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
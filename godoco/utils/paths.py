@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 from pathlib import Path
+import os
+import sys
 from typing import Optional
 
+CONFIG_PATH = Path.home() / ".godoco.json"
+
 
 def resolve_project_path(
     name_or_path: Optional[str] = None,
@@ -18,7 +22,7 @@ def resolve_project_path(
     name_or_path : Optional[str]
         Project name (from config) or file system path.
     current_project : Optional[str]
-        Path of the currently active project from config.
+        Path of the currently active project.
     projects_map : dict[str, str]
         Map of project names to paths from config.
 
@@ -79,3 +83,57 @@ def make_godot_path_relative(project_root: Path, file_path: Path) -> str:
         return f"res://{rel.as_posix()}"
     except ValueError:
         return file_path.as_posix()
+
+
+def get_cache_dir() -> Path:
+    """
+    Get the per-user cache directory for Godoco.
+
+    Honours ``GODOCO_CACHE_DIR`` first, then the platform convention
+    (``XDG_CACHE_HOME`` on Linux, ``~/Library/Caches`` on macOS and
+    ``%LOCALAPPDATA%`` on Windows).
+
+    Returns
+    -------
+    Path
+        Cache directory (not created).
+    """
+    if override := os.environ.get("GODOCO_CACHE_DIR"):
+        return Path(override)
+
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA")
+        root = Path(base) if base else Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        root = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME")
+        root = Path(base) if base else Path.home() / ".cache"
+    return root / "godoco"
+
+
+def get_data_dir() -> Path:
+    """
+    Get the per-user data directory for Godoco.
+
+    Honours ``GODOCO_DATA_DIR`` first, then the platform convention
+    (``XDG_DATA_HOME`` on Linux, ``~/Library/Application Support`` on
+    macOS and ``%APPDATA%`` on Windows).
+
+    Returns
+    -------
+    Path
+        Data directory (not created).
+    """
+    if override := os.environ.get("GODOCO_DATA_DIR"):
+        return Path(override)
+
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA")
+        root = Path(base) if base else Path.home() / "AppData" / "Roaming"
+    elif sys.platform == "darwin":
+        root = Path.home() / "Library" / "Application Support"
+    else:
+        base = os.environ.get("XDG_DATA_HOME")
+        root = Path(base) if base else Path.home() / ".local" / "share"
+    return root / "godoco"
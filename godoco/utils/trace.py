@@ -0,0 +1,260 @@
+"""
+Lightweight timing spans.
+
+Tracing is off unless ``godoco --profile`` or ``GODOCO_TRACE`` turns it
+on; disabled spans cost one global lookup. ``--profile`` and
+``GODOCO_TRACE=1`` print a span tree to stderr when the process exits.
+Any other ``GODOCO_TRACE`` value is a path that receives Chrome trace
+JSON (open it in ``chrome://tracing`` or https://ui.perfetto.dev).
+
+Standard library only: the passthrough fast path imports this module.
+"""
+
+from __future__ import annotations
+from contextvars import ContextVar
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+TRACE_ENV = "GODOCO_TRACE"
+PROFILE_OPTION = "--profile"
+
+# Names of the enclosing spans in the current thread or asyncio task
+_parents: ContextVar[tuple[str, ...]] = ContextVar("godoco_span", default=())
+
+
+class Tracer:
+    """Collects finished spans of this process."""
+
+    def __init__(self, summary: bool = True, output: Optional[str] = None):
+        self.summary = summary
+        self.output = output
+        self.origin = time.perf_counter_ns()
+        # (path, start ns, duration ns, lane, args)
+        self.spans: list[tuple[tuple[str, ...], int, int, int, dict]] = []
+        self._lanes: dict[int, int] = {}
+        self._mutex = threading.Lock()
+
+    def lane(self) -> int:
+        """Row for a span: its asyncio task, else its thread."""
+        key = threading.get_ident()
+        if (aio := sys.modules.get("asyncio")) is not None:
+            try:
+                task = aio.current_task()
+            except RuntimeError:
+                task = None
+            if task is not None:
+                key = id(task)
+        with self._mutex:
+            return self._lanes.setdefault(key, len(self._lanes) + 1)
+
+    def add(
+        self, path: tuple[str, ...], start: int, end: int, lane: int, args: dict
+    ) -> None:
+        with self._mutex:
+            self.spans.append((
+                path,
+                start - self.origin,
+                end - start,
+                lane,
+                args,
+            ))
+
+    def chrome_trace(self) -> dict:
+        """Spans as Chrome trace events (complete events, microseconds)."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": path[-1],
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": dur / 1000,
+                "pid": pid,
+                "tid": lane,
+                "args": args,
+            }
+            for path, start, dur, lane, args in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def tree(self) -> str:
+        """Span tree with call counts and total time per call path."""
+        totals: dict[tuple[str, ...], list[int]] = {}
+        for path, _, dur, _, _ in self.spans:
+            entry = totals.setdefault(path, [0, 0])
+            entry[0] += 1
+            entry[1] += dur
+        wall = (time.perf_counter_ns() - self.origin) / 1e6
+
+        lines = [f"godoco trace: {len(self.spans)} spans, {wall:.1f} ms total"]
+        # Sorting by path keeps children right below their parent
+        for path in sorted(totals, key=_tree_order(totals)):
+            count, dur = totals[path]
+            label = "  " * len(path) + path[-1]
+            calls = f"{count}x" if count > 1 else ""
+            lines.append(f"{label:<48} {dur / 1e6:10.1f} ms {calls:>6}")
+        return "\n".join(lines)
+
+    def report(self) -> None:
+        """Print the tree and/or write the Chrome trace."""
+        if self.output:
+            try:
+                with open(self.output, "w", encoding="utf-8") as f:
+                    json.dump(self.chrome_trace(), f)
+            except OSError as e:
+                print(f"godoco: cannot write trace: {e}", file=sys.stderr)
+        if self.summary:
+            print(self.tree(), file=sys.stderr)
+
+
+def _tree_order(totals: dict[tuple[str, ...], list[int]]):
+    # Siblings by total time, slowest first; parents before children
+    def key(path: tuple[str, ...]) -> list:
+        return [
+            (-totals.get(path[: i + 1], (0, 0))[1], path[i])
+            for i in range(len(path))
+        ]
+
+    return key
+
+
+_tracer: Optional[Tracer] = None
+
+
+class _Span:
+    __slots__ = ("name", "args", "start", "token")
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> _Span:
+        self.token = _parents.set(_parents.get() + (self.name,))
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        end = time.perf_counter_ns()
+        path = _parents.get()
+        _parents.reset(self.token)
+        if (tracer := _tracer) is not None:
+            tracer.add(path, self.start, end, tracer.lane(), self.args)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enabled() -> bool:
+    """Whether spans are being recorded."""
+    return _tracer is not None
+
+
+def span(name: str, **args: Any) -> _Span | _NullSpan:
+    """
+    Context manager timing a named block.
+
+    Parameters
+    ----------
+    name : str
+        Span name, e.g. ``"config.load"``.
+    **args : Any
+        JSON-serializable details shown in the Chrome trace.
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator wrapping every call of a (synchronous) function in a span."""
+
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return fn(*args, **kwargs)
+            with _Span(name, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def enable(summary: bool = True, output: Optional[str] = None) -> Tracer:
+    """
+    Start recording spans and report them at interpreter exit.
+
+    Parameters
+    ----------
+    summary : bool
+        Print the span tree to stderr.
+    output : Optional[str]
+        Write Chrome trace JSON to this path.
+
+    Returns
+    -------
+    Tracer
+        The active tracer (the existing one if already enabled).
+    """
+    global _tracer
+    if _tracer is None:
+        import atexit
+
+        _tracer = Tracer(summary, output)
+        atexit.register(finish)
+    else:
+        _tracer.summary = _tracer.summary or summary
+        _tracer.output = _tracer.output or output
+    return _tracer
+
+
+def finish() -> None:
+    """Stop recording and emit the report (no-op when disabled)."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.report()
+
+
+def configure(argv: list[str]) -> None:
+    """
+    Enable tracing from ``GODOCO_TRACE`` or a root ``--profile`` option.
+
+    Parameters
+    ----------
+    argv : list[str]
+        Arguments after the program name; only options before the first
+        positional argument are root options.
+    """
+    profile = False
+    for arg in argv:
+        if not arg.startswith("-"):
+            break
+        if arg == PROFILE_OPTION:
+            profile = True
+            break
+
+    env = os.environ.get(TRACE_ENV, "")
+    if env.lower() in ("1", "true", "yes", "summary"):
+        enable(summary=True)
+    elif env and env.lower() not in ("0", "false", "no"):
+        enable(summary=profile, output=env)
+    elif profile:
+        enable(summary=True)